@@ -17,6 +17,7 @@ from tracker.smoothing import DataSmoother
 from tracker.landmarks_to_params import LandmarksToParameters
 from tracker.calibration import FaceCalibrator, CalibrationData
 from tracker.precision_mode import PrecisionMode
+from tracker.frame_clock import FrameClock
 from tracker.virtual_camera import create_virtual_camera
 from sender.vmc_sender import VMCSender
 from sender.vts_sender import VTSSender
@@ -263,6 +264,9 @@ class VTuberTrackerApp:
         self.is_running = True
         self.logger.info("Starting tracking loop...")
 
+        # Frame deadlines, so processing time is not added to the frame interval
+        clock = FrameClock(30)  # ~30 FPS
+
         try:
             while self.is_running:
                 # Get frame from camera
@@ -295,22 +299,26 @@ class VTuberTrackerApp:
                 # Apply smoothing
                 smoothed_data = self.smoother.smooth_data(enhanced_data)
 
-                # Map to parameters
-                all_params = self.mapper.process_tracking_data(smoothed_data, "both")
+                # Map to parameters, only for the senders that can take them
+                send_vmc = self.config['vmc']['enabled'] and self.vmc_sender.is_connected
+                send_vts = self.config['vts']['enabled'] and self.vts_sender.ready
+                protocol = "both" if send_vmc and send_vts else ("vmc" if send_vmc else "vts")
+                all_params = self.mapper.process_tracking_data(smoothed_data, protocol) if send_vmc or send_vts else {}
 
                 # Send to VMC if enabled
-                if self.config['vmc']['enabled'] and self.vmc_sender.is_connected:
-                    self.vmc_sender.send_tracking_data(all_params.get("vmc", {}))
+                if send_vmc:
+                    self.vmc_sender.send_tracking_data(all_params["vmc"])
 
                 # Send frame to virtual camera if enabled
                 if self.virtual_camera:
-                    # We should send the original frame with face landmarks drawn for the virtual camera
-                    frame_with_landmarks = self.face_tracker.draw_landmarks(frame.copy(), self.face_tracker.get_landmarks(frame))
+                    # We should send the original frame with face landmarks drawn for the virtual camera;
+                    # the landmarks from process_frame are reused and drawn onto the frame in place
+                    frame_with_landmarks = self.face_tracker.draw_landmarks(frame, self.face_tracker.last_results)
                     self.virtual_camera.send_frame(frame_with_landmarks)
 
                 # Send to VTS if enabled
-                if self.config['vts']['enabled'] and self.vts_sender.is_connected:
-                    self.vts_sender.send_tracking_data(all_params.get("vts", {}))
+                if send_vts:
+                    self.vts_sender.send_tracking_data(all_params["vts"])
 
                 # Print tracking data if in verbose mode
                 if hasattr(self, 'verbose') and self.verbose:
@@ -324,9 +332,8 @@ class VTuberTrackerApp:
                           f"Calibrated: {self.calibrator.calibration_data.is_calibrated}, "
                           f"Precision: {self.precision_mode.enabled}")
 
-                # Small delay to control frame rate
-                import time
-                time.sleep(1/30)  # ~30 FPS
+                # Wait for the next frame deadline to control frame rate
+                clock.tick()
 
         except KeyboardInterrupt:
             self.logger.info("Tracking interrupted by user")
@@ -4,53 +4,58 @@ Utility untuk mendeteksi dan menguji kamera sebelum menggunakan VTuber Tracker
 
 import cv2
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+def _probe_camera_info(index):
+    """Buka kamera di indeks tertentu; kembalikan info-nya, atau None jika gagal."""
+    cap = cv2.VideoCapture(index)
+    try:
+        if not cap.isOpened():
+            return None
+        # Coba baca frame untuk konfirmasi
+        ret, frame = cap.read()
+        if not ret:
+            return None
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return {
+            'index': index,
+            'resolution': f"{width}x{height}",
+            'fps': cap.get(cv2.CAP_PROP_FPS),
+            'frame_shape': frame.shape if frame is not None else None
+        }
+    finally:
+        cap.release()
 
 def detect_cameras():
     """Deteksi semua kamera yang tersedia dan informasi tentangnya."""
     print("Mendeteksi kamera yang tersedia...")
     print("=" * 50)
     
-    cameras = []
     max_test_index = 10  # Test dari 0 sampai 9
     
-    for i in range(max_test_index):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            # Coba baca frame untuk konfirmasi
-            ret, frame = cap.read()
-            if ret:
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                
-                cameras.append({
-                    'index': i,
-                    'resolution': f"{width}x{height}",
-                    'fps': fps,
-                    'frame_shape': frame.shape if frame is not None else None
-                })
-                
-                print(f"Kamera DITEMUKAN di indeks {i}")
-                print(f"  - Resolusi: {width}x{height}")
-                print(f"  - FPS: {fps}")
-                if frame is not None:
-                    print(f"  - Frame shape: {frame.shape}")
-                print()
-            cap.release()
-        else:
-            # Jika indeks pertama saja tidak bisa dibuka, mungkin tidak ada kamera
-            if i == 0:
-                print("⚠️  Tidak ada kamera yang terdeteksi!")
-                print("Kemungkinan masalah:")
-                print("  - Kamera tidak terhubung")
-                print("  - Aplikasi lain sedang menggunakan kamera")
-                print("  - Driver kamera belum terinstal")
-                print("  - Hak akses sistem tidak mencukupi")
-                break
-            else:
-                # Jika indeks pertama bisa dibuka tetapi indeks berikutnya tidak
-                # kemungkinan tidak ada lagi kamera
-                break
+    # Semua indeks diuji bersamaan (open+read kebanyakan menunggu driver),
+    # dan tidak berhenti di indeks kosong: sistem bisa punya kamera di
+    # indeks 2 walau indeks 1 tidak ada
+    with ThreadPoolExecutor(max_workers=max_test_index) as pool:
+        cameras = [info for info in pool.map(_probe_camera_info, range(max_test_index))
+                   if info is not None]
+    
+    for cam in cameras:
+        print(f"Kamera DITEMUKAN di indeks {cam['index']}")
+        print(f"  - Resolusi: {cam['resolution']}")
+        print(f"  - FPS: {cam['fps']}")
+        if cam['frame_shape'] is not None:
+            print(f"  - Frame shape: {cam['frame_shape']}")
+        print()
+    
+    if not cameras:
+        print("⚠️  Tidak ada kamera yang terdeteksi!")
+        print("Kemungkinan masalah:")
+        print("  - Kamera tidak terhubung")
+        print("  - Aplikasi lain sedang menggunakan kamera")
+        print("  - Driver kamera belum terinstal")
+        print("  - Hak akses sistem tidak mencukupi")
     
     if cameras:
         print(f"✅ Total kamera ditemukan: {len(cameras)}")
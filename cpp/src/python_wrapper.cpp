@@ -1,5 +1,6 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
 #include "../cpp/include/face_tracker_cpp.h"
 
 namespace py = pybind11;
@@ -21,7 +22,34 @@ PYBIND11_MODULE(facebook_cpp_wrapper, m) {
     py::class_<FaceTrackerCpp>(m, "FaceTrackerCpp")
         .def(py::init<>())
         .def("initialize", &FaceTrackerCpp::initialize)
-        .def("process_frame", &FaceTrackerCpp::process_frame)
+        // Terima buffer float32 (misal numpy array 468x3) tanpa salinan
+        .def("process_frame",
+             [](FaceTrackerCpp& self,
+                py::array_t<float, py::array::c_style | py::array::forcecast> landmarks) {
+                 py::buffer_info buf = landmarks.request();
+                 return self.process_frame(static_cast<float*>(buf.ptr),
+                                           static_cast<int>(buf.size / 3));
+             },
+             py::arg("landmarks"))
+        // Proses N frame (N x 468 x 3) dalam satu panggilan dari Python
+        .def("process_batch",
+             [](FaceTrackerCpp& self,
+                py::array_t<float, py::array::c_style | py::array::forcecast> batch) {
+                 if (batch.ndim() != 3 || batch.shape(2) != 3) {
+                     throw std::invalid_argument("batch must have shape (N, num_landmarks, 3)");
+                 }
+                 const py::ssize_t num_frames = batch.shape(0);
+                 const py::ssize_t frame_size = batch.shape(1) * 3;
+                 float* ptr = static_cast<float*>(batch.request().ptr);
+                 std::vector<FaceTrackingData> results;
+                 results.reserve(num_frames);
+                 for (py::ssize_t i = 0; i < num_frames; ++i) {
+                     results.push_back(self.process_frame(ptr + i * frame_size,
+                                                          static_cast<int>(batch.shape(1))));
+                 }
+                 return results;
+             },
+             py::arg("batch"))
         .def("update_sensitivity", &FaceTrackerCpp::update_sensitivity,
              py::arg("yaw_mult") = 1.0f,
              py::arg("pitch_mult") = 1.0f,
@@ -13,7 +13,7 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QComboBox, QLabel,
                              QCheckBox, QGroupBox, QGridLayout, QMessageBox,
                              QTabWidget, QScrollArea, QFrame, QSlider)
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, pyqtSlot
+from PyQt5.QtCore import Qt, QObject, QSignalBlocker, QTimer, QThread, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QImage, QPixmap
 import cv2
 from tracker.camera import CameraCapture
@@ -22,10 +22,44 @@ from tracker.smoothing import DataSmoother
 from tracker.landmarks_to_params import LandmarksToParameters
 from tracker.calibration import FaceCalibrator, CalibrationData
 from tracker.precision_mode import PrecisionMode
+from tracker.frame_clock import FrameClock
 from tracker.virtual_camera import create_virtual_camera
 from sender.vmc_sender import VMCSender
 from sender.vts_sender import VTSSender
 
+# Every number is rendered with a fixed width so the label geometry stays
+# stable between updates and Qt can skip re-layout on each setText().
+TRACKING_DATA_TEMPLATE = (
+    "<div style='white-space: pre'>"
+    "<b>Tracking Data:</b><br>"
+    "Face Detected:  %-5s<br>"
+    "Calibrated:     %-5s<br>"
+    "Precision Mode: %-5s<br>"
+    "<br>"
+    "<b>Head Rotation:</b><br>"
+    "Yaw:       %+7.3f<br>"
+    "Pitch:     %+7.3f<br>"
+    "Roll:      %+7.3f<br>"
+    "<br>"
+    "<b>Eyes:</b><br>"
+    "Left Eye:  %+7.3f<br>"
+    "Right Eye: %+7.3f<br>"
+    "<br>"
+    "<b>Mouth:</b><br>"
+    "Open:      %+7.3f<br>"
+    "Wide:      %+7.3f"
+    "</div>"
+)
+
+class SenderStatusNotifier(QObject):
+    """Qt shim that re-emits sender connection changes as a signal.
+
+    Senders report state changes from whichever thread observes them (the
+    VTS WebSocket runs on its own thread), so routing them through a signal
+    lets Qt deliver the update on the GUI thread.
+    """
+    connection_changed = pyqtSignal(bool)
+
 class TrackingWorker(QThread):
     """Worker thread for face tracking to prevent GUI freezing."""
     frame_processed = pyqtSignal(object)  # Emits processed frame
@@ -50,18 +84,20 @@ class TrackingWorker(QThread):
     def run(self):
         """Main tracking loop."""
         self.running = True
+        # Read frames on the camera's own thread while this one tracks
+        self.camera.start_async()
+        # Frame deadlines, so processing time is not added to the frame interval
+        clock = FrameClock(30)  # ~30 FPS
         while self.running:
             frame = self.camera.get_frame()
             if frame is not None:
-                # Process frame to get landmarks
-                results = self.face_tracker.get_landmarks(frame)
-
-                # Draw landmarks on frame
-                frame_with_landmarks = self.face_tracker.draw_landmarks(frame.copy(), results)
-
                 # Process face tracking
                 raw_data = self.face_tracker.process_frame(frame)
 
+                # Draw the landmarks found by process_frame onto the frame;
+                # tracking is done with it, so no copy or second inference
+                frame_with_landmarks = self.face_tracker.draw_landmarks(frame, self.face_tracker.last_results)
+
                 # Apply calibration if active
                 if self.calibrator.is_calibrating:
                     # Collect sample for calibration
@@ -80,29 +116,35 @@ class TrackingWorker(QThread):
                 # Apply smoothing
                 smoothed_data = self.smoother.smooth_data(enhanced_data)
 
-                # Map to parameters
-                all_params = self.mapper.process_tracking_data(smoothed_data, "both")
+                # Map to parameters, only for the senders that can take them
+                send_vmc = self.vmc_enabled and self.vmc_sender.is_connected
+                send_vts = self.vts_enabled and self.vts_sender.ready
+                if send_vmc or send_vts:
+                    protocol = "both" if send_vmc and send_vts else ("vmc" if send_vmc else "vts")
+                    all_params = self.mapper.process_tracking_data(smoothed_data, protocol)
 
-                # Send to VMC if enabled
-                if self.vmc_enabled and self.vmc_sender.is_connected:
-                    self.vmc_sender.send_tracking_data(all_params.get("vmc", {}))
+                    # Send to VMC if enabled
+                    if send_vmc:
+                        self.vmc_sender.send_tracking_data(all_params["vmc"])
 
-                # Send to VTS if enabled
-                if self.vts_enabled and self.vts_sender.is_connected:
-                    self.vts_sender.send_tracking_data(all_params.get("vts", {}))
+                    # Send to VTS if enabled
+                    if send_vts:
+                        self.vts_sender.send_tracking_data(all_params["vts"])
 
                 # Send frame to virtual camera if enabled
                 if self.virtual_camera:
                     self.virtual_camera.send_frame(frame_with_landmarks)
 
-                # Emit processed frame and tracking data
+                # Emit processed frame and tracking data; the tracking stages
+                # reuse their output buffers, so the GUI thread gets a snapshot
                 self.frame_processed.emit(frame_with_landmarks)
-                self.tracking_data_ready.emit(smoothed_data)
+                self.tracking_data_ready.emit(smoothed_data.copy())
 
-                # Small delay to control frame rate
-                self.msleep(33)  # ~30 FPS
+                # Wait for the next frame deadline to control frame rate
+                clock.tick()
             else:
                 self.msleep(100)  # Wait longer if no frame available
+        self.camera.stop_async()
 
     def stop(self):
         """Stop the tracking loop."""
@@ -546,6 +588,12 @@ class MainWindow(QMainWindow):
 
         self.tracking_data_label = QLabel("No data yet")
         self.tracking_data_label.setAlignment(Qt.AlignLeft)
+        # Fixed format, font and width so updates never trigger rich-text
+        # auto-detection or a geometry recalculation
+        self.tracking_data_label.setTextFormat(Qt.RichText)
+        self.tracking_data_label.setWordWrap(False)
+        self.tracking_data_label.setStyleSheet("font-family: monospace;")
+        self.tracking_data_label.setFixedWidth(320)
         tracking_data_label_scroll = QScrollArea()
         tracking_data_label_scroll.setWidget(self.tracking_data_label)
         tracking_data_label_scroll.setWidgetResizable(True)
@@ -606,6 +654,8 @@ class MainWindow(QMainWindow):
     
     def init_tracking(self):
         """Initialize tracking components."""
+        # Suspend repaints while the config is applied so the window paints once
+        self.setUpdatesEnabled(False)
         try:
             # Initialize face tracker
             self.face_tracker = FaceTracker(
@@ -663,25 +713,42 @@ class MainWindow(QMainWindow):
             if self.config['precision']['enabled']:
                 self.precision_mode.enable_precision_mode(self.config['precision']['sensitivity_multiplier'])
 
+            # Status labels follow sender connection changes via signals
+            self.vmc_status_notifier = SenderStatusNotifier()
+            self.vmc_status_notifier.connection_changed.connect(
+                lambda connected: self.vmc_status.setText(
+                    f"Status: {'Connected' if connected else 'Disconnected'}"))
+
+            self.vts_status_notifier = SenderStatusNotifier()
+            self.vts_status_notifier.connection_changed.connect(
+                lambda connected: self.vts_status.setText(
+                    f"Status: {'Connected' if connected else 'Disconnected'}"))
+
             # Initialize senders
             self.vmc_sender = VMCSender(
                 host=self.config['vmc']['host'],
                 port=self.config['vmc']['port'],
-                enabled=self.config['vmc']['enabled']
+                enabled=self.config['vmc']['enabled'],
+                on_connection_changed=self.vmc_status_notifier.connection_changed.emit
             )
 
             self.vts_sender = VTSSender(
                 host=self.config['vts']['host'],
                 port=self.config['vts']['port'],
-                enabled=self.config['vts']['enabled']
+                enabled=self.config['vts']['enabled'],
+                on_connection_changed=self.vts_status_notifier.connection_changed.emit
             )
 
-            # Update status labels
-            self.update_sender_statuses()
+            # One-shot sync of the labels with the initial sender state
+            self.vmc_status_notifier.connection_changed.emit(self.vmc_sender.is_connected)
+            self.vts_status_notifier.connection_changed.emit(self.vts_sender.is_connected)
 
         except Exception as e:
             logging.error(f"Error initializing tracking components: {e}")
             QMessageBox.critical(self, "Error", f"Error initializing tracking components: {e}")
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
     
     def update_camera_list(self):
         """Update the list of available cameras."""
@@ -693,17 +760,20 @@ class MainWindow(QMainWindow):
             available_cameras = temp_camera.get_available_cameras()
             temp_camera.release()
         
-        self.camera_combo.clear()
-        for i in available_cameras:
-            self.camera_combo.addItem(f"Camera {i}", i)
-        
-        # Set default camera
-        default_idx = 0
-        for i, cam_idx in enumerate(available_cameras):
-            if cam_idx == self.config['camera']['default_camera_index']:
-                default_idx = i
-                break
-        self.camera_combo.setCurrentIndex(default_idx)
+        # Rebuild the combo silently; the final selection is applied once below
+        with QSignalBlocker(self.camera_combo):
+            self.camera_combo.clear()
+            for i in available_cameras:
+                self.camera_combo.addItem(f"Camera {i}", i)
+
+            # Set default camera
+            default_idx = 0
+            for i, cam_idx in enumerate(available_cameras):
+                if cam_idx == self.config['camera']['default_camera_index']:
+                    default_idx = i
+                    break
+            self.camera_combo.setCurrentIndex(default_idx)
+        self.on_camera_changed()
         
         if available_cameras:
             self.start_btn.setEnabled(True)
@@ -895,25 +965,18 @@ class MainWindow(QMainWindow):
     def update_tracking_data(self, tracking_data):
         """Update the tracking data display."""
         if tracking_data:
-            data_text = f"""
-            <b>Tracking Data:</b><br>
-            Face Detected: {tracking_data.face_detected}<br>
-            Calibrated: {self.calibrator.calibration_data.is_calibrated if self.calibrator else False}<br>
-            Precision Mode: {self.precision_mode.enabled if self.precision_mode else False}<br>
-            <br>
-            <b>Head Rotation:</b><br>
-            Yaw: {tracking_data.head_yaw:.3f}<br>
-            Pitch: {tracking_data.head_pitch:.3f}<br>
-            Roll: {tracking_data.head_roll:.3f}<br>
-            <br>
-            <b>Eyes:</b><br>
-            Left Eye: {tracking_data.eye_left:.3f}<br>
-            Right Eye: {tracking_data.eye_right:.3f}<br>
-            <br>
-            <b>Mouth:</b><br>
-            Open: {tracking_data.mouth_open:.3f}<br>
-            Wide: {tracking_data.mouth_wide:.3f}
-            """
+            data_text = TRACKING_DATA_TEMPLATE % (
+                tracking_data.face_detected,
+                self.calibrator.calibration_data.is_calibrated if self.calibrator else False,
+                self.precision_mode.enabled if self.precision_mode else False,
+                tracking_data.head_yaw,
+                tracking_data.head_pitch,
+                tracking_data.head_roll,
+                tracking_data.eye_left,
+                tracking_data.eye_right,
+                tracking_data.mouth_open,
+                tracking_data.mouth_wide
+            )
             self.tracking_data_label.setText(data_text)
 
     def on_head_yaw_sensitivity_changed(self, value):
@@ -1104,16 +1167,6 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'config') and self.config:
             self.config['virtual_camera']['fps'] = fps
 
-    def update_sender_statuses(self):
-        """Update the status labels for senders."""
-        if self.vmc_sender:
-            status = "Connected" if self.vmc_sender.is_connected else "Disconnected"
-            self.vmc_status.setText(f"Status: {status}")
-        
-        if self.vts_sender:
-            status = "Connected" if self.vts_sender.is_connected else "Disconnected"
-            self.vts_status.setText(f"Status: {status}")
-    
     def closeEvent(self, event):
         """Handle application close event."""
         # Stop tracking if running
@@ -13,19 +13,59 @@ License: MIT
 
 import sys
 import os
-import argparse
+import hashlib
+import atexit
+import queue
 import logging
-import subprocess
-import platform
+from logging.handlers import QueueHandler, QueueListener
+from types import SimpleNamespace
 
 # Tambahkan root proyek ke path
-project_root = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, project_root)
+# __file__ sudah absolut untuk modul yang di-import; tidak perlu abspath()
+project_root = os.path.dirname(__file__) or os.getcwd()
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Stamp yang menandai cek dependencies terakhir lolos pada lingkungan yang sama
+DEPS_STAMP_PATH = os.path.join(os.path.expanduser("~"), ".cache", "vtuber_tracker", "deps_ok.stamp")
+
+def _dependency_stamp_key():
+    """
+    Kunci lingkungan Python: interpreter, versi, dan mtime direktori sys.path.
+    Direktori site-packages berubah mtime-nya saat paket di-install/di-hapus.
+    """
+    parts = [sys.executable, sys.version]
+    for path in sys.path:
+        if not path or path == project_root:
+            continue
+        try:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            continue
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
 
 def check_dependencies():
     """
-    Periksa apakah dependencies utama tersedia
+    Periksa apakah dependencies utama tersedia.
+
+    Module di-import langsung (bukan hanya dicari spec-nya) sehingga instalasi
+    yang rusak ikut terdeteksi; aplikasi tetap meng-import module yang sama,
+    jadi hasilnya sudah ter-cache di sys.modules. Hasil yang lolos disimpan
+    sebagai stamp sehingga startup berikutnya melewati cek ini selama
+    lingkungan Python tidak berubah. Set VTUBER_SKIP_DEPCHECK untuk
+    melewati cek sepenuhnya.
     """
+    if os.environ.get("VTUBER_SKIP_DEPCHECK"):
+        return True
+
+    stamp_key = _dependency_stamp_key()
+    try:
+        with open(DEPS_STAMP_PATH, "r") as f:
+            if f.read().strip() == stamp_key:
+                return True
+    except OSError:
+        pass
+
     required_modules = [
         "cv2",      # OpenCV
         "mediapipe", # MediaPipe
@@ -38,7 +78,7 @@ def check_dependencies():
     for module in required_modules:
         try:
             __import__(module)
-        except ImportError:
+        except (ModuleNotFoundError, ImportError):
             missing_modules.append(module)
     
     if missing_modules:
@@ -47,21 +87,42 @@ def check_dependencies():
         print("  pip install opencv-python mediapipe numpy PyQt5 python-osc websocket-client requests pyfakewebcam")
         return False
     
+    try:
+        os.makedirs(os.path.dirname(DEPS_STAMP_PATH), exist_ok=True)
+        with open(DEPS_STAMP_PATH, "w") as f:
+            f.write(stamp_key)
+    except OSError:
+        pass  # Stamp hanya optimasi
+    
     return True
 
+def _machine_name():
+    """
+    Nama arsitektur mesin tanpa modul platform (yang bisa memanggil uname
+    sebagai subprocess di beberapa sistem).
+    """
+    if hasattr(os, "uname"):
+        return os.uname().machine
+    return os.environ.get("PROCESSOR_ARCHITECTURE", "")
+
 def setup_logging():
     """
     Setup logging configuration
+
+    Root logger hanya memasukkan record ke queue; handler file dan console
+    dijalankan oleh thread QueueListener agar I/O log tidak memblokir tracking.
     """
-    log_level = logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('vtuber_tracker_main.log'),
-            logging.StreamHandler()
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler('vtuber_tracker_main.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)  # Tulis sisa record saat keluar
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[QueueHandler(log_queue)])
 
 def run_cli_mode(verbose=False):
     """
@@ -71,13 +132,7 @@ def run_cli_mode(verbose=False):
     print("=" * 30)
 
     from run_app import main as run_app_main
-
-    if verbose:
-        sys.argv = ["run_app.py", "--mode", "cli", "--verbose"]
-    else:
-        sys.argv = ["run_app.py", "--mode", "cli"]
-
-    run_app_main()
+    run_app_main(mode='cli', verbose=verbose)
 
 def run_gui_mode():
     """
@@ -87,8 +142,7 @@ def run_gui_mode():
     print("=" * 30)
     
     from run_app import main as run_app_main
-    sys.argv = ["run_app.py", "--mode", "gui"]  # Simulasikan argumen command line
-    run_app_main()
+    run_app_main(mode='gui')
 
 def run_with_camera_index(camera_index):
     """
@@ -98,8 +152,7 @@ def run_with_camera_index(camera_index):
     print("=" * 50)
     
     from run_app import main as run_app_main
-    sys.argv = ["run_app.py", "--mode", "gui", "--camera", str(camera_index)]
-    run_app_main()
+    run_app_main(mode='gui', camera=camera_index)
 
 def run_with_android_camera(stream_url):
     """
@@ -109,8 +162,7 @@ def run_with_android_camera(stream_url):
     print("=" * 50)
     
     from run_app import main as run_app_main
-    sys.argv = ["run_app.py", "--mode", "gui", "--stream-url", stream_url]
-    run_app_main()
+    run_app_main(mode='gui', stream_url=stream_url)
 
 def print_help():
     """
@@ -128,6 +180,7 @@ Opsi yang tersedia:
   --camera INDEX        Indeks kamera untuk digunakan (default: 0)
   --stream-url URL      URL kamera Android/IP (misal: http://192.168.1.100:8080/video)
   --cli                 Jalankan dalam mode CLI (sama dengan --mode cli)
+  --verbose             Aktifkan output verbose
   --help, -h            Tampilkan bantuan ini
 
 Contoh penggunaan:
@@ -153,10 +206,44 @@ Kompatibel dengan:
   - Semua platform streaming (Twitch, YouTube, Zoom, Discord, VRChat, dll.)
     """)
 
-def main():
+def parse_args_fast(argv):
     """
-    Fungsi utama untuk menjalankan aplikasi
+    Parse argumen command line tanpa argparse untuk kasus umum.
+
+    Mengembalikan None jika ada argumen yang tidak dikenali atau tidak valid,
+    agar pemanggil bisa fallback ke argparse yang memberi pesan error lengkap.
     """
+    args = SimpleNamespace(mode='gui', camera=None, stream_url=None,
+                           cli=False, verbose=False, help=False)
+    it = iter(argv)
+    try:
+        for arg in it:
+            if arg in ('-h', '--help'):
+                args.help = True
+            elif arg == '--mode':
+                args.mode = next(it)
+                if args.mode not in ('gui', 'cli'):
+                    return None
+            elif arg == '--camera':
+                args.camera = int(next(it))
+            elif arg == '--stream-url':
+                args.stream_url = next(it)
+            elif arg == '--cli':
+                args.cli = True
+            elif arg == '--verbose':
+                args.verbose = True
+            else:
+                return None
+    except (StopIteration, ValueError):
+        return None
+    return args
+
+def build_arg_parser():
+    """
+    Buat parser argparse lengkap (fallback untuk argumen yang tidak umum)
+    """
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='VTuber Tracker - All-in-One VTuber Solution',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -202,7 +289,18 @@ Contoh:
         help='Aktifkan output verbose'
     )
 
-    args = parser.parse_args()
+    return parser
+
+def main():
+    """
+    Fungsi utama untuk menjalankan aplikasi
+    """
+    args = parse_args_fast(sys.argv[1:])
+    if args is None:
+        args = build_arg_parser().parse_args()
+    elif args.help:
+        print_help()
+        return
     
     # Setup logging
     setup_logging()
@@ -210,11 +308,12 @@ Contoh:
     
     print("VTuber Tracker - All-in-One VTuber Solution")
     print("============================================")
-    print(f"Sistem: {platform.system()} {platform.machine()}")
-    print(f"Python: {platform.python_version()}")
+    print(f"Sistem: {sys.platform} {_machine_name()}")
+    print(f"Python: {'.'.join(map(str, sys.version_info[:3]))}")
     print()
     
-    # Cek dependencies
+    # Cek dependencies. --help/-h sudah ditangani (keluar) sebelum titik ini,
+    # jadi cek hanya berjalan saat aplikasi benar-benar dijalankan.
     if not check_dependencies():
         print("\n[PERINGATAN] Beberapa module hilang. Instal dependencies terlebih dahulu.")
         print("   Perintah instalasi: pip install opencv-python mediapipe numpy PyQt5 python-osc websocket-client requests pyfakewebcam")
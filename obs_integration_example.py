@@ -5,43 +5,130 @@ Contoh penggunaan VTuber Tracker dengan OBS Virtual Camera
 from vtuber_tracker_lib import VTuberTracker, VTuberConfig
 import time
 import sys
+import os
+import json
+import glob
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
-def find_obs_virtual_camera():
-    """Coba deteksi OBS Virtual Camera"""
-    import cv2
-    
-    # Coba nama-nama umum OBS Virtual Camera
-    obs_names = [
-        "OBS Virtual Camera",
-        "obs-virtual-source"  # Nama di Linux
-    ]
-    
-    # Di Linux, biasanya virtual camera ada di indeks yang lebih tinggi
-    # Di Windows/Mac, mungkin muncul dengan nama tertentu
-    import subprocess
+# Cache hasil deteksi OBS Virtual Camera agar run berikutnya tidak perlu
+# membuka setiap indeks kamera lagi
+OBS_CAM_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "vtuber_tracker", "obs_cam.json")
+OBS_CAM_CACHE_TTL = 30.0  # detik
+
+# ioctl VIDIOC_QUERYCAP = _IOR('V', 0, struct v4l2_capability), struct 104 byte
+VIDIOC_QUERYCAP = 0x80685600
+V4L2_CAPABILITY_SIZE = 104
+
+def _list_video_devices():
+    """
+    Daftar (indeks, nama kartu) perangkat V4L2 langsung dari /dev/video*,
+    tanpa menjalankan proses v4l2-ctl. Di luar Linux mengembalikan list kosong.
+    """
+    if not sys.platform.startswith('linux'):
+        return []
+    import fcntl
+
+    devices = []
+    for path in glob.glob('/dev/video*'):
+        try:
+            index = int(path[len('/dev/video'):])
+        except ValueError:
+            continue
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            continue
+        try:
+            caps = bytearray(V4L2_CAPABILITY_SIZE)
+            fcntl.ioctl(fd, VIDIOC_QUERYCAP, caps)
+            # Field "card" ada di offset 16, panjang 32 byte (null-terminated)
+            card = bytes(caps[16:48]).split(b'\0', 1)[0].decode('utf-8', 'replace')
+        except OSError:
+            card = ""
+        finally:
+            os.close(fd)
+        devices.append((index, card))
+    return sorted(devices)
+
+def _device_enumeration_key(devices):
+    """Buat kunci cache dari daftar perangkat video yang terdeteksi sistem."""
+    return hashlib.sha1(f"{sys.platform}:{devices!r}".encode()).hexdigest()
+
+def _load_cached_obs_camera(key):
+    """Kembalikan (True, index) jika cache masih valid, selain itu (False, None)."""
     try:
-        result = subprocess.run(['v4l2-ctl', '--list-devices'], 
-                              capture_output=True, text=True)
-        if 'obs' in result.stdout.lower() or 'virtual' in result.stdout.lower():
-            # Temukan indeks dari output
-            lines = result.stdout.split('\n')
-            # Pencarian lebih lanjut bisa ditambahkan di sini
-            return True
-    except:
-        pass  # v4l2-ctl mungkin tidak tersedia
+        with open(OBS_CAM_CACHE_PATH, "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return False, None
+    if cached.get("key") != key or time.time() - cached.get("ts", 0) > OBS_CAM_CACHE_TTL:
+        return False, None
+    return True, cached.get("index")
+
+def _save_cached_obs_camera(key, index):
+    """Simpan hasil deteksi ke cache di disk."""
+    try:
+        os.makedirs(os.path.dirname(OBS_CAM_CACHE_PATH), exist_ok=True)
+        with open(OBS_CAM_CACHE_PATH, "w") as f:
+            json.dump({"key": key, "index": index, "ts": time.time()}, f)
+    except OSError:
+        pass  # Cache hanya optimasi, abaikan jika gagal ditulis
+
+def find_obs_virtual_camera():
+    """Coba deteksi OBS Virtual Camera, memakai cache di disk jika masih valid"""
+    devices = _list_video_devices()
+    key = _device_enumeration_key(devices)
+    hit, index = _load_cached_obs_camera(key)
+    if hit:
+        return index
+
+    index = _probe_obs_virtual_camera(devices)
+    _save_cached_obs_camera(key, index)
+    return index
+
+def _probe_obs_virtual_camera(devices):
+    """Deteksi OBS Virtual Camera dengan memeriksa perangkat secara langsung"""
+    # Di Linux, nama perangkat V4L2 sudah cukup untuk mengenali virtual camera
+    # (misal "OBS Virtual Camera" atau "obs-virtual-source")
+    for index, card in devices:
+        if 'obs' in card.lower() or 'virtual' in card.lower():
+            return index
     
     # Sebagai fallback, coba beberapa indeks tinggi
-    # karena virtual camera sering di indeks tinggi
-    for i in range(5, 10):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret:
-                cap.release()
-                return i  # Kembalikan indeks virtual camera jika ditemukan
+    # karena virtual camera sering di indeks tinggi. Semua indeks diperiksa
+    # bersamaan; OpenCV melepas GIL selama I/O driver sehingga total waktunya
+    # kira-kira sama dengan satu probe saja.
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(_probe_camera_index, range(5, 10)))
+
+    # Kembalikan indeks virtual camera terendah yang ditemukan
+    return next((r for r in results if r is not None), None)
+
+def _capture_backend():
+    """Pilih backend OpenCV secara eksplisit agar tidak mencoba semua backend."""
+    import cv2
+    if sys.platform.startswith('linux'):
+        return cv2.CAP_V4L2
+    if sys.platform == 'win32':
+        return cv2.CAP_DSHOW
+    return cv2.CAP_ANY
+
+def _probe_camera_index(index):
+    """Kembalikan index jika kamera di indeks tersebut tersedia."""
+    import cv2
+    cap = cv2.VideoCapture(index, _capture_backend())
+    try:
+        if not cap.isOpened():
+            return None
+        # Lebar frame sudah cukup untuk cek keberadaan tanpa decode frame;
+        # beberapa driver baru mengisinya setelah grab pertama, jadi fallback ke read()
+        if cap.get(cv2.CAP_PROP_FRAME_WIDTH) > 0:
+            return index
+        ret, _ = cap.read()
+        return index if ret else None
+    finally:
         cap.release()
-    
-    return None
 
 def main():
     print("VTuber Tracker - Contoh Penggunaan dengan OBS Virtual Camera")
@@ -2,40 +2,94 @@
 """
 Bridge module to connect Python VTuber Tracker with C++ implementation
 """
+from __future__ import annotations
+
 import sys
 import os
+import importlib.util
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 
 # Tambahkan path untuk mencari modul
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+# __file__ sudah absolut untuk modul yang di-import; tidak perlu abspath()
+project_root = os.path.dirname(__file__) or os.getcwd()
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+if TYPE_CHECKING:
+    from tracker.face_tracking import FaceTrackingData
+
+# Modul wrapper C++ di-import saat pertama kali dibutuhkan, bukan saat
+# modul ini di-import. _UNPROBED menandai bahwa import belum dicoba.
+_UNPROBED = object()
+_cpp_wrapper = _UNPROBED
+
+# Cek ketersediaan lewat spec saja, tanpa me-load extension C++
+_HAS_CPP = importlib.util.find_spec('facebook_cpp_wrapper') is not None
+
+def _get_cpp_wrapper():
+    """
+    Return the facebook_cpp_wrapper module, or None if it is unavailable.
+    The import is attempted once and the result cached.
+    """
+    global _cpp_wrapper
+    if _cpp_wrapper is _UNPROBED:
+        if not _HAS_CPP:
+            print("Cpp wrapper not available. Using pure Python implementation.")
+            _cpp_wrapper = None
+            return _cpp_wrapper
+        try:
+            # Coba import wrapper C++ jika tersedia
+            import facebook_cpp_wrapper
+            _cpp_wrapper = facebook_cpp_wrapper
+        except ImportError:
+            print("Cpp wrapper not available. Using pure Python implementation.")
+            _cpp_wrapper = None
+    return _cpp_wrapper
 
-try:
-    # Coba import wrapper C++ jika tersedia
-    import facebook_cpp_wrapper
-    HAS_CPP_WRAPPER = True
-except ImportError:
-    print("Cpp wrapper not available. Using pure Python implementation.")
-    HAS_CPP_WRAPPER = False
+# Urutan multiplier sensitivitas, sama dengan urutan field FaceTrackingData
+_SENS_ORDER = (
+    'head_yaw_multiplier',
+    'head_pitch_multiplier',
+    'head_roll_multiplier',
+    'eye_left_multiplier',
+    'eye_right_multiplier',
+    'mouth_open_multiplier',
+    'mouth_wide_multiplier',
+)
+_SENS_INDEX = {key: i for i, key in enumerate(_SENS_ORDER)}
 
-from tracker.face_tracking import FaceTrackingData
-from tracker.calibration import CalibrationData
-from tracker.precision_mode import PrecisionMode
+# Urutan deadzone, sama dengan urutan argumen update_deadzones di C++
+_DZ_ORDER = (
+    'head_yaw_deadzone',
+    'head_pitch_deadzone',
+    'head_roll_deadzone',
+    'eye_left_deadzone',
+    'eye_right_deadzone',
+    'mouth_open_deadzone',
+    'mouth_wide_deadzone',
+)
+_DZ_INDEX = {key: i for i, key in enumerate(_DZ_ORDER)}
 
 class CppFaceTrackerBridge:
     """
     Bridge class to connect Python VTuber Tracker with C++ implementation
     """
     def __init__(self):
-        self.use_cpp = HAS_CPP_WRAPPER
+        self._cpp_mod = _get_cpp_wrapper()
+        self.use_cpp = self._cpp_mod is not None
         self.cpp_tracker = None
-        self.calibration_data = CalibrationData()
-        self.precision_mode = PrecisionMode()
+        # Dibuat saat pertama kali diakses lewat property di bawah
+        self._calibration_data = None
+        self._precision_mode = None
+        
+        self._cpp_scratch = None
         
         if self.use_cpp:
-            self.cpp_tracker = facebook_cpp_wrapper.FaceTrackerCpp()
+            self.cpp_tracker = self._cpp_mod.FaceTrackerCpp()
             self.cpp_tracker.initialize()
+            # Reused by smooth_tracking_data instead of allocating per frame
+            self._cpp_scratch = self._cpp_mod.FaceTrackingData()
         
         # Default sensitivities
         self.sensitivities = {
@@ -47,6 +101,8 @@ class CppFaceTrackerBridge:
             'mouth_open_multiplier': 1.0,
             'mouth_wide_multiplier': 1.0,
         }
+        # Sensitivities packed in _SENS_ORDER, updated in place alongside the dict
+        self._sens_vec = np.array([self.sensitivities[k] for k in _SENS_ORDER], dtype=np.float32)
         
         # Deadzones
         self.deadzones = {
@@ -58,25 +114,46 @@ class CppFaceTrackerBridge:
             'mouth_open_deadzone': 0.05,
             'mouth_wide_deadzone': 0.05,
         }
+        # Deadzones packed in _DZ_ORDER, updated in place alongside the dict
+        self._dz_vec = np.array([self.deadzones[k] for k in _DZ_ORDER], dtype=np.float32)
+
+    @property
+    def calibration_data(self):
+        """
+        Python-side calibration state, created on first access
+        """
+        if self._calibration_data is None:
+            from tracker.calibration import CalibrationData
+            self._calibration_data = CalibrationData()
+        return self._calibration_data
+
+    @property
+    def precision_mode(self):
+        """
+        Precision mode enhancer, created on first access
+        """
+        if self._precision_mode is None:
+            from tracker.precision_mode import PrecisionMode
+            self._precision_mode = PrecisionMode()
+        return self._precision_mode
 
     def process_frame(self, landmarks: np.ndarray) -> FaceTrackingData:
         """
         Process face landmarks and return tracking data
         """
+        from tracker.face_tracking import FaceTrackingData
+
         if self.use_cpp and landmarks is not None and len(landmarks) > 0:
-            # Convert landmarks to format expected by C++
-            if isinstance(landmarks, np.ndarray):
-                landmarks_list = landmarks.flatten().tolist()
-            elif isinstance(landmarks, list):
-                landmarks_list = landmarks
-            else:
+            # Convert landmarks to the flat float32 buffer expected by C++.
+            # Contiguous float32 arrays pass through without any copy.
+            if not isinstance(landmarks, (np.ndarray, list)):
                 raise ValueError("Landmarks must be numpy array or list")
-            
-            # Process with C++ if available
-            raw_landmarks = np.array(landmarks_list, dtype=np.float32)
+            raw_landmarks = np.ascontiguousarray(landmarks, dtype=np.float32).reshape(-1)
             
             # Using simulated C++ data since we don't have full compiled wrapper
-            # In real implementation this would call self.cpp_tracker.process_frame
+            # In real implementation this would call
+            # self.cpp_tracker.process_frame(raw_landmarks), which receives the
+            # buffer zero-copy through the py::array_t overload
             # For now, return processed data with sensitivities applied
             processed_data = FaceTrackingData(
                 head_yaw=0.0, head_pitch=0.0, head_roll=0.0,
@@ -85,24 +162,63 @@ class CppFaceTrackerBridge:
                 face_detected=True
             )
             
-            # Apply sensitivities (simulated)
-            processed_data.head_yaw *= self.sensitivities['head_yaw_multiplier']
-            processed_data.head_pitch *= self.sensitivities['head_pitch_multiplier']
-            processed_data.head_roll *= self.sensitivities['head_roll_multiplier']
-            processed_data.eye_left *= self.sensitivities['eye_left_multiplier']
-            processed_data.eye_right *= self.sensitivities['eye_right_multiplier']
-            processed_data.mouth_open *= self.sensitivities['mouth_open_multiplier']
-            processed_data.mouth_wide *= self.sensitivities['mouth_wide_multiplier']
+            # Apply sensitivities (simulated) with a single vector multiply
+            vals = np.array([
+                processed_data.head_yaw, processed_data.head_pitch, processed_data.head_roll,
+                processed_data.eye_left, processed_data.eye_right,
+                processed_data.mouth_open, processed_data.mouth_wide
+            ], dtype=np.float32)
+            vals *= self._sens_vec
+            (processed_data.head_yaw, processed_data.head_pitch, processed_data.head_roll,
+             processed_data.eye_left, processed_data.eye_right,
+             processed_data.mouth_open, processed_data.mouth_wide) = vals.tolist()
             
             return processed_data
         else:
             # Fallback to Python-only implementation
             return self._process_frame_python_only(landmarks)
 
+    def process_frames(self, landmarks_batch: np.ndarray) -> List[FaceTrackingData]:
+        """
+        Process a batch of face landmarks, shape (N, 468, 3), in one call
+        """
+        from tracker.face_tracking import FaceTrackingData
+
+        batch = np.ascontiguousarray(landmarks_batch, dtype=np.float32)
+        if batch.ndim != 3 or batch.shape[2] != 3:
+            raise ValueError("Landmarks batch must have shape (N, num_landmarks, 3)")
+        num_frames = batch.shape[0]
+
+        if self.use_cpp and num_frames > 0:
+            # Using simulated C++ data since we don't have full compiled wrapper
+            # In real implementation this would call
+            # self.cpp_tracker.process_batch(batch), one crossing for all N frames
+            results = np.empty((num_frames, len(_SENS_ORDER)), dtype=np.float32)
+            results[:, :3] = 0.0
+            results[:, 3:] = 0.1
+
+            # Apply sensitivities to every frame with one broadcast multiply
+            results *= self._sens_vec[None, :]
+
+            return [
+                FaceTrackingData(
+                    head_yaw=row[0], head_pitch=row[1], head_roll=row[2],
+                    eye_left=row[3], eye_right=row[4],
+                    mouth_open=row[5], mouth_wide=row[6],
+                    face_detected=True
+                )
+                for row in results.tolist()
+            ]
+        else:
+            # Fallback to Python-only implementation, already validated above
+            return [self._process_frame_python_only(frame) for frame in batch]
+
     def _process_frame_python_only(self, landmarks: np.ndarray) -> FaceTrackingData:
         """
         Pure Python fallback for processing
         """
+        from tracker.face_tracking import FaceTrackingData
+
         # This is a simplified fallback - in real project this would use the existing Python tracking logic
         data = FaceTrackingData(
             head_yaw=0.0, head_pitch=0.0, head_roll=0.0,
@@ -117,8 +233,10 @@ class CppFaceTrackerBridge:
         Update sensitivity parameters
         """
         for key, value in kwargs.items():
-            if key in self.sensitivities:
+            index = _SENS_INDEX.get(key)
+            if index is not None:
                 self.sensitivities[key] = value
+                self._sens_vec[index] = value
         
         # Update C++ tracker if available
         if self.use_cpp:
@@ -137,8 +255,10 @@ class CppFaceTrackerBridge:
         Update deadzone parameters
         """
         for key, value in kwargs.items():
-            if key in self.deadzones:
+            index = _DZ_INDEX.get(key)
+            if index is not None:
                 self.deadzones[key] = value
+                self._dz_vec[index] = value
         
         # Update C++ tracker if available
         if self.use_cpp:
@@ -180,8 +300,10 @@ class CppFaceTrackerBridge:
         Apply smoothing to tracking data
         """
         if self.use_cpp:
-            # Convert to C++ format and back
-            cpp_data = facebook_cpp_wrapper.FaceTrackingData()
+            from tracker.face_tracking import FaceTrackingData
+
+            # Convert to C++ format (reusing the scratch struct) and back
+            cpp_data = self._cpp_scratch
             cpp_data.head_yaw = tracking_data.head_yaw
             cpp_data.head_pitch = tracking_data.head_pitch
             cpp_data.head_roll = tracking_data.head_roll
@@ -5,25 +5,120 @@ This file allows running the application from the project root directory.
 """
 import sys
 import os
-import argparse
+import copy
+import atexit
+import time
+import queue
 import logging
+from logging.handlers import QueueHandler, QueueListener
+
+import cv2
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 # Add the project root to the path so modules can be imported properly
-project_root = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, project_root)
+# __file__ is already absolute for imported modules, so skip abspath()
+project_root = os.path.dirname(__file__) or os.getcwd()
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 # Import modules after adding project root to path
 from gui.main_gui import main as gui_main
 from tracker.camera import CameraCapture
 from tracker.face_tracking import FaceTracker, FaceTrackingData
-from tracker.smoothing import DataSmoother
-from tracker.landmarks_to_params import LandmarksToParameters
+from tracker.kalman import KalmanSmoother
+from tracker.landmarks_to_params import LandmarksToParameters, PARAM_FIELDS
 from tracker.calibration import FaceCalibrator, CalibrationData
 from tracker.precision_mode import PrecisionMode
+from tracker.frame_clock import FrameClock
 from sender.vmc_sender import VMCSender
 from sender.vts_sender import VTSSender
 
 
+# Configuration used when config/config.json is missing
+DEFAULT_CONFIG = {
+    "camera": {
+        "default_camera_index": 0,
+        "frame_width": 640,
+        "frame_height": 480
+    },
+    "tracking": {
+        "max_faces": 1,
+        "min_detection_confidence": 0.5,
+        "min_tracking_confidence": 0.5,
+        "input_downscale": 256,
+        "delegate": "auto",
+        "model_asset_path": "models/face_landmarker.task"
+    },
+    "smoothing": {
+        "alpha": 0.2,
+        "enabled": True,
+        "process_noise": 0.001,
+        "measurement_noise": 0.001,
+        "max_coast_frames": 15
+    },
+    "calibration": {
+        "required_samples": 30,
+        "head_yaw_multiplier": 1.0,
+        "head_pitch_multiplier": 1.0,
+        "head_roll_multiplier": 1.0,
+        "eye_left_multiplier": 1.0,
+        "eye_right_multiplier": 1.0,
+        "mouth_open_multiplier": 1.0,
+        "mouth_wide_multiplier": 1.0,
+        "head_yaw_deadzone": 0.05,
+        "head_pitch_deadzone": 0.05,
+        "head_roll_deadzone": 0.05,
+        "eye_left_deadzone": 0.05,
+        "eye_right_deadzone": 0.05,
+        "mouth_open_deadzone": 0.05,
+        "mouth_wide_deadzone": 0.05
+    },
+    "precision": {
+        "enabled": False,
+        "sensitivity_multiplier": 1.5,
+        "noise_reduction_enabled": True,
+        "noise_threshold": 0.01,
+        "eye_blink_precision": True,
+        "mouth_precision": True,
+        "head_rotation_precision": True
+    },
+    "vmc": {
+        "host": "127.0.0.1",
+        "port": 39539,
+        "enabled": True
+    },
+    "vts": {
+        "host": "127.0.0.1",
+        "port": 8001,
+        "enabled": False
+    },
+    "virtual_camera": {
+        "enabled": False,
+        "width": 640,
+        "height": 480,
+        "fps": 30
+    },
+    "gui": {
+        "window_width": 800,
+        "window_height": 600
+    }
+}
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that discards records instead of blocking when the queue is full."""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
 class VTuberTrackerApp:
     def __init__(self, stream_url=None):
         self.camera = None
@@ -35,6 +130,7 @@ class VTuberTrackerApp:
         self.vmc_sender = None
         self.vts_sender = None
         self.is_running = False
+        self.verbose_listener = None
         self.stream_url = stream_url  # URL untuk kamera Android/IP
 
         # Load configuration
@@ -45,87 +141,34 @@ class VTuberTrackerApp:
 
     def load_config(self):
         """Load configuration from config.json."""
-        import json
         try:
-            with open("config/config.json", "r") as f:
-                self.config = json.load(f)
+            with open("config/config.json", "rb") as f:
+                self.config = _json.loads(f.read())
         except FileNotFoundError:
             # Default configuration
-            self.config = {
-                "camera": {
-                    "default_camera_index": 0,
-                    "frame_width": 640,
-                    "frame_height": 480
-                },
-                "tracking": {
-                    "max_faces": 1,
-                    "min_detection_confidence": 0.5,
-                    "min_tracking_confidence": 0.5
-                },
-                "smoothing": {
-                    "alpha": 0.2,
-                    "enabled": True
-                },
-                "calibration": {
-                    "required_samples": 30,
-                    "head_yaw_multiplier": 1.0,
-                    "head_pitch_multiplier": 1.0,
-                    "head_roll_multiplier": 1.0,
-                    "eye_left_multiplier": 1.0,
-                    "eye_right_multiplier": 1.0,
-                    "mouth_open_multiplier": 1.0,
-                    "mouth_wide_multiplier": 1.0,
-                    "head_yaw_deadzone": 0.05,
-                    "head_pitch_deadzone": 0.05,
-                    "head_roll_deadzone": 0.05,
-                    "eye_left_deadzone": 0.05,
-                    "eye_right_deadzone": 0.05,
-                    "mouth_open_deadzone": 0.05,
-                    "mouth_wide_deadzone": 0.05
-                },
-                "precision": {
-                    "enabled": False,
-                    "sensitivity_multiplier": 1.5,
-                    "noise_reduction_enabled": True,
-                    "noise_threshold": 0.01,
-                    "eye_blink_precision": True,
-                    "mouth_precision": True,
-                    "head_rotation_precision": True
-                },
-                "vmc": {
-                    "host": "127.0.0.1",
-                    "port": 39539,
-                    "enabled": True
-                },
-                "vts": {
-                    "host": "127.0.0.1",
-                    "port": 8001,
-                    "enabled": False
-                },
-                "virtual_camera": {
-                    "enabled": False,
-                    "width": 640,
-                    "height": 480,
-                    "fps": 30
-                },
-                "gui": {
-                    "window_width": 800,
-                    "window_height": 600
-                }
-            }
+            self.config = copy.deepcopy(DEFAULT_CONFIG)
             logging.info("Using default configuration")
 
     def setup_logging(self):
-        """Setup logging configuration."""
-        log_level = logging.INFO
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('vtuber_tracker.log'),
-                logging.StreamHandler()
-            ]
-        )
+        """
+        Setup logging configuration.
+
+        The root logger only enqueues records; the file and console handlers
+        run on a QueueListener thread so log I/O stays off the tracking thread.
+        """
+        if not logging.getLogger().handlers:
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handlers = [logging.FileHandler('vtuber_tracker.log'), logging.StreamHandler()]
+            for handler in handlers:
+                handler.setFormatter(formatter)
+
+            log_queue = queue.Queue(-1)
+            listener = QueueListener(log_queue, *handlers)
+            listener.start()
+            # Flush remaining records at exit, including ones logged after cleanup()
+            atexit.register(listener.stop)
+
+            logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[QueueHandler(log_queue)])
         self.logger = logging.getLogger(__name__)
 
     def initialize_components(self):
@@ -138,51 +181,47 @@ class VTuberTrackerApp:
                     camera_index=self.config['camera']['default_camera_index'],
                     frame_width=self.config['camera']['frame_width'],
                     frame_height=self.config['camera']['frame_height'],
-                    stream_url=self.stream_url
+                    stream_url=self.stream_url,
+                    rgb=True
                 )
             else:
                 # Use local camera
                 self.camera = CameraCapture(
                     camera_index=self.config['camera']['default_camera_index'],
                     frame_width=self.config['camera']['frame_width'],
-                    frame_height=self.config['camera']['frame_height']
+                    frame_height=self.config['camera']['frame_height'],
+                    rgb=True
                 )
 
             # Initialize face tracker
             self.face_tracker = FaceTracker(
                 max_num_faces=self.config['tracking']['max_faces'],
                 min_detection_confidence=self.config['tracking']['min_detection_confidence'],
-                min_tracking_confidence=self.config['tracking']['min_tracking_confidence']
+                min_tracking_confidence=self.config['tracking']['min_tracking_confidence'],
+                delegate=self.config['tracking'].get('delegate', 'cpu'),
+                model_asset_path=self.config['tracking'].get('model_asset_path'),
+                # CLI mode only tracks frames (no preview or virtual camera),
+                # so the camera hands over RGB directly
+                input_rgb=True
             )
+            self.logger.info(f"Face tracker backend: {self.face_tracker.backend}")
 
             # Initialize smoother
-            self.smoother = DataSmoother(
-                alpha=self.config['smoothing']['alpha'],
+            self.smoother = KalmanSmoother(
+                process_noise=self.config['smoothing'].get('process_noise', 1e-3),
+                measurement_noise=self.config['smoothing'].get('measurement_noise', 1e-3),
+                max_coast_frames=self.config['smoothing'].get('max_coast_frames', 15),
                 enabled=self.config['smoothing']['enabled']
             )
 
             # Initialize parameter mapper
             self.mapper = LandmarksToParameters()
             
-            # Set mapper parameters from config
-            self.mapper.update_sensitivity(
-                head_yaw_multiplier=self.config['calibration']['head_yaw_multiplier'],
-                head_pitch_multiplier=self.config['calibration']['head_pitch_multiplier'],
-                head_roll_multiplier=self.config['calibration']['head_roll_multiplier'],
-                eye_left_multiplier=self.config['calibration']['eye_left_multiplier'],
-                eye_right_multiplier=self.config['calibration']['eye_right_multiplier'],
-                mouth_open_multiplier=self.config['calibration']['mouth_open_multiplier'],
-                mouth_wide_multiplier=self.config['calibration']['mouth_wide_multiplier']
-            )
-            
-            self.mapper.update_deadzones(
-                head_yaw_deadzone=self.config['calibration']['head_yaw_deadzone'],
-                head_pitch_deadzone=self.config['calibration']['head_pitch_deadzone'],
-                head_roll_deadzone=self.config['calibration']['head_roll_deadzone'],
-                eye_left_deadzone=self.config['calibration']['eye_left_deadzone'],
-                eye_right_deadzone=self.config['calibration']['eye_right_deadzone'],
-                mouth_open_deadzone=self.config['calibration']['mouth_open_deadzone'],
-                mouth_wide_deadzone=self.config['calibration']['mouth_wide_deadzone']
+            # Set mapper multipliers/deadzones from config as packed vectors
+            calibration = self.config['calibration']
+            self.mapper.set_vectors(
+                [calibration[f'{field}_multiplier'] for field in PARAM_FIELDS],
+                [calibration[f'{field}_deadzone'] for field in PARAM_FIELDS]
             )
 
             # Initialize calibrator
@@ -224,6 +263,49 @@ class VTuberTrackerApp:
             self.logger.error(f"Error initializing components: {e}")
             return False
 
+    def _start_verbose_logger(self):
+        """
+        Create the logger used for per-frame verbose output.
+
+        Records go through a bounded queue to a listener thread that writes
+        them to stdout, so terminal I/O never blocks the tracking loop; when
+        the terminal falls behind, records are dropped.
+        """
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        verbose_queue = queue.Queue(maxsize=64)
+        self.verbose_listener = QueueListener(verbose_queue, handler)
+        self.verbose_listener.start()
+
+        verbose_logger = logging.getLogger(__name__ + '.verbose')
+        verbose_logger.handlers[:] = [DroppingQueueHandler(verbose_queue)]
+        verbose_logger.setLevel(logging.INFO)
+        verbose_logger.propagate = False
+        return verbose_logger
+
+    def _build_and_send(self, smoothed_data):
+        """
+        Map tracking data once for the senders that can take it and dispatch
+        to each of them.
+
+        Only the protocol(s) of enabled, connected senders are mapped, and
+        mapping is skipped entirely when neither sender is connected.
+        """
+        vmc_sender = self.vmc_sender
+        vts_sender = self.vts_sender
+        send_vmc = self.config['vmc']['enabled'] and vmc_sender is not None and vmc_sender.is_connected
+        send_vts = self.config['vts']['enabled'] and vts_sender is not None and vts_sender.ready
+        if not (send_vmc or send_vts):
+            return
+
+        protocol = "both" if send_vmc and send_vts else ("vmc" if send_vmc else "vts")
+        all_params = self.mapper.process_tracking_data(smoothed_data, protocol)
+
+        if send_vmc:
+            vmc_sender.send_tracking_data(all_params["vmc"])
+        if send_vts:
+            vts_sender.send_tracking_data(all_params["vts"])
+
     def run_tracking_loop(self):
         """Run the main tracking loop (for command-line mode)."""
         if not self.initialize_components():
@@ -232,60 +314,83 @@ class VTuberTrackerApp:
         self.is_running = True
         self.logger.info("Starting tracking loop...")
 
+        # Capture runs on the camera's reader thread so grabbing the next frame
+        # overlaps with tracking the current one; the tracker always takes the newest
+        self.camera.start_async()
+
+        # Longest side (pixels) frames are shrunk to before tracking; 0 disables.
+        # FaceMesh landmarks are normalized, so no output rescaling is needed.
+        downscale = self.config['tracking'].get('input_downscale', 0)
+
+        # Pace frames against a monotonic deadline so processing time
+        # does not add to the frame interval
+        clock = FrameClock(30)  # ~30 FPS
+
+        # Bind loop-invariant components, methods and config flags once;
+        # CLI mode never changes them while the loop is running
+        calibrator = self.calibrator
+        precision_mode = self.precision_mode
+        process = self.face_tracker.process_frame
+        enhance = precision_mode.enhance_tracking_data
+        smooth = self.smoother.smooth_data
+        build_and_send = self._build_and_send
+        verbose = getattr(self, 'verbose', False)
+        if verbose:
+            log_verbose = self._start_verbose_logger().info
+        get_frame = self.camera.get_frame
+        resize = cv2.resize
+
         try:
             while self.is_running:
-                # Get frame from camera
-                frame = self.camera.get_frame()
+                # Get the freshest frame from the capture thread
+                frame = get_frame()
                 if frame is None:
                     continue
 
+                # Shrink to the tracker's working resolution, keeping aspect ratio
+                h, w = frame.shape[:2]
+                if downscale and max(h, w) > downscale:
+                    scale = downscale / max(h, w)
+                    frame = resize(frame, (round(w * scale), round(h * scale)),
+                                       interpolation=cv2.INTER_AREA)
+
                 # Process face tracking
-                raw_data = self.face_tracker.process_frame(frame)
+                raw_data = process(frame)
 
                 # Apply calibration if active
-                if self.calibrator.is_calibrating:
+                if calibrator.is_calibrating:
                     # Collect sample for calibration
-                    is_calibrated = self.calibrator.collect_sample(raw_data)
+                    is_calibrated = calibrator.collect_sample(raw_data)
                     if is_calibrated:
                         self.logger.info("Calibration completed")
                     # Use raw data during calibration
                     calibrated_data = raw_data
                 else:
                     # Apply calibration to tracking data if calibration exists
-                    calibrated_data = self.calibrator.apply_calibration(raw_data)
+                    calibrated_data = calibrator.apply_calibration(raw_data)
 
                 # Apply precision mode enhancement if enabled
-                enhanced_data = self.precision_mode.enhance_tracking_data(calibrated_data)
-
-                # Apply smoothing
-                smoothed_data = self.smoother.smooth_data(enhanced_data)
-
-                # Map to parameters
-                all_params = self.mapper.process_tracking_data(smoothed_data, "both")
+                enhanced_data = enhance(calibrated_data)
 
-                # Send to VMC if enabled
-                if self.config['vmc']['enabled'] and self.vmc_sender.is_connected:
-                    self.vmc_sender.send_tracking_data(all_params.get("vmc", {}))
+                # Apply Kalman smoothing; coasts on prediction while no face is detected
+                smoothed_data = smooth(enhanced_data)
 
-                # Send to VTS if enabled
-                if self.config['vts']['enabled'] and self.vts_sender.is_connected:
-                    self.vts_sender.send_tracking_data(all_params.get("vts", {}))
+                # Map to parameters and send to the enabled VMC/VTS senders
+                build_and_send(smoothed_data)
 
                 # Print tracking data if in verbose mode
-                if hasattr(self, 'verbose') and self.verbose:
-                    print(f"Yaw: {smoothed_data.head_yaw:.2f}, "
-                          f"Pitch: {smoothed_data.head_pitch:.2f}, "
-                          f"Roll: {smoothed_data.head_roll:.2f}, "
-                          f"Left Eye: {smoothed_data.eye_left:.2f}, "
-                          f"Right Eye: {smoothed_data.eye_right:.2f}, "
-                          f"Mouth Open: {smoothed_data.mouth_open:.2f}, "
-                          f"Mouth Wide: {smoothed_data.mouth_wide:.2f}, "
-                          f"Calibrated: {self.calibrator.calibration_data.is_calibrated}, "
-                          f"Precision: {self.precision_mode.enabled}")
-
-                # Small delay to control frame rate
-                import time
-                time.sleep(1/30)  # ~30 FPS
+                if verbose:
+                    log_verbose("Yaw: %.2f, Pitch: %.2f, Roll: %.2f, "
+                                "Left Eye: %.2f, Right Eye: %.2f, "
+                                "Mouth Open: %.2f, Mouth Wide: %.2f, "
+                                "Calibrated: %s, Precision: %s",
+                                smoothed_data.head_yaw, smoothed_data.head_pitch, smoothed_data.head_roll,
+                                smoothed_data.eye_left, smoothed_data.eye_right,
+                                smoothed_data.mouth_open, smoothed_data.mouth_wide,
+                                calibrator.calibration_data.is_calibrated, precision_mode.enabled)
+
+                # Sleep until the next frame deadline; resync after an overrun
+                clock.tick()
 
         except KeyboardInterrupt:
             self.logger.info("Tracking interrupted by user")
@@ -306,6 +411,13 @@ class VTuberTrackerApp:
 
     def cleanup(self):
         """Clean up resources."""
+        self.is_running = False
+
+        # Flush and stop verbose output
+        if self.verbose_listener:
+            self.verbose_listener.stop()
+            self.verbose_listener = None
+
         if self.camera:
             self.camera.release()
             self.camera = None
@@ -326,32 +438,28 @@ class VTuberTrackerApp:
         self.calibrator = None
         self.precision_mode = None
 
-        self.is_running = False
         self.logger.info("Cleanup completed")
 
 
-def main():
-    parser = argparse.ArgumentParser(description='VTuber Face Tracking System')
-    parser.add_argument('--mode', choices=['gui', 'cli'], default='gui',
-                        help='Run mode: gui (default) or cli (command-line)')
-    parser.add_argument('--camera', type=int, default=None,
-                        help='Camera index to use')
-    parser.add_argument('--stream-url', type=str, default=None,
-                        help='IP stream URL for Android/iPhone camera (e.g., http://192.168.1.100:8080/video)')
-    parser.add_argument('--verbose', action='store_true',
-                        help='Enable verbose output in CLI mode')
-
-    args = parser.parse_args()
+def main(mode='gui', camera=None, stream_url=None, verbose=False):
+    """
+    Run the VTuber tracker application.
 
+    Args:
+        mode: "gui" (default) or "cli"
+        camera: Camera index to use, or None for the configured default
+        stream_url: IP stream URL for Android/iPhone camera, or None
+        verbose: Print tracking data every frame in CLI mode
+    """
     # Initialize app with stream URL if provided
-    app = VTuberTrackerApp(stream_url=args.stream_url)
+    app = VTuberTrackerApp(stream_url=stream_url)
 
     # Override config with command line args if provided
-    if args.camera is not None:
-        app.config['camera']['default_camera_index'] = args.camera
+    if camera is not None:
+        app.config['camera']['default_camera_index'] = camera
 
-    if args.mode == 'cli':
-        app.verbose = args.verbose
+    if mode == 'cli':
+        app.verbose = verbose
         success = app.run_tracking_loop()
     else:
         success = app.run_gui()
@@ -361,5 +469,23 @@ def main():
         sys.exit(1)
 
 
+def parse_args():
+    """Parse command line arguments when run_app.py is executed directly."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='VTuber Face Tracking System')
+    parser.add_argument('--mode', choices=['gui', 'cli'], default='gui',
+                        help='Run mode: gui (default) or cli (command-line)')
+    parser.add_argument('--camera', type=int, default=None,
+                        help='Camera index to use')
+    parser.add_argument('--stream-url', type=str, default=None,
+                        help='IP stream URL for Android/iPhone camera (e.g., http://192.168.1.100:8080/video)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Enable verbose output in CLI mode')
+
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    main(mode=args.mode, camera=args.camera, stream_url=args.stream_url, verbose=args.verbose)
\ No newline at end of file
@@ -22,18 +22,32 @@ import sys
 import subprocess
 import importlib.util
 import platform
+import atexit
+import queue
 import logging
+from logging.handlers import QueueHandler, QueueListener
+
+log_listener = None
 
 def setup_logging():
-    """Setup logging untuk aplikasi utama"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('vtuber_tracker_launcher.log'),
-            logging.StreamHandler()
-        ]
-    )
+    """
+    Setup logging untuk aplikasi utama
+
+    Root logger hanya memasukkan record ke queue; handler file dan console
+    dijalankan oleh thread QueueListener agar I/O log tidak memblokir aplikasi.
+    """
+    global log_listener
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler('vtuber_tracker_launcher.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    log_listener = QueueListener(log_queue, *handlers)
+    log_listener.start()
+    atexit.register(log_listener.stop)  # Tulis sisa record saat keluar
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[QueueHandler(log_queue)])
     return logging.getLogger(__name__)
 
 logger = setup_logging()
@@ -100,6 +114,21 @@ def run_with_venv(venv_path, args):
     # Siapkan command untuk menjalankan main.py
     cmd = [python_executable, "main.py"] + args
     
+    if platform.system() != "Windows":
+        # Ganti proses ini dengan Python venv (tidak kembali jika berhasil),
+        # sehingga tidak ada proses induk yang menunggu selama aplikasi berjalan
+        # atexit tidak berjalan saat execv, jadi tulis sisa log sekarang
+        log_listener.stop()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            os.execv(python_executable, cmd)
+        except OSError as e:
+            log_listener.start()
+            logger.error(f"Error menjalankan aplikasi: {e}")
+            return 1
+    
+    # Windows: execv tidak mempertahankan semantik console, tetap pakai subprocess
     try:
         result = subprocess.run(cmd)
         return result.returncode
@@ -3,17 +3,93 @@ VMC sender module for VTuber face tracking system.
 Sends face tracking data to VSeeFace via OSC protocol.
 """
 import socket
+import math
 import time
 import struct
 import json
 import logging
 from pythonosc import udp_client
+from pythonosc import osc_bundle_builder
 from pythonosc.osc_message_builder import OscMessageBuilder
 import threading
+import queue
 from typing import Dict, Any, Optional
 
+# Blendshapes sent every frame, plus optional ones sent only when present
+BLENDSHAPE_NAMES = ("Blink_L", "Blink_R", "A", "I", "U", "E", "O", "Joy")
+OPTIONAL_BLENDSHAPE_NAMES = ("MouthSmileL", "MouthSmileR")
+
+# OSC bundle header: "#bundle" plus the "immediately" time tag
+BUNDLE_HEADER = b"#bundle\x00" + struct.pack(">Q", osc_bundle_builder.IMMEDIATELY)
+
+# Blendshape changes smaller than this are not resent
+BLENDSHAPE_EPSILON = 1e-3
+# Every Nth frame all blendshapes are sent, so receivers can't drift
+FULL_SNAPSHOT_INTERVAL = 60
+# Frames waiting for the sender thread; older ones are dropped when full
+SEND_QUEUE_SIZE = 2
+# Queue item telling the sender thread to finish
+_STOP = object()
+
+class VMCParams:
+    """
+    Per-frame VMC values passed from LandmarksToParameters to VMCSender.
+    
+    Uses __slots__ so per-frame reads are plain attribute loads rather than
+    dict lookups. Head rotation defaults to neutral (0.0) so it is always
+    present; optional blendshapes are None when absent.
+    """
+    __slots__ = ("head_yaw", "head_pitch", "head_roll") + BLENDSHAPE_NAMES + OPTIONAL_BLENDSHAPE_NAMES
+    
+    def __init__(self, head_yaw=0.0, head_pitch=0.0, head_roll=0.0,
+                 Blink_L=0.0, Blink_R=0.0, A=0.0, I=0.0, U=0.0, E=0.0, O=0.0, Joy=0.0,
+                 MouthSmileL=None, MouthSmileR=None):
+        self.head_yaw = head_yaw
+        self.head_pitch = head_pitch
+        self.head_roll = head_roll
+        self.Blink_L = Blink_L
+        self.Blink_R = Blink_R
+        self.A = A
+        self.I = I
+        self.U = U
+        self.E = E
+        self.O = O
+        self.Joy = Joy
+        self.MouthSmileL = MouthSmileL
+        self.MouthSmileR = MouthSmileR
+    
+    @classmethod
+    def from_dict(cls, params: Dict[str, Any]) -> "VMCParams":
+        """Build from a parameter dictionary, ignoring unknown keys."""
+        return cls(**{key: value for key, value in params.items() if key in cls.__slots__})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the parameters that are set as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+def _euler_to_quat(roll: float, pitch: float, yaw: float, _sin=math.sin, _cos=math.cos):
+    """Euler angles (radians) to quaternion (w, x, y, z), using half-angle trig."""
+    roll *= 0.5
+    pitch *= 0.5
+    yaw *= 0.5
+    cr = _cos(roll)
+    sr = _sin(roll)
+    cp = _cos(pitch)
+    sp = _sin(pitch)
+    cy = _cos(yaw)
+    sy = _sin(yaw)
+    
+    crcp = cr * cp
+    srsp = sr * sp
+    srcp = sr * cp
+    crsp = cr * sp
+    return (crcp * cy + srsp * sy,
+            srcp * cy - crsp * sy,
+            crsp * cy + srcp * sy,
+            crcp * sy - srsp * cy)
+
 class VMCSender:
-    def __init__(self, host="127.0.0.1", port=39539, enabled=True):
+    def __init__(self, host="127.0.0.1", port=39539, enabled=True, on_connection_changed=None):
         """
         Initialize VMC sender for VSeeFace communication.
         
@@ -21,82 +97,246 @@ class VMCSender:
             host: Host address for OSC communication
             port: Port for OSC communication (default 39539 for VSeeFace)
             enabled: Whether VMC sending is enabled
+            on_connection_changed: Optional callback invoked with the new
+                connection state (bool) whenever it changes
         """
         self.host = host
         self.port = port
         self.enabled = enabled
         self.client = None
         self.is_connected = False
+        self.on_connection_changed = on_connection_changed
+        self._sock = None
+        self._addr = None
+        self._last_sent = {}
+        self._frame_count = 0
+        # Size-1 cache of the last head rotation (rounded Euler key -> quaternion)
+        self._last_euler = None
+        self._last_quat = None
+        # Frames are packed and sent on a sender thread so a slow network
+        # stack never stalls the tracking loop; the packing state above is
+        # only touched by that thread while it runs
+        self._send_q = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._sender_thread = None
+        self._build_templates()
         self.connect()
     
+    def _build_templates(self):
+        """
+        Pre-build the OSC bundle elements sent every frame.
+        
+        Each template is the size-prefixed message bytes with placeholder
+        floats at the end; per frame only those floats are patched in place.
+        """
+        self._blend_templates = {
+            name: self._element_template("/VMC/Ext/Blend/Val", [name, 0.0, 1])
+            for name in BLENDSHAPE_NAMES + OPTIONAL_BLENDSHAPE_NAMES
+        }
+        self._rot_template = self._element_template("/VMC/Ext/Root/Rot", [0.0, 0.0, 0.0, 0.0])
+        self._apply_element = bytes(self._element_template("/VMC/Ext/Blend/Apply", []))
+    
+    @classmethod
+    def _element_template(cls, address: str, args):
+        """Return a bundle element (size prefix + message) as a bytearray."""
+        dgram = cls._build_message(address, args).dgram
+        return bytearray(struct.pack(">i", len(dgram)) + dgram)
+    
+    def _set_connected(self, connected: bool):
+        """Update the connection state and notify the listener on change."""
+        if self.is_connected == connected:
+            return
+        self.is_connected = connected
+        if self.on_connection_changed:
+            self.on_connection_changed(connected)
+    
     def connect(self):
         """Connect to VSeeFace via OSC."""
         try:
             self.client = udp_client.SimpleUDPClient(self.host, self.port)
-            self.is_connected = True
+            # Raw socket for the per-frame bundles, bypassing the message builder.
+            # Connected to the fixed destination so sends skip per-packet address
+            # handling, and non-blocking so a full send buffer drops a frame
+            # instead of stalling the tracker.
+            family, _, _, _, self._addr = socket.getaddrinfo(
+                self.host, self.port, type=socket.SOCK_DGRAM)[0]
+            self._sock = socket.socket(family, socket.SOCK_DGRAM)
+            self._sock.connect(self._addr)
+            self._sock.setblocking(False)
+            if self._sender_thread is None:
+                self._sender_thread = threading.Thread(target=self._send_loop, daemon=True)
+                self._sender_thread.start()
+            self._set_connected(True)
             logging.info(f"Connected to VSeeFace at {self.host}:{self.port}")
             return True
         except Exception as e:
-            self.is_connected = False
+            self._set_connected(False)
             logging.error(f"Failed to connect to VSeeFace at {self.host}:{self.port}: {e}")
             return False
     
     def disconnect(self):
         """Disconnect from VSeeFace."""
-        self.is_connected = False
+        self._set_connected(False)
+        # Let the sender thread send what is queued, then stop it
+        sender_thread = self._sender_thread
+        if sender_thread is not None:
+            self._enqueue(_STOP)
+            sender_thread.join(timeout=1.0)
+            self._sender_thread = None
         self.client = None
+        self._last_sent = {}
+        if self._sock:
+            self._sock.close()
+            self._sock = None
         logging.info("Disconnected from VSeeFace")
     
-    def send_tracking_data(self, tracking_params: Dict[str, Any]):
+    def send_tracking_data(self, tracking_params):
         """
         Send tracking data to VSeeFace via OSC.
         
+        Returns immediately: the frame is queued for the sender thread,
+        dropping the oldest queued frame if the thread is behind.
+        
         Args:
-            tracking_params: Dictionary containing VMC parameters
+            tracking_params: VMCParams (or a dictionary of VMC parameters);
+                must not be modified after the call, pass a new one per frame
         """
         if not self.enabled or not self.is_connected or not self.client:
             return
         
+        if isinstance(tracking_params, dict):
+            # Converting also snapshots the caller's dict
+            tracking_params = VMCParams.from_dict(tracking_params)
+        self._enqueue(tracking_params)
+    
+    def _enqueue(self, item):
+        """Queue an item for the sender thread, dropping the oldest one if full."""
+        send_q = self._send_q
+        try:
+            send_q.put_nowait(item)
+        except queue.Full:
+            try:
+                send_q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                send_q.put_nowait(item)
+            except queue.Full:
+                logging.debug("VMC send queue full, dropping frame")
+    
+    def _send_loop(self):
+        """Sender thread: pack and send queued frames until told to stop."""
+        send_q = self._send_q
+        while True:
+            params = send_q.get()
+            if params is _STOP:
+                return
+            self._send_sync(params)
+    
+    def _send_sync(self, p: VMCParams):
+        """
+        Pack one frame into an OSC bundle and send it.
+        
+        Args:
+            p: VMC parameters of the frame
+        """
+        if self._sock is None:
+            return
+        
         try:
+            # All messages for this frame go out as one OSC bundle (one UDP datagram),
+            # assembled from the pre-built templates
+            parts = [BUNDLE_HEADER]
+            
             # Send head position and rotation
             # VMC Protocol: /VMC/Ext/Root/Pos pos x y z
             # VMC Protocol: /VMC/Ext/Root/Rot rot rw rx ry rz
-            # Head rotation
-            if all(key in tracking_params for key in ["head_yaw", "head_pitch", "head_roll"]):
-                # Convert radians to quaternion for VMC
-                quat = self.euler_to_quaternion(
-                    tracking_params["head_pitch"],  # pitch (x)
-                    tracking_params["head_yaw"],    # yaw (y) 
-                    tracking_params["head_roll"]    # roll (z)
-                )
-                
-                self.client.send_message("/VMC/Ext/Root/Rot", [1.0, quat[1], quat[2], quat[3]])  # w, x, y, z
+            # Head rotation (always present on VMCParams). Convert radians to
+            # quaternion for VMC, reusing the previous result while the head
+            # is (nearly) still
+            euler = (
+                p.head_pitch,  # pitch (x)
+                p.head_yaw,    # yaw (y) 
+                p.head_roll    # roll (z)
+            )
+            key = (round(euler[0], 4), round(euler[1], 4), round(euler[2], 4))
+            if key == self._last_euler:
+                quat = self._last_quat
+            else:
+                quat = _euler_to_quat(*euler)
+                self._last_euler, self._last_quat = key, quat
             
-            # Send blendshape parameters
-            blendshape_mappings = {
-                "Blink_L": tracking_params.get("Blink_L", 0.0),
-                "Blink_R": tracking_params.get("Blink_R", 0.0),
-                "A": tracking_params.get("A", 0.0),  # Mouth open
-                "I": tracking_params.get("I", 0.0),  # Mouth shape
-                "U": tracking_params.get("U", 0.0),  # Mouth shape
-                "E": tracking_params.get("E", 0.0),  # Mouth shape
-                "O": tracking_params.get("O", 0.0),  # Mouth shape
-                "Joy": tracking_params.get("Joy", 0.0)  # Smile
-            }
+            rot = self._rot_template
+            struct.pack_into(">ffff", rot, len(rot) - 16, 1.0, quat[1], quat[2], quat[3])  # w, x, y, z
+            parts.append(rot)
             
-            for blendshape_name, value in blendshape_mappings.items():
-                self.client.send_message("/VMC/Ext/Blend/Val", [blendshape_name, value, 1])
+            # Send blendshape parameters, skipping ones that haven't changed
+            # since they were last sent (except on periodic full snapshots)
+            full_snapshot = self._frame_count % FULL_SNAPSHOT_INTERVAL == 0
+            self._frame_count += 1
+            last_sent = self._last_sent
+            blend_count = 0
+            values = (p.Blink_L, p.Blink_R, p.A, p.I, p.U, p.E, p.O, p.Joy)  # BLENDSHAPE_NAMES order
+            for blendshape_name, value in zip(BLENDSHAPE_NAMES, values):
+                if not full_snapshot and abs(value - last_sent.get(blendshape_name, math.inf)) < BLENDSHAPE_EPSILON:
+                    continue
+                last_sent[blendshape_name] = value
+                element = self._blend_templates[blendshape_name]
+                struct.pack_into(">f", element, len(element) - 8, value)
+                parts.append(element)
+                blend_count += 1
             
             # Send additional face tracking parameters as custom blendshapes
             # These might not be standard but can be mapped in VSeeFace
-            if "MouthSmileL" in tracking_params:
-                self.client.send_message("/VMC/Ext/Blend/Val", ["MouthSmileL", tracking_params["MouthSmileL"], 1])
-            if "MouthSmileR" in tracking_params:
-                self.client.send_message("/VMC/Ext/Blend/Val", ["MouthSmileR", tracking_params["MouthSmileR"], 1])
+            for blendshape_name, value in zip(OPTIONAL_BLENDSHAPE_NAMES, (p.MouthSmileL, p.MouthSmileR)):
+                if value is not None:
+                    if not full_snapshot and abs(value - last_sent.get(blendshape_name, math.inf)) < BLENDSHAPE_EPSILON:
+                        continue
+                    last_sent[blendshape_name] = value
+                    element = self._blend_templates[blendshape_name]
+                    struct.pack_into(">f", element, len(element) - 8, value)
+                    parts.append(element)
+                    blend_count += 1
+            
+            # VMC Protocol: blendshape values take effect on /VMC/Ext/Blend/Apply
+            if blend_count:
+                parts.append(self._apply_element)
+            
+            self._send_raw(b"".join(parts))
                 
         except Exception as e:
             logging.error(f"Error sending tracking data to VSeeFace: {e}")
     
+    def _send_raw(self, dgram: bytes):
+        """
+        Send a datagram on the connected socket, dropping it if it can't go out now.
+        
+        Args:
+            dgram: Complete OSC packet
+        """
+        try:
+            self._sock.send(dgram)
+        except (BlockingIOError, ConnectionRefusedError):
+            # Send buffer full, or ICMP port-unreachable from an earlier packet
+            # (VSeeFace not listening yet); the next frame supersedes this one
+            pass
+    
+    @staticmethod
+    def _build_message(address: str, args):
+        """
+        Build a single OSC message for inclusion in a bundle.
+        
+        Args:
+            address: OSC address
+            args: List of message arguments
+            
+        Returns:
+            Built OscMessage
+        """
+        builder = OscMessageBuilder(address=address)
+        for arg in args:
+            builder.add_arg(arg)
+        return builder.build()
+    
     def send_raw_osc(self, address: str, value: Any):
         """
         Send a raw OSC message.
@@ -127,19 +367,7 @@ class VMCSender:
         """
         # Convert from normalized values to radians if needed
         # In our case, the values are already in radians (from face tracking)
-        cr = math.cos(roll * 0.5)
-        sr = math.sin(roll * 0.5)
-        cp = math.cos(pitch * 0.5)
-        sp = math.sin(pitch * 0.5)
-        cy = math.cos(yaw * 0.5)
-        sy = math.sin(yaw * 0.5)
-        
-        w = cr * cp * cy + sr * sp * sy
-        x = sr * cp * cy - cr * sp * sy
-        y = cr * sp * cy + sr * cp * sy
-        z = cr * cp * sy - sr * sp * cy
-        
-        return [w, x, y, z]
+        return list(_euler_to_quat(roll, pitch, yaw))
     
     def enable(self):
         """Enable VMC sending."""
@@ -164,9 +392,6 @@ class VMCSender:
         self.disconnect()
         self.connect()
 
-# Test the VMC sender without math import issue
-import math
-
 if __name__ == "__main__":
     # Test the VMC sender
     import time
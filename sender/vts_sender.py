@@ -5,14 +5,70 @@ Sends face tracking data to VTube Studio via WebSocket API.
 import websocket
 import json
 import threading
+import queue
 import time
 import uuid
+import itertools
+import array
+import math
+import socket
 import logging
 from typing import Dict, Any, Optional
-import requests
+import numpy as np
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    _loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _loads = json.loads
+
+# ParameterUpdateRequest envelope, serialized once; per request only the
+# requestID and the parameterValues array are filled in
+PARAM_REQUEST_PREFIX = (b'{"apiName":"VTubeStudioPublicAPI","apiVersion":"1.0",'
+                        b'"messageType":"ParameterUpdateRequest","requestID":"')
+PARAM_REQUEST_VALUES = b'","data":{"parameterValues":'
+PARAM_REQUEST_SUFFIX = b'}}'
+
+# Parameters produced by LandmarksToParameters; their last sent values are
+# cached as quantized ints in a flat array indexed by this order
+VTS_PARAM_NAMES = (
+    "ParamAngleX", "ParamAngleY", "ParamAngleZ",
+    "ParamEyeLOpen", "ParamEyeROpen",
+    "ParamMouthOpenY", "ParamMouthForm",
+    "ParamSmile",
+)
+# Pre-encoded '{"id":"<name>","value":' prefix per known parameter
+PARAM_FRAGMENTS = {name: b'{"id":"' + name.encode() + b'","value":' for name in VTS_PARAM_NAMES}
+PARAM_QUANT_SCALE = 100  # Values are compared at 0.01 resolution
+# Decimal places sent for known parameters; full float reprs (~17 digits)
+# roughly double the payload without any visible difference on the model
+PARAM_SEND_DIGITS = 4
+# From this many known parameters (e.g. a full ARKit blendshape set), the
+# per-frame diff runs vectorized with NumPy instead of a Python comprehension;
+# below it NumPy's call overhead outweighs the saving
+VECTOR_DIFF_MIN_PARAMS = 20
+# Direct-mapped cache size for parameters outside VTS_PARAM_NAMES (power of
+# two); a colliding parameter evicts the slot and is simply sent again
+EXTRA_CACHE_SLOTS = 128
+MAX_PARAM_TEMPLATES = 256  # Enough for every subset of the 8 known parameters
+_UNSENT = -2 ** 31
+PROBE_TIMEOUT = 0.3  # Seconds to wait for the VTube Studio port to accept
+PROBE_CACHE_TTL = 5.0  # Seconds a probe result is reused
+AUTH_WAIT = 1.0  # Seconds connect() waits for the authentication response
+# No Nagle delay for the small per-frame requests, and room in the kernel
+# send buffer for a whole drained batch in one write
+WS_SOCKET_OPTIONS = (
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_SNDBUF, 64 * 1024),
+)
 
 class VTSSender:
-    def __init__(self, host="127.0.0.1", port=8001, enabled=True):
+    def __init__(self, host="127.0.0.1", port=8001, enabled=True, on_connection_changed=None):
         """
         Initialize VTS sender for VTube Studio communication.
         
@@ -20,6 +76,9 @@ class VTSSender:
             host: Host address for VTube Studio WebSocket
             port: Port for VTube Studio WebSocket (default 8001)
             enabled: Whether VTS sending is enabled
+            on_connection_changed: Optional callback invoked with the new
+                connection state (bool) whenever it changes. May be called
+                from the WebSocket thread.
         """
         self.host = host
         self.port = port
@@ -32,96 +91,215 @@ class VTSSender:
         self.plugin_developer = "VTuber Tracker"
         self.plugin_icon = ""  # Base64 encoded icon if needed
         self.session_id = None
+        self.on_connection_changed = on_connection_changed
+        self._probe_cache = {}  # (host, port) -> (reachable, monotonic time)
         
-        # Parameter values cache to avoid sending unchanged values
-        self.param_cache = {}
+        # Parameter values cache to avoid sending unchanged values; known
+        # parameters use the quantized array, others a fixed-size
+        # direct-mapped table of (name, value) slots so it stays bounded
+        self._cache_slots = [(None, 0.0)] * EXTRA_CACHE_SLOTS
+        self._param_index = {name: i for i, name in enumerate(VTS_PARAM_NAMES)}
+        self._q_cache = array.array('i', [_UNSENT] * len(VTS_PARAM_NAMES))
+        # NumPy view sharing the cache's memory, used for large parameter tables
+        self._q_view = (np.frombuffer(self._q_cache, dtype=np.int32)
+                        if len(VTS_PARAM_NAMES) >= VECTOR_DIFF_MIN_PARAMS else None)
+        
+        # Request IDs only need to be unique: a random per-session prefix plus
+        # a counter (itertools.count is safe to share with the sender thread)
+        self._req_prefix = uuid.uuid4().hex[:24]
+        self._req_counter = itertools.count()
+        
+        # Outgoing queue for the sender thread, the only thread that writes to
+        # the socket: changed-parameter dicts (coalesced into one
+        # ParameterUpdateRequest) and pre-serialized requests (bytes)
+        self._send_q = queue.Queue(maxsize=256)
+        self._sender_thread = None
+        # Reusable {"id", "value"} objects for parameters outside
+        # VTS_PARAM_NAMES; only touched by the sender thread
+        self._update_objs = {}
+        # Whole-request %-format templates by parameter-name tuple (False when
+        # the tuple contains parameters outside VTS_PARAM_NAMES)
+        self._param_templates = {}
+        # Reusable buffer the sender thread assembles multi-frame writes in
+        self._frame_buf = bytearray(8192)
+        # (token, encoded AuthenticationRequest) reused while the token is unchanged
+        self._auth_payload = None
+        
+        # Incoming message handlers by messageType
+        self._handlers = {
+            "APIError": self._on_api_error,
+            "AuthenticationToken": self._on_authentication_token,
+            "AuthenticationResponse": self._on_authentication_response,
+            "CurrentModelParameters": self._on_current_model_parameters,
+        }
+        self._authenticated = threading.Event()
         
         # Start WebSocket connection
         if self.enabled:
             self.connect()
     
-    def connect(self):
-        """Connect to VTube Studio via WebSocket."""
+    @property
+    def ready(self) -> bool:
+        """
+        Whether send_tracking_data would send anything right now.
+        
+        Callers can check this before building the parameters for a frame:
+        ``if vts_sender.ready: vts_sender.send_tracking_data(params)``.
+        """
+        return self.enabled and self.is_connected and self.ws is not None
+    
+    def _set_connected(self, connected: bool):
+        """Update the connection state and notify the listener on change."""
+        if self.is_connected == connected:
+            return
+        self.is_connected = connected
+        if self.on_connection_changed:
+            self.on_connection_changed(connected)
+    
+    def _is_vts_reachable(self) -> bool:
+        """
+        Check whether something is listening on the VTube Studio port.
+        
+        The result is cached per host/port for PROBE_CACHE_TTL seconds so
+        repeated connect attempts don't each pay for a TCP handshake.
+        
+        Returns:
+            True if a TCP connection could be opened
+        """
+        key = (self.host, self.port)
+        now = time.monotonic()
+        cached = self._probe_cache.get(key)
+        if cached is not None and now - cached[1] < PROBE_CACHE_TTL:
+            return cached[0]
+        
         try:
-            # First, check if VTube Studio is running by making an HTTP request
-            response = requests.get(f"http://{self.host}:{self.port}/api/getfolderinfo", timeout=2)
-            if response.status_code != 200:
-                logging.error("VTube Studio does not appear to be running")
-                return False
-        except requests.exceptions.RequestException:
+            with socket.create_connection(key, timeout=PROBE_TIMEOUT):
+                reachable = True
+        except OSError:
+            reachable = False
+        
+        self._probe_cache[key] = (reachable, now)
+        return reachable
+    
+    def connect(self):
+        """
+        Connect to VTube Studio via WebSocket.
+        
+        An existing connection is only replaced once the new one is open, so
+        sends keep going to the old one until then.
+        """
+        # First, check if VTube Studio is running
+        if not self._is_vts_reachable():
             logging.error("Cannot connect to VTube Studio, make sure it's running")
             return False
         
         try:
-            # Connect to WebSocket
-            self.ws = websocket.WebSocketApp(
-                self.url,
-                on_open=self.on_open,
-                on_message=self.on_message,
-                on_error=self.on_error,
-                on_close=self.on_close
-            )
-            
-            # Run WebSocket in a separate thread
-            self.ws_thread = threading.Thread(target=self.ws.run_forever)
-            self.ws_thread.daemon = True
-            self.ws_thread.start()
-            
-            # Wait a bit for connection
-            time.sleep(1)
-            
-            # Authenticate with VTube Studio
-            if self.is_connected:
-                self.authenticate()
-            
-            return self.is_connected
+            # Connect to WebSocket; the handshake completes before this returns
+            ws = websocket.create_connection(self.url, timeout=2, sockopt=WS_SOCKET_OPTIONS)
+            ws.settimeout(None)  # The receive thread blocks until messages arrive
         except Exception as e:
             logging.error(f"Failed to connect to VTube Studio: {e}")
             return False
-    
-    def on_open(self, ws):
-        """Called when WebSocket connection opens."""
+        
+        # Swap before closing the old connection so its receive thread sees
+        # it was replaced rather than lost
+        old_ws = self.ws
+        self.ws = ws
+        if old_ws:
+            self._close_ws(old_ws)
+            self.auth_token = None
+        self._authenticated.clear()
         logging.info("Connected to VTube Studio WebSocket")
-        self.is_connected = True
+        self._set_connected(True)
+        
+        # Receive messages in a separate thread
+        self.ws_thread = threading.Thread(target=self._recv_loop, args=(ws,), daemon=True)
+        self.ws_thread.start()
+        
+        # Start the sender thread once; it outlives reconnects
+        if self._sender_thread is None:
+            self._sender_thread = threading.Thread(target=self._drain_loop, daemon=True)
+            self._sender_thread.start()
+        
+        # Authenticate with VTube Studio and give it a moment to answer
+        self.authenticate()
+        self._authenticated.wait(AUTH_WAIT)
+        
+        return self.is_connected
+    
+    def _next_request_id(self) -> str:
+        """Return a new unique request ID."""
+        return f"{self._req_prefix}{next(self._req_counter):08x}"
+    
+    def _recv_loop(self, ws):
+        """
+        Receive thread: dispatch incoming messages until the connection closes.
+        
+        Args:
+            ws: WebSocket connection this thread reads from
+        """
+        try:
+            while True:
+                message = ws.recv()
+                if not message:
+                    break  # Closed by VTube Studio
+                self.on_message(ws, message)
+        except Exception as e:
+            if self.ws is ws:
+                logging.error(f"WebSocket error: {e}")
+        finally:
+            ws.shutdown()
+            # A newer connection may have replaced this one already
+            if self.ws is ws:
+                logging.info("WebSocket connection closed")
+                self._set_connected(False)
+                self.auth_token = None
+    
+    def _send_message(self, request):
+        """
+        Queue a request for the sender thread.
+        
+        Args:
+            request: VTube Studio API request, or an already encoded one
+        """
+        try:
+            self._send_q.put_nowait(request if isinstance(request, bytes) else _dumps(request))
+        except queue.Full:
+            logging.error("VTS send queue full, dropping request")
     
     def on_message(self, ws, message):
         """Handle incoming messages from VTube Studio."""
         try:
-            data = json.loads(message)
-            msg_type = data.get("messageType", "")
-            
-            if msg_type == "APIError":
-                logging.error(f"VTube Studio API Error: {data.get('data', {}).get('errorIDMessage', 'Unknown error')}")
-            elif msg_type == "AuthenticationToken":
-                # Handle authentication token response
-                self.auth_token = data.get("data", {}).get("authenticationToken")
-                self.authenticate_with_token()
-            elif msg_type == "AuthenticationResponse":
-                # Check if authentication was successful
-                if data.get("data", {}).get("authenticated", False):
-                    logging.info("Successfully authenticated with VTube Studio")
-                    self.session_id = data.get("data", {}).get("sessionID")
-                else:
-                    logging.error("Failed to authenticate with VTube Studio")
-            elif msg_type == "CurrentModelParameters":
-                # Handle parameter values response
-                logging.debug(f"Received model parameters: {data}")
+            data = _loads(message)
+            handler = self._handlers.get(data.get("messageType"))
+            if handler is not None:
+                handler(data)
         except json.JSONDecodeError:
             logging.error(f"Invalid JSON received: {message}")
         except Exception as e:
             logging.error(f"Error handling message: {e}")
     
-    def on_error(self, ws, error):
-        """Handle WebSocket errors."""
-        logging.error(f"WebSocket error: {error}")
-        self.is_connected = False
-        self.auth_token = None
+    def _on_api_error(self, data):
+        """Log an API error reported by VTube Studio."""
+        logging.error(f"VTube Studio API Error: {data.get('data', {}).get('errorIDMessage', 'Unknown error')}")
     
-    def on_close(self, ws, close_status_code, close_msg):
-        """Handle WebSocket connection close."""
-        logging.info(f"WebSocket connection closed: {close_msg}")
-        self.is_connected = False
-        self.auth_token = None
+    def _on_authentication_token(self, data):
+        """Handle authentication token response."""
+        self.auth_token = data.get("data", {}).get("authenticationToken")
+        self.authenticate_with_token()
+    
+    def _on_authentication_response(self, data):
+        """Check if authentication was successful."""
+        if data.get("data", {}).get("authenticated", False):
+            logging.info("Successfully authenticated with VTube Studio")
+            self.session_id = data.get("data", {}).get("sessionID")
+            self._authenticated.set()
+        else:
+            logging.error("Failed to authenticate with VTube Studio")
+    
+    def _on_current_model_parameters(self, data):
+        """Handle parameter values response."""
+        logging.debug("Received model parameters: %s", data)
     
     def authenticate(self):
         """Request authentication token from VTube Studio."""
@@ -132,7 +310,7 @@ class VTSSender:
         auth_request = {
             "apiName": "VTubeStudioPublicAPI",
             "apiVersion": "1.0",
-            "requestID": str(uuid.uuid4()),
+            "requestID": self._next_request_id(),
             "messageType": "AuthenticationRequest",
             "data": {
                 "pluginName": self.plugin_name,
@@ -141,7 +319,7 @@ class VTSSender:
             }
         }
         
-        self.ws.send(json.dumps(auth_request))
+        self._send_message(auth_request)
         logging.info("Authentication request sent to VTube Studio")
     
     def authenticate_with_token(self):
@@ -150,10 +328,16 @@ class VTSSender:
             logging.error("No authentication token received")
             return
         
+        # The request only changes with the token, so reuse its encoding
+        if self._auth_payload is not None and self._auth_payload[0] == self.auth_token:
+            self._send_message(self._auth_payload[1])
+            logging.info("Authentication request with token sent to VTube Studio")
+            return
+        
         auth_with_token_request = {
             "apiName": "VTubeStudioPublicAPI",
             "apiVersion": "1.0",
-            "requestID": str(uuid.uuid4()),
+            "requestID": self._next_request_id(),
             "messageType": "AuthenticationRequest",
             "data": {
                 "pluginName": self.plugin_name,
@@ -163,56 +347,220 @@ class VTSSender:
             }
         }
         
-        self.ws.send(json.dumps(auth_with_token_request))
+        self._auth_payload = (self.auth_token, _dumps(auth_with_token_request))
+        self._send_message(self._auth_payload[1])
         logging.info("Authentication request with token sent to VTube Studio")
     
     def send_tracking_data(self, tracking_params: Dict[str, Any]):
         """
-        Send tracking data to VTube Studio.
+        Queue tracking data for sending to VTube Studio.
+        
+        Only parameters that changed are queued; the sender thread merges
+        pending updates and sends them as a single request.
         
         Args:
-            tracking_params: Dictionary containing VTS parameters
+            tracking_params: Values in VTS_PARAM_NAMES order, or a
+                dictionary of VTS parameters
         """
-        if not self.enabled or not self.is_connected or not self.ws:
+        if not self.ready:
             return
         
         try:
+            if not isinstance(tracking_params, dict) and self._q_view is not None:
+                # Large table: quantize and diff all values in one NumPy pass,
+                # updating the shared cache in place
+                values = np.asarray(tracking_params, dtype=np.float64)
+                quantized = (values * PARAM_QUANT_SCALE).astype(np.int32)
+                changed = np.flatnonzero(quantized != self._q_view)
+                if changed.size:
+                    self._q_view[changed] = quantized[changed]
+                    self._send_q.put_nowait({VTS_PARAM_NAMES[i]: value for i, value
+                                             in zip(changed.tolist(), values[changed].tolist())})
+                return
+            
+            if not isinstance(tracking_params, dict):
+                # Known parameters in table order: diff and build the update in
+                # one pass. Unchanged slots already hold their quantized value,
+                # so the whole cache can simply be replaced.
+                quantized = array.array('i', [int(value * PARAM_QUANT_SCALE) for value in tracking_params])
+                param_updates = {name: value for name, value, q, cached
+                                 in zip(VTS_PARAM_NAMES, tracking_params, quantized, self._q_cache)
+                                 if q != cached}
+                if param_updates:
+                    self._q_cache = quantized
+                    self._send_q.put_nowait(param_updates)
+                return
+            
             # Prepare parameter updates
-            param_updates = []
+            param_updates = {}
+            param_index = self._param_index
+            q_cache = self._q_cache
+            slots = self._cache_slots
+            slot_mask = EXTRA_CACHE_SLOTS - 1
             
             for param_name, value in tracking_params.items():
                 # Skip values that haven't changed significantly to reduce network traffic
-                if param_name in self.param_cache:
-                    if abs(self.param_cache[param_name] - value) < 0.01:  # Small threshold
+                i = param_index.get(param_name)
+                if i is not None:
+                    q = int(value * PARAM_QUANT_SCALE)
+                    if q == q_cache[i]:
                         continue
+                    q_cache[i] = q
+                else:
+                    slot = hash(param_name) & slot_mask
+                    cached_name, cached_value = slots[slot]
+                    if cached_name == param_name and abs(cached_value - value) < 0.01:  # Small threshold
+                        continue
+                    slots[slot] = (param_name, value)
                 
-                self.param_cache[param_name] = value
-                
-                param_updates.append({
-                    "id": param_name,
-                    "value": value
-                })
+                param_updates[param_name] = value
             
             # If no parameters changed significantly, skip sending
             if not param_updates:
                 return
             
-            # Send parameter updates to VTube Studio
-            param_update_request = {
-                "apiName": "VTubeStudioPublicAPI",
-                "apiVersion": "1.0",
-                "requestID": str(uuid.uuid4()),
-                "messageType": "ParameterUpdateRequest",
-                "data": {
-                    "parameterValues": param_updates
-                }
-            }
-            
-            self.ws.send(json.dumps(param_update_request))
+            self._send_q.put_nowait(param_updates)
             
+        except queue.Full:
+            logging.debug("VTS send queue full, dropping parameter update")
         except Exception as e:
             logging.error(f"Error sending tracking data to VTube Studio: {e}")
     
+    def _drain_loop(self):
+        """
+        Sender thread: wait for an item, then drain everything pending.
+        Queued requests are sent as-is and parameter updates are merged
+        (last value per parameter wins) into one request; everything from
+        one drain goes out in a single socket write.
+        """
+        send_q = self._send_q
+        while True:
+            pending = [send_q.get()]
+            while True:
+                try:
+                    pending.append(send_q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            merged = {}
+            messages = []
+            for item in pending:
+                if isinstance(item, bytes):
+                    messages.append(item)
+                else:
+                    merged.update(item)
+            
+            ws = self.ws
+            if not self.is_connected or not ws:
+                continue
+            
+            try:
+                if merged:
+                    messages.append(self._build_param_request(merged))
+                
+                if len(messages) == 1:
+                    ws.send(messages[0])
+                else:
+                    self._send_messages(ws, messages)
+            except Exception as e:
+                logging.error(f"Error sending tracking data to VTube Studio: {e}")
+    
+    def _build_param_request(self, merged: Dict[str, Any]) -> bytes:
+        """
+        Serialize a ParameterUpdateRequest.
+        
+        Args:
+            merged: Parameter values by id
+        
+        Returns:
+            Encoded request
+        """
+        # Fast path: the set of changed parameters repeats from tick to tick,
+        # so the whole request is one bytes %-format with a cached template
+        names = tuple(merged)
+        template = self._param_templates.get(names)
+        if template is None:
+            template = self._make_param_template(names)
+        if template:
+            values = tuple(merged.values())
+            if math.isfinite(sum(values)):  # %f would write nan/inf, which isn't JSON
+                return template % ((self._next_request_id().encode(),) + values)
+        
+        fragments = PARAM_FRAGMENTS
+        update_objs = self._update_objs
+        items = []
+        for param_name, value in merged.items():
+            frag = fragments.get(param_name)
+            if frag is None:
+                obj = update_objs.get(param_name)
+                if obj is None:
+                    obj = {"id": param_name, "value": 0.0}
+                    if len(update_objs) < EXTRA_CACHE_SLOTS:  # Keep the pool bounded too
+                        update_objs[param_name] = obj
+                obj["value"] = value
+                items.append(_dumps(obj))
+            else:
+                items.append(frag + _dumps(round(value, PARAM_SEND_DIGITS)) + b"}")
+        # One join copies each piece once, unlike chained +
+        return b"".join((PARAM_REQUEST_PREFIX, self._next_request_id().encode(),
+                         PARAM_REQUEST_VALUES, b"[", b",".join(items), b"]", PARAM_REQUEST_SUFFIX))
+    
+    def _make_param_template(self, names):
+        """
+        Build (and cache) the request template for a tuple of parameter names.
+        
+        Args:
+            names: Parameter ids in the order their values will be given
+        
+        Returns:
+            Template taking the request ID and then the values, or False if
+            a name is not in VTS_PARAM_NAMES
+        """
+        fragments = PARAM_FRAGMENTS
+        if all(name in fragments for name in names):
+            value_format = b"%%.%df}" % PARAM_SEND_DIGITS
+            template = (PARAM_REQUEST_PREFIX + b"%s" + PARAM_REQUEST_VALUES + b"["
+                        + b",".join(fragments[name] + value_format for name in names)
+                        + b"]" + PARAM_REQUEST_SUFFIX)
+        else:
+            template = False
+        if len(self._param_templates) < MAX_PARAM_TEMPLATES:
+            self._param_templates[names] = template
+        return template
+    
+    def _send_messages(self, ws, messages):
+        """
+        Send several requests with one socket write.
+        
+        The VTube Studio API takes one request per WebSocket message, so each
+        request keeps its own frame; the frames are copied into the reusable
+        frame buffer and written from a memoryview of it.
+        
+        Args:
+            ws: Connected WebSocket
+            messages: Encoded requests
+        """
+        frames = []
+        total = 0
+        for message in messages:
+            frame = websocket.ABNF.create_frame(message, websocket.ABNF.OPCODE_TEXT)
+            frame.get_mask_key = ws.get_mask_key or frame.get_mask_key
+            data = frame.format()  # Client frames are masked, so this is a copy anyway
+            frames.append(data)
+            total += len(data)
+        
+        if total > len(self._frame_buf):
+            self._frame_buf = bytearray(max(total, 2 * len(self._frame_buf)))
+        view = memoryview(self._frame_buf)
+        offset = 0
+        for data in frames:
+            end = offset + len(data)
+            view[offset:end] = data
+            offset = end
+        
+        with ws.lock:  # Same lock WebSocket.send uses (e.g. for pongs)
+            ws.sock.sendall(view[:total])
+    
     def send_hotkey(self, hotkey_id: str):
         """
         Send a hotkey trigger to VTube Studio.
@@ -226,14 +574,14 @@ class VTSSender:
         hotkey_request = {
             "apiName": "VTubeStudioPublicAPI",
             "apiVersion": "1.0",
-            "requestID": str(uuid.uuid4()),
+            "requestID": self._next_request_id(),
             "messageType": "HotkeyTriggerRequest",
             "data": {
                 "hotkeyID": hotkey_id
             }
         }
         
-        self.ws.send(json.dumps(hotkey_request))
+        self._send_message(hotkey_request)
     
     def get_current_model_parameters(self):
         """Get current model parameters from VTube Studio."""
@@ -243,18 +591,34 @@ class VTSSender:
         param_request = {
             "apiName": "VTubeStudioPublicAPI",
             "apiVersion": "1.0",
-            "requestID": str(uuid.uuid4()),
+            "requestID": self._next_request_id(),
             "messageType": "GetCurrentModelParametersRequest"
         }
         
-        self.ws.send(json.dumps(param_request))
+        self._send_message(param_request)
+    
+    @staticmethod
+    def _close_ws(ws):
+        """
+        Close a WebSocket connection.
+        
+        Args:
+            ws: Connection to close
+        """
+        try:
+            ws.send_close()
+        except Exception:
+            pass
+        ws.abort()  # Wakes the receive thread, which closes the socket
     
     def disconnect(self):
         """Disconnect from VTube Studio."""
-        if self.ws:
-            self.ws.close()
+        ws = self.ws
+        self.ws = None
+        if ws:
+            self._close_ws(ws)
         
-        self.is_connected = False
+        self._set_connected(False)
         self.auth_token = None
         logging.info("Disconnected from VTube Studio")
     
@@ -274,16 +638,21 @@ class VTSSender:
         """
         Update connection settings.
         
+        Unchanged settings keep the current connection. Otherwise the new
+        endpoint is connected before the old connection is closed.
+        
         Args:
             host: New host address
             port: New port
         """
-        self.disconnect()
+        if (host, port) == (self.host, self.port) and (self.is_connected or not self.enabled):
+            return
+        
         self.host = host
         self.port = port
         self.url = f"ws://{host}:{port}"
-        if self.enabled:
-            self.connect()
+        if not self.enabled or not self.connect():
+            self.disconnect()
 
 if __name__ == "__main__":
     # Test the VTS sender
@@ -2,10 +2,18 @@
 Calibration module for VTuber face tracking system.
 Provides face calibration functionality to set neutral face position.
 """
-from .face_tracking import FaceTrackingData
+from .face_tracking import FaceTrackingData, TRACKING_FIELDS
 import numpy as np
 import logging
 
+# Calibrated values, in the order of the running-mean vector (the same
+# order as FaceTrackingData.as_array())
+CALIBRATION_FIELDS = TRACKING_FIELDS
+
+# Range of each calibrated value (head angles are signed, the rest 0..1)
+_CALIBRATED_LO = np.array([-1.0, -1.0, -1.0, 0.0, 0.0, 0.0, 0.0])
+_CALIBRATED_HI = np.ones(len(CALIBRATION_FIELDS))
+
 class CalibrationData:
     """
     Data class to hold calibration values.
@@ -38,17 +46,23 @@ class FaceCalibrator:
     """
     def __init__(self, calibration_data=None):
         self.calibration_data = calibration_data or CalibrationData()
-        self.calibration_samples = []
+        # Running mean of the samples (CALIBRATION_FIELDS order); samples are not stored
+        self._mean = np.zeros(len(CALIBRATION_FIELDS))
+        self._sync_offsets()
         self.is_calibrating = False
         self.required_samples = 30  # Number of samples to average during calibration
         self.current_sample_count = 0
+        # apply_calibration alternates between these two output instances
+        # instead of allocating one per frame
+        self._td_ring = [FaceTrackingData(), FaceTrackingData()]
+        self._td_idx = 0
 
     def start_calibration(self):
         """
         Start the calibration process.
         """
         self.is_calibrating = True
-        self.calibration_samples = []
+        self._mean[:] = 0.0
         self.current_sample_count = 0
         logging.info("Calibration started. Please look straight ahead with a neutral expression.")
 
@@ -62,8 +76,10 @@ class FaceCalibrator:
         if not self.is_calibrating or not tracking_data.face_detected:
             return False
 
-        self.calibration_samples.append(tracking_data)
+        # Welford update of the running mean
+        x = tracking_data.as_array()
         self.current_sample_count += 1
+        self._mean += (x - self._mean) / self.current_sample_count
 
         logging.debug(f"Calibration sample {self.current_sample_count}/{self.required_samples}")
 
@@ -78,32 +94,18 @@ class FaceCalibrator:
         """
         Finish the calibration process and compute average values.
         """
-        if not self.calibration_samples:
+        if not self.current_sample_count:
             logging.warning("No samples collected during calibration")
             self.is_calibrating = False
             return
 
-        # Calculate averages for each parameter
-        avg_head_yaw = np.mean([sample.head_yaw for sample in self.calibration_samples])
-        avg_head_pitch = np.mean([sample.head_pitch for sample in self.calibration_samples])
-        avg_head_roll = np.mean([sample.head_roll for sample in self.calibration_samples])
-        avg_eye_left = np.mean([sample.eye_left for sample in self.calibration_samples])
-        avg_eye_right = np.mean([sample.eye_right for sample in self.calibration_samples])
-        avg_mouth_open = np.mean([sample.mouth_open for sample in self.calibration_samples])
-        avg_mouth_wide = np.mean([sample.mouth_wide for sample in self.calibration_samples])
-
-        # Set calibration offsets (negative values to center the range)
-        self.calibration_data.head_yaw_offset = avg_head_yaw
-        self.calibration_data.head_pitch_offset = avg_head_pitch
-        self.calibration_data.head_roll_offset = avg_head_roll
-        self.calibration_data.eye_left_offset = avg_eye_left
-        self.calibration_data.eye_right_offset = avg_eye_right
-        self.calibration_data.mouth_open_offset = avg_mouth_open
-        self.calibration_data.mouth_wide_offset = avg_mouth_wide
+        # The running mean is already the average of each parameter; use it
+        # as the calibration offsets
+        for field, average in zip(CALIBRATION_FIELDS, self._mean.tolist()):
+            setattr(self.calibration_data, f"{field}_offset", average)
         self.calibration_data.is_calibrated = True
+        self._sync_offsets()
 
-        # Clear samples
-        self.calibration_samples = []
         self.is_calibrating = False
 
         logging.info("Calibration completed successfully")
@@ -115,6 +117,11 @@ class FaceCalibrator:
         logging.info(f"Mouth open offset: {self.calibration_data.mouth_open_offset:.3f}")
         logging.info(f"Mouth wide offset: {self.calibration_data.mouth_wide_offset:.3f}")
 
+    def _sync_offsets(self):
+        """Pack the calibration offsets into a vector (CALIBRATION_FIELDS order)."""
+        self._offset_vec = np.array([getattr(self.calibration_data, f"{field}_offset")
+                                     for field in CALIBRATION_FIELDS], dtype=np.float64)
+
     def apply_calibration(self, tracking_data: FaceTrackingData) -> FaceTrackingData:
         """
         Apply calibration offsets to raw tracking data.
@@ -129,24 +136,15 @@ class FaceCalibrator:
             # If not calibrated, return original data without changes
             return tracking_data
 
-        # Apply offsets to each parameter
-        calibrated_data = FaceTrackingData(
-            head_yaw=tracking_data.head_yaw - self.calibration_data.head_yaw_offset,
-            head_pitch=tracking_data.head_pitch - self.calibration_data.head_pitch_offset,
-            head_roll=tracking_data.head_roll - self.calibration_data.head_roll_offset,
-            eye_left=max(0.0, min(1.0, tracking_data.eye_left - self.calibration_data.eye_left_offset)),
-            eye_right=max(0.0, min(1.0, tracking_data.eye_right - self.calibration_data.eye_right_offset)),
-            mouth_open=max(0.0, min(1.0, tracking_data.mouth_open - self.calibration_data.mouth_open_offset)),
-            mouth_wide=max(0.0, min(1.0, tracking_data.mouth_wide - self.calibration_data.mouth_wide_offset)),
-            face_detected=tracking_data.face_detected
-        )
-
-        # Apply additional adjustments to ensure proper range after calibration
-        calibrated_data.head_yaw = max(-1.0, min(1.0, calibrated_data.head_yaw))
-        calibrated_data.head_pitch = max(-1.0, min(1.0, calibrated_data.head_pitch))
-        calibrated_data.head_roll = max(-1.0, min(1.0, calibrated_data.head_roll))
-
-        return calibrated_data
+        # Apply offsets to each parameter and clamp to its range in one pass,
+        # writing straight into the output buffer
+        out = self._td_ring[self._td_idx]
+        self._td_idx ^= 1
+        calibrated = out.as_array()
+        np.subtract(tracking_data.as_array(), self._offset_vec, out=calibrated)
+        np.clip(calibrated, _CALIBRATED_LO, _CALIBRATED_HI, out=calibrated)
+        out.face_detected = tracking_data.face_detected
+        return out
 
     def is_calibration_complete(self) -> bool:
         """
@@ -177,7 +175,7 @@ class FaceCalibrator:
         Reset calibration to initial state.
         """
         self.calibration_data.reset()
-        self.calibration_samples = []
+        self._mean[:] = 0.0
         self.is_calibrating = False
         self.current_sample_count = 0
         logging.info("Calibration reset")
@@ -185,7 +183,7 @@ class FaceCalibrator:
 
 if __name__ == "__main__":
     # Test the calibration module
-    from .face_tracking import FaceTrackingData
+    from .face_tracking import FaceTrackingData, TRACKING_FIELDS
 
     print("Testing Face Calibration Module...")
 
@@ -4,21 +4,81 @@ Handles webcam capture and camera selection.
 """
 import cv2
 import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Longest get_frame waits for a new frame from the reader thread (seconds)
+ASYNC_FRAME_WAIT = 0.1
+
+def _local_capture_backend():
+    """Pick the OpenCV capture backend for local cameras on this OS."""
+    if sys.platform.startswith('linux'):
+        return cv2.CAP_V4L2
+    if sys.platform == 'win32':
+        return cv2.CAP_DSHOW
+    if sys.platform == 'darwin':
+        return cv2.CAP_AVFOUNDATION
+    return cv2.CAP_ANY
+
+def _probe_camera(index, read_frame=False):
+    """Return index if a local camera opens there (and delivers a frame, if read_frame)."""
+    cap = cv2.VideoCapture(index, _local_capture_backend())
+    try:
+        if not cap.isOpened():
+            return None
+        if read_frame:
+            ret, _ = cap.read()
+            return index if ret else None
+        return index
+    finally:
+        cap.release()
+
+def find_available_cameras(max_cameras=10, read_frame=False):
+    """
+    Probe local camera indices 0..max_cameras-1 in parallel.
+
+    Each probe mostly waits on the driver, so threads overlap them; all
+    indices are probed since systems can skip indices (0 ok, 1 missing, 2 ok).
+
+    Args:
+        max_cameras: Number of indices to probe
+        read_frame: Also require a frame to be read, not just the device to open
+
+    Returns:
+        Sorted list of available camera indices
+    """
+    with ThreadPoolExecutor(max_workers=max_cameras) as pool:
+        results = pool.map(lambda i: _probe_camera(i, read_frame), range(max_cameras))
+    return [index for index in results if index is not None]
 
 class CameraCapture:
-    def __init__(self, camera_index=0, frame_width=640, frame_height=480, stream_url=None):
+    def __init__(self, camera_index=0, frame_width=640, frame_height=480, stream_url=None, rgb=False):
         self.camera_index = camera_index
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.stream_url = stream_url  # URL stream untuk kamera Android/IP
+        # Convert frames to RGB in place as they are read, for consumers
+        # (like FaceTracker(input_rgb=True)) that need RGB anyway
+        self.rgb = rgb
         self.cap = None
         self.is_capturing = False
 
+        # Background reader (start_async): a single slot holding the newest
+        # frame not yet returned by get_frame
+        self._reader_thread = None
+        self._reader_running = False
+        self._latest = None
+        self._frame_cond = threading.Condition()
+
         # Initialize camera
         self.open_camera()
     
     def open_camera(self):
         """Open camera or IP stream with specified parameters."""
+        # Reopening stops the background reader; restart it afterwards
+        restart_async = self._reader_thread is not None
         if self.cap is not None and self.cap.isOpened():
             self.release()
 
@@ -27,7 +87,10 @@ class CameraCapture:
             self.cap = cv2.VideoCapture(self.stream_url)
             logging.info(f"Opening IP camera stream at: {self.stream_url}")
         else:
-            self.cap = cv2.VideoCapture(self.camera_index)
+            # Explicit backend; fall back to OpenCV's default if it fails
+            self.cap = cv2.VideoCapture(self.camera_index, _local_capture_backend())
+            if not self.cap.isOpened():
+                self.cap = cv2.VideoCapture(self.camera_index)
             logging.info(f"Opening local camera at index: {self.camera_index}")
 
         if not self.cap.isOpened():
@@ -36,8 +99,14 @@ class CameraCapture:
             else:
                 raise RuntimeError(f"Cannot open camera with index {self.camera_index}")
 
+        # Keep at most one frame buffered so reads return the newest frame
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
         # Set camera properties - hanya untuk kamera lokal, tidak untuk stream IP
         if not self.stream_url:
+            # Ask for compressed MJPG before the size/FPS, so the driver
+            # doesn't pick raw YUY2 that saturates USB bandwidth
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
@@ -49,9 +118,63 @@ class CameraCapture:
         else:
             logging.info(f"Local camera opened successfully: index={self.camera_index}, "
                         f"resolution={self.frame_width}x{self.frame_height}")
+        if restart_async:
+            self.start_async()
     
-    def get_frame(self):
-        """Get a single frame from the camera or IP stream."""
+    def start_async(self):
+        """
+        Read frames on a background thread so capture overlaps with tracking.
+
+        get_frame then returns the newest frame read since the previous call;
+        older unread frames are dropped.
+        """
+        if self._reader_thread is not None:
+            return
+        self._reader_running = True
+        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader_thread.start()
+
+    def stop_async(self):
+        """Stop the background reader; get_frame reads synchronously again."""
+        thread = self._reader_thread
+        if thread is None:
+            return
+        self._reader_running = False
+        thread.join(timeout=1.0)
+        self._reader_thread = None
+        self._latest = None
+
+    def _reader_loop(self):
+        """Keep the single frame slot filled with the newest frame."""
+        while self._reader_running:
+            frame = self._read_frame()
+            if frame is None:
+                time.sleep(0.01)  # Avoid spinning on a failing camera
+                continue
+            with self._frame_cond:
+                self._latest = frame
+                self._frame_cond.notify()
+
+    def get_frame(self, timeout=ASYNC_FRAME_WAIT):
+        """
+        Get a single frame from the camera or IP stream.
+
+        With start_async, returns the newest frame from the reader thread,
+        blocking up to timeout seconds for one; None if none arrived.
+
+        Args:
+            timeout: Longest wait for a new frame in async mode
+        """
+        if self._reader_thread is not None:
+            with self._frame_cond:
+                if self._latest is None:
+                    self._frame_cond.wait(timeout)
+                frame, self._latest = self._latest, None
+            return frame
+        return self._read_frame()
+
+    def _read_frame(self):
+        """Read and return the next frame, or None on failure."""
         if not self.is_capturing or self.cap is None:
             return None
 
@@ -60,9 +183,17 @@ class CameraCapture:
             logging.warning("Failed to read frame from camera")
             return None
 
-        # For IP streams, ensure consistent frame size
+        # For IP streams, ensure consistent frame size; most streams already
+        # deliver it, so only resize on a mismatch
         if self.stream_url:
-            frame = cv2.resize(frame, (self.frame_width, self.frame_height))
+            height, width = frame.shape[:2]
+            if width != self.frame_width or height != self.frame_height:
+                interpolation = cv2.INTER_AREA if width > self.frame_width else cv2.INTER_LINEAR
+                frame = cv2.resize(frame, (self.frame_width, self.frame_height),
+                                   interpolation=interpolation)
+
+        if self.rgb:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
 
         return frame
     
@@ -72,15 +203,7 @@ class CameraCapture:
             logging.info("get_available_cameras not supported for IP streams")
             return []
 
-        available_cameras = []
-        for i in range(max_cameras):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                available_cameras.append(i)
-                cap.release()
-            else:
-                break
-        return available_cameras
+        return find_available_cameras(max_cameras)
     
     def set_camera_index(self, index):
         """Change camera index."""
@@ -90,6 +213,7 @@ class CameraCapture:
     
     def release(self):
         """Release camera resources."""
+        self.stop_async()
         if self.cap is not None:
             self.cap.release()
             self.is_capturing = False
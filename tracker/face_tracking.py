@@ -5,40 +5,266 @@ Uses MediaPipe FaceMesh to detect facial landmarks and extract tracking data.
 import cv2
 import mediapipe as mp
 import numpy as np
+import os
+import time
 import logging
-from dataclasses import dataclass
 from typing import Optional, Tuple, List
 import math
 
-@dataclass
+# Tracking values, in the order they are stored in FaceTrackingData
+TRACKING_FIELDS = (
+    "head_yaw", "head_pitch", "head_roll",
+    "eye_left", "eye_right",
+    "mouth_open", "mouth_wide",
+)
+# Buffer slot of the face_detected flag, after the tracking values
+_DETECTED_SLOT = len(TRACKING_FIELDS)
+
+def _tracking_field(index):
+    """Property reading/writing one slot of the FaceTrackingData buffer."""
+    def get(self):
+        return self._a.item(index)
+    def set(self, value):
+        self._a[index] = value
+    return property(get, set)
+
 class FaceTrackingData:
-    """Data class to hold face tracking results."""
-    head_yaw: float = 0.0
-    head_pitch: float = 0.0
-    head_roll: float = 0.0
-    eye_left: float = 0.0
-    eye_right: float = 0.0
-    mouth_open: float = 0.0
-    mouth_wide: float = 0.0
-    face_detected: bool = False
+    """
+    Face tracking results, stored in one float64 buffer: the TRACKING_FIELDS
+    values followed by the face_detected flag. as_array() exposes the values
+    so calibration, smoothing and mapping work on them without copying.
+    """
+    __slots__ = ("_a", "_values")
+
+    def __init__(self, head_yaw=0.0, head_pitch=0.0, head_roll=0.0, eye_left=0.0,
+                 eye_right=0.0, mouth_open=0.0, mouth_wide=0.0, face_detected=False):
+        self._a = np.array((head_yaw, head_pitch, head_roll, eye_left, eye_right,
+                            mouth_open, mouth_wide, face_detected), dtype=np.float64)
+        self._values = self._a[:_DETECTED_SLOT]
+
+    @classmethod
+    def from_array(cls, values, face_detected=False):
+        """Build from values in TRACKING_FIELDS order (copied)."""
+        data = cls.__new__(cls)
+        data._a = np.empty(_DETECTED_SLOT + 1)
+        data._values = data._a[:_DETECTED_SLOT]
+        data._values[:] = values
+        data._a[_DETECTED_SLOT] = face_detected
+        return data
+
+    head_yaw = _tracking_field(0)
+    head_pitch = _tracking_field(1)
+    head_roll = _tracking_field(2)
+    eye_left = _tracking_field(3)
+    eye_right = _tracking_field(4)
+    mouth_open = _tracking_field(5)
+    mouth_wide = _tracking_field(6)
+
+    @property
+    def face_detected(self) -> bool:
+        return self._a.item(_DETECTED_SLOT) != 0.0
+
+    @face_detected.setter
+    def face_detected(self, value):
+        self._a[_DETECTED_SLOT] = value
+
+    def as_array(self) -> np.ndarray:
+        """View of the values in TRACKING_FIELDS order; writes update this object."""
+        return self._values
+
+    def copy_from_array(self, values, face_detected=False):
+        """Overwrite the values (TRACKING_FIELDS order) and flag in place."""
+        self._values[:] = values
+        self._a[_DETECTED_SLOT] = face_detected
+
+    def copy(self) -> "FaceTrackingData":
+        """Independent snapshot of this data."""
+        return FaceTrackingData.from_array(self._values, self.face_detected)
+
+    __copy__ = copy
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return bool(np.array_equal(self._a, other._a))
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(TRACKING_FIELDS, self._values.tolist()))
+        return f"FaceTrackingData({values}, face_detected={self.face_detected})"
+
+class _LandmarkerResults:
+    """
+    Adapts a Tasks API FaceLandmarkerResult to the FaceMesh results shape
+    (results.multi_face_landmarks[i].landmark) used by the rest of the tracker.
+    """
+    def __init__(self, result):
+        self.multi_face_landmarks = [
+            _FaceLandmarks(landmarks) for landmarks in result.face_landmarks
+        ] or None
+
+class _FaceLandmarks:
+    def __init__(self, landmarks):
+        self.landmark = landmarks
+
+# 3D model points for head pose estimation (standard face pose points), in
+# the order of FaceTracker.POSE_LANDMARKS
+_POSE_MODEL_POINTS = np.array([
+    (0.0, 0.0, 0.0),             # Nose tip
+    (0.0, -300.0, -300.0),      # Chin
+    (-225.0, 170.0, -135.0),    # Left eye left corner
+    (225.0, 170.0, -135.0),     # Right eye right corne
+    (-150.0, -150.0, -125.0),   # Left Mouth corner
+    (150.0, -150.0, -125.0)     # Right mouth corner
+])
+_POSE_DIST_COEFFS = np.zeros((4, 1))
+
+def _rotmat_to_normalized_euler(rotation_matrix, _atan2=math.atan2, _sqrt=math.sqrt):
+    """
+    Convert a rotation matrix to yaw, pitch, roll normalized to [-1, 1]
+    (each angle clamped to +/-30 degrees), using scalar math only.
+    """
+    (r00, _, _), (r10, r11, r12), (r20, r21, r22) = rotation_matrix.tolist()
+    sy = _sqrt(r00 * r00 + r10 * r10)
+    
+    if sy >= 1e-6:
+        x = _atan2(r21, r22)
+        y = _atan2(-r20, sy)
+        z = _atan2(r10, r00)
+    else:
+        # Singular (gimbal lock)
+        x = _atan2(-r12, r11)
+        y = _atan2(-r20, sy)
+        z = 0.0
+    
+    # Radians to degrees, clamped to +/-30 and scaled to [-1, 1]
+    scale = 180.0 / math.pi / 30.0
+    yaw, pitch, roll = y * scale, x * scale, z * scale
+    yaw = -1.0 if yaw < -1.0 else 1.0 if yaw > 1.0 else yaw
+    pitch = -1.0 if pitch < -1.0 else 1.0 if pitch > 1.0 else pitch
+    roll = -1.0 if roll < -1.0 else 1.0 if roll > 1.0 else roll
+    return yaw, pitch, roll
+
+def _eye_mouth_features(pts, left_eye, right_eye, lip_weights,
+                        mouth_left, mouth_right, _hypot=math.hypot):
+    """
+    Compute eye blinks and mouth open/wide in one pass over the packed
+    landmark list, using scalar math only (values clamped to [0, 1] with
+    conditional expressions rather than min()/max() calls).
+    
+    Args:
+        pts: Packed landmarks as a list of (x, y) pairs (xy.tolist())
+        left_eye, right_eye: Positions of the six eye landmarks in pts
+        lip_weights: (position, weight) pairs whose weighted sum of y is
+            the upper lip mean minus the lower lip mean
+        mouth_left, mouth_right: Positions of the mouth corners in pts
+        
+    Returns:
+        Tuple of (eye_left, eye_right, mouth_open, mouth_wide)
+    """
+    blinks = []
+    for eye in (left_eye, right_eye):
+        (x0, y0), (x1, y1), (x4, y4), (x5, y5) = (
+            pts[eye[0]], pts[eye[1]], pts[eye[4]], pts[eye[5]])
+        # Eye aspect ratio: eyelid distance over eye corner distance
+        horizontal_dist = _hypot(x0 - x4, y0 - y4)
+        if horizontal_dist > 0:
+            ear = _hypot(x1 - x5, y1 - y5) / horizontal_dist
+            # Typical open eye has EAR ~0.3, closed eye has EAR ~0.15
+            blink = (0.3 - ear) / 0.15
+            blinks.append(0.0 if blink < 0.0 else 1.0 if blink > 1.0 else blink)
+        else:
+            blinks.append(0.0)
+    
+    # Average vertical distance between upper and lower lips, as one weighted
+    # sum; typical closed mouth ~0.02, open mouth ~0.08
+    lip_dist = abs(sum([pts[i][1] * weight for i, weight in lip_weights]))
+    mouth_open = (lip_dist - 0.02) / 0.06
+    mouth_open = 0.0 if mouth_open < 0.0 else 1.0 if mouth_open > 1.0 else mouth_open
+    
+    # Mouth corner distance; neutral width is around 0.1-0.15
+    (lx, ly), (rx, ry) = pts[mouth_left], pts[mouth_right]
+    mouth_wide = (_hypot(lx - rx, ly - ry) - 0.1) / 0.1
+    mouth_wide = 0.0 if mouth_wide < 0.0 else 1.0 if mouth_wide > 1.0 else mouth_wide
+    
+    return blinks[0], blinks[1], mouth_open, mouth_wide
+
+# Padding added on each side of the previous face bbox for the ROI crop,
+# as a fraction of the bbox size
+ROI_PADDING = 0.25
+# Frames wider than this are downscaled for the full-frame detection pass;
+# the landmark model resizes its input to 192x192 anyway
+DETECTION_WIDTH = 320
 
 class FaceTracker:
-    def __init__(self, max_num_faces=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    def __init__(self, max_num_faces=1, min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 delegate="cpu", model_asset_path=None, roi_tracking=True, input_rgb=False):
+        """
+        Initialize the face tracker.
+        
+        Args:
+            max_num_faces: Maximum number of faces to track
+            min_detection_confidence: Minimum face detection confidence
+            min_tracking_confidence: Minimum landmark tracking confidence
+            delegate: "cpu", "gpu" or "auto". "gpu"/"auto" use the MediaPipe
+                Tasks FaceLandmarker on the GPU delegate when model_asset_path
+                exists, falling back to the Tasks CPU (XNNPACK) delegate and
+                then to CPU FaceMesh if that fails
+            model_asset_path: Path to a face_landmarker.task model bundle
+            roi_tracking: Run inference on a crop around the previous face
+                bbox instead of the full frame once a face has been found
+            input_rgb: Frames passed in are already RGB (e.g. from
+                CameraCapture(rgb=True)), so the BGR->RGB conversion is skipped
+        """
         self.max_num_faces = max_num_faces
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
+        self.face_mesh = None
+        self.landmarker = None
+        self._last_timestamp_ms = 0
+        self.roi_tracking = roi_tracking
+        self.input_rgb = input_rgb
+        # Previous face bbox in pixels (x0, y0, x1, y1), padded; None when
+        # the next frame needs a full-frame detection pass
+        self._last_bbox = None
+        # Landmark results of the last process_frame call, for drawing
+        # without a second inference pass
+        self.last_results = None
         
         # Initialize MediaPipe FaceMesh
         self.mp_face_mesh = mp.solutions.face_mesh
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=self.max_num_faces,
-            refine_landmarks=True,
-            min_detection_confidence=self.min_detection_confidence,
-            min_tracking_confidence=self.min_tracking_confidence
-        )
+        self.backend = None
+        if delegate in ("gpu", "auto") and model_asset_path and os.path.exists(model_asset_path):
+            try:
+                self.landmarker = self._create_landmarker(model_asset_path, use_gpu=True)
+                self.backend = "gpu"
+            except Exception as e:
+                logging.warning(f"GPU face landmarker unavailable, trying the CPU (XNNPACK) delegate: {e}")
+                try:
+                    self.landmarker = self._create_landmarker(model_asset_path, use_gpu=False)
+                    self.backend = "xnnpack"
+                except Exception as e:
+                    logging.warning(f"CPU face landmarker unavailable, falling back to FaceMesh: {e}")
+        elif delegate == "gpu":
+            logging.warning(f"GPU delegate requested but model not found: {model_asset_path}")
+        
+        if self.landmarker is None:
+            # Video mode: MediaPipe runs the face detector only until a face is
+            # found (or tracking confidence drops), then tracks landmarks from the
+            # previous frame's crop. Iris refinement is off because no iris
+            # landmarks (468+) are used, which skips the attention sub-model.
+            self.face_mesh = self.mp_face_mesh.FaceMesh(
+                static_image_mode=False,
+                max_num_faces=self.max_num_faces,
+                refine_landmarks=False,
+                min_detection_confidence=self.min_detection_confidence,
+                min_tracking_confidence=self.min_tracking_confidence
+            )
+            self.backend = "cpu"
         
         # Face landmark indices
         # Eyes
@@ -60,173 +286,248 @@ class FaceTracker:
         self.RIGHT_EAR = 356
         self.CHIN = 152
         self.FOREHEAD = 10
+        # Nose tip, chin, left eye left corner, right eye right corner, mouth corners
+        self.POSE_LANDMARKS = [self.NOSE_TIP, self.CHIN, 33, 263, self.MOUTH_LEFT_CORNER, self.MOUTH_RIGHT_CORNER]
+        
+        # Only the landmarks above are read each frame; they are copied once
+        # into a packed (n, 2) x/y array, and each calculation indexes into
+        # it with these position arrays
+        used = sorted({*self.LEFT_EYE_INNER, *self.RIGHT_EYE_INNER,
+                       *self.MOUTH_UPPER_LIP, *self.MOUTH_LOWER_LIP, *self.POSE_LANDMARKS})
+        self._used_landmarks = tuple(used)
+        position = {index: i for i, index in enumerate(used)}
+        def packed(indices):
+            return np.array([position[i] for i in indices], dtype=np.intp)
+        def lip_weights():
+            # Upper lip mean minus lower lip mean as (position, weight) pairs;
+            # landmarks on both lips get both weights combined
+            weights = {}
+            for index in self.MOUTH_UPPER_LIP:
+                weights[position[index]] = weights.get(position[index], 0.0) + 1.0 / len(self.MOUTH_UPPER_LIP)
+            for index in self.MOUTH_LOWER_LIP:
+                weights[position[index]] = weights.get(position[index], 0.0) - 1.0 / len(self.MOUTH_LOWER_LIP)
+            return tuple(weights.items())
+        # Eye and mouth positions, as arguments for _eye_mouth_features
+        self._feature_idx = (
+            tuple(packed(self.LEFT_EYE_INNER).tolist()),
+            tuple(packed(self.RIGHT_EYE_INNER).tolist()),
+            lip_weights(),
+            position[self.MOUTH_LEFT_CORNER],
+            position[self.MOUTH_RIGHT_CORNER],
+        )
+        self._pose_idx = packed(self.POSE_LANDMARKS)
+        
+        # Head pose buffers: image points are filled in place, the camera
+        # matrix is rebuilt only when the frame size changes, and the last
+        # solvePnP solution seeds the next one
+        self._image_points = np.empty((len(self.POSE_LANDMARKS), 2), dtype=np.float64)
+        self._camera_matrix = None
+        self._pose_image_shape = None
+        self._pose_rvec = None
+        self._pose_tvec = None
         
         # Initialize previous data for smoothing
         self.prev_tracking_data = FaceTrackingData()
+        
+        # process_frame alternates between these two instances instead of
+        # allocating one per frame; a result stays valid until two more
+        # frames are processed (use its copy() to keep it)
+        self._td_ring = [FaceTrackingData(), FaceTrackingData()]
+        self._td_idx = 0
+    
+    def _create_landmarker(self, model_asset_path, use_gpu):
+        """
+        Create a Tasks API FaceLandmarker (video mode).
+        
+        Args:
+            model_asset_path: Path to a face_landmarker.task model bundle
+            use_gpu: Use the GPU delegate; otherwise the CPU delegate, which
+                runs the model with XNNPACK
+        """
+        from mediapipe.tasks.python import BaseOptions, vision
+        
+        options = vision.FaceLandmarkerOptions(
+            base_options=BaseOptions(
+                model_asset_path=model_asset_path,
+                delegate=BaseOptions.Delegate.GPU if use_gpu else BaseOptions.Delegate.CPU
+            ),
+            running_mode=vision.RunningMode.VIDEO,
+            num_faces=self.max_num_faces,
+            min_face_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+        return vision.FaceLandmarker.create_from_options(options)
     
     def get_landmarks(self, image):
-        """Get face landmarks from image."""
-        # Convert the BGR image to RGB
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        """
+        Get face landmarks from image.
         
-        # Process the image and find face landmarks
-        results = self.face_mesh.process(rgb_image)
+        With roi_tracking, inference runs on a crop around the previous
+        face bbox and the landmarks are shifted back to full-image
+        normalized coordinates; without a previous bbox the (downscaled)
+        full frame is used.
+        """
+        h, w = image.shape[:2]
+        bbox = self._last_bbox if self.roi_tracking else None
+        if bbox is not None:
+            x0, y0, x1, y1 = bbox
+            region = image[y0:y1, x0:x1]
+        else:
+            region = image
+            if self.roi_tracking and w > DETECTION_WIDTH:
+                region = cv2.resize(image, (DETECTION_WIDTH, h * DETECTION_WIDTH // w),
+                                    interpolation=cv2.INTER_AREA)
+        
+        if self.input_rgb:
+            # Crops are strided views; MediaPipe needs contiguous pixels
+            rgb_image = np.ascontiguousarray(region)
+        else:
+            # Convert the BGR image to RGB
+            rgb_image = cv2.cvtColor(region, cv2.COLOR_BGR2RGB)
+        
+        if self.landmarker is not None:
+            # Video mode requires strictly increasing timestamps
+            timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_image)
+            results = _LandmarkerResults(self.landmarker.detect_for_video(mp_image, timestamp_ms))
+        else:
+            # Process the image and find face landmarks
+            results = self.face_mesh.process(rgb_image)
+        
+        if self.roi_tracking:
+            if results.multi_face_landmarks:
+                self._last_bbox = self._update_roi(results.multi_face_landmarks[0].landmark,
+                                                   bbox, w, h)
+            else:
+                # Face lost: fall back to a full-frame pass
+                self._last_bbox = None
         
         return results
     
-    def calculate_head_rotation(self, landmarks, image_shape) -> Tuple[float, float, float]:
-        """Calculate head rotation (yaw, pitch, roll) from face landmarks."""
+    def _update_roi(self, landmarks, crop, w, h):
+        """
+        Shift crop-relative landmarks back to full-image coordinates and
+        compute the padded bbox to crop the next frame to.
+        
+        Args:
+            landmarks: Face landmark list from the inference pass
+            crop: Pixel bbox (x0, y0, x1, y1) the landmarks are relative
+                to, or None if they are relative to the full image
+            w, h: Full image size
+        
+        Returns:
+            Padded pixel bbox (x0, y0, x1, y1), or None if it would cover
+            (nearly) the whole image
+        """
+        if crop is not None:
+            x0, y0, x1, y1 = crop
+            sx, sy = (x1 - x0) / w, (y1 - y0) / h
+            ox, oy = x0 / w, y0 / h
+            for lm in landmarks:
+                lm.x = lm.x * sx + ox
+                lm.y = lm.y * sy + oy
+        
+        xs = [lm.x for lm in landmarks]
+        ys = [lm.y for lm in landmarks]
+        min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)
+        pad_x = (max_x - min_x) * ROI_PADDING
+        pad_y = (max_y - min_y) * ROI_PADDING
+        # Clamp to the image with conditional expressions (no min()/max() calls)
+        x0 = int((min_x - pad_x) * w)
+        y0 = int((min_y - pad_y) * h)
+        x1 = math.ceil((max_x + pad_x) * w)
+        y1 = math.ceil((max_y + pad_y) * h)
+        x0 = x0 if x0 > 0 else 0
+        y0 = y0 if y0 > 0 else 0
+        x1 = x1 if x1 < w else w
+        y1 = y1 if y1 < h else h
+        if x1 - x0 < 2 or y1 - y0 < 2 or (x1 - x0) * (y1 - y0) > 0.8 * w * h:
+            return None
+        return x0, y0, x1, y1
+    
+    def _landmarks_to_xy(self, landmarks) -> np.ndarray:
+        """
+        Copy the x/y of the landmarks used for tracking into a packed array.
+        
+        Args:
+            landmarks: Face landmark list (results.multi_face_landmarks[i].landmark)
+        
+        Returns:
+            (n, 2) float64 array in _used_landmarks order
+        """
+        return np.array([(lm.x, lm.y) for lm in map(landmarks.__getitem__, self._used_landmarks)])
+    
+    def calculate_head_rotation(self, xy, image_shape) -> Tuple[float, float, float]:
+        """
+        Calculate head rotation (yaw, pitch, roll) from the packed landmark array.
+        
+        Errors propagate to process_frame, which handles them for the whole frame.
+        """
         h, w = image_shape[:2]
         
         # Get specific landmarks for pose estimation
-        try:
-            # Define 3D points for pose estimation
-            # These are standard points for face pose estimation
-            model_points = np.array([
-                (0.0, 0.0, 0.0),             # Nose tip
-                (0.0, -300.0, -300.0),      # Chin
-                (-225.0, 170.0, -135.0),    # Left eye left corner
-                (225.0, 170.0, -135.0),     # Right eye right corne
-                (-150.0, -150.0, -125.0),   # Left Mouth corner
-                (150.0, -150.0, -125.0)     # Right mouth corner
-            ])
-            
-            # Image points from landmarks
-            image_points = np.array([
-                (landmarks[self.NOSE_TIP].x * w, landmarks[self.NOSE_TIP].y * h),  # Nose tip
-                (landmarks[self.CHIN].x * w, landmarks[self.CHIN].y * h),  # Chin
-                (landmarks[33].x * w, landmarks[33].y * h),  # Left eye left corner
-                (landmarks[263].x * w, landmarks[263].y * h),  # Right eye right corner
-                (landmarks[61].x * w, landmarks[61].y * h),  # Left mouth corner
-                (landmarks[291].x * w, landmarks[291].y * h)  # Right mouth corner
-            ], dtype="double")
-            
-            # Camera matrix
+        if self._pose_image_shape != (w, h):
+            # Camera matrix for this frame size
             focal_length = w
-            center = (w / 2, h / 2)
-            camera_matrix = np.array([
-                [focal_length, 0, center[0]],
-                [0, focal_length, center[1]],
+            self._camera_matrix = np.array([
+                [focal_length, 0, w / 2],
+                [0, focal_length, h / 2],
                 [0, 0, 1]
-            ], dtype="double")
-            
-            # Distortion coefficients
-            dist_coeffs = np.zeros((4, 1))
-            
-            # Solve PnP to get rotation and translation vectors
+            ], dtype=np.float64)
+            self._pose_image_shape = (w, h)
+            self._pose_rvec = self._pose_tvec = None
+        
+        # Image points from landmarks (POSE_LANDMARKS order), filled in place;
+        # mode="clip" lets take() write straight into out (mode="raise"
+        # buffers it), and the precomputed positions are always in range
+        image_points = self._image_points
+        np.take(xy, self._pose_idx, axis=0, out=image_points, mode="clip")
+        image_points *= (w, h)
+        
+        # Solve PnP to get rotation and translation vectors, starting
+        # from the previous frame's solution when there is one
+        if self._pose_rvec is not None:
             success, rotation_vector, translation_vector = cv2.solvePnP(
-                model_points, 
-                image_points, 
-                camera_matrix, 
-                dist_coeffs
-            )
-            
-            if success:
-                # Convert rotation vector to rotation matrix
-                rotation_matrix, _ = cv2.Rodrigues(rotation_vector)
-                
-                # Convert to Euler angles
-                # Get Euler angles from rotation matrix
-                sy = math.sqrt(rotation_matrix[0,0] * rotation_matrix[0,0] + 
-                              rotation_matrix[1,0] * rotation_matrix[1,0])
-                
-                singular = sy < 1e-6
-                
-                if not singular:
-                    x = math.atan2(rotation_matrix[2,1], rotation_matrix[2,2])
-                    y = math.atan2(-rotation_matrix[2,0], sy)
-                    z = math.atan2(rotation_matrix[1,0], rotation_matrix[0,0])
-                else:
-                    x = math.atan2(-rotation_matrix[1,2], rotation_matrix[1,1])
-                    y = math.atan2(-rotation_matrix[2,0], sy)
-                    z = 0
-                
-                # Convert to degrees and scale for better sensitivity
-                yaw = np.clip(np.degrees(y), -30, 30) / 30.0  # Normalize to [-1, 1]
-                pitch = np.clip(np.degrees(x), -30, 30) / 30.0  # Normalize to [-1, 1]
-                roll = np.clip(np.degrees(z), -30, 30) / 30.0  # Normalize to [-1, 1]
-                
-                return yaw, pitch, roll
-            else:
-                return 0.0, 0.0, 0.0
-                
-        except Exception as e:
-            logging.warning(f"Error calculating head rotation: {e}")
-            return 0.0, 0.0, 0.0
-    
-    def calculate_eye_blink(self, landmarks, eye_indices) -> float:
-        """Calculate eye blink value based on eye landmark distances."""
-        try:
-            # Get eye landmarks
-            eye_landmarks = [landmarks[i] for i in eye_indices]
-            
-            # Calculate vertical eye aspect ratio (EAR)
-            # Distance between upper and lower eyelid
-            vertical_dist = np.linalg.norm(
-                np.array([eye_landmarks[1].x, eye_landmarks[1].y]) - 
-                np.array([eye_landmarks[5].x, eye_landmarks[5].y])
+                _POSE_MODEL_POINTS,
+                image_points,
+                self._camera_matrix,
+                _POSE_DIST_COEFFS,
+                self._pose_rvec,
+                self._pose_tvec,
+                useExtrinsicGuess=True
             )
-            
-            # Distance between left and right eyelid
-            horizontal_dist = np.linalg.norm(
-                np.array([eye_landmarks[0].x, eye_landmarks[0].y]) - 
-                np.array([eye_landmarks[4].x, eye_landmarks[4].y])
+        else:
+            success, rotation_vector, translation_vector = cv2.solvePnP(
+                _POSE_MODEL_POINTS,
+                image_points,
+                self._camera_matrix,
+                _POSE_DIST_COEFFS
             )
+        
+        if success:
+            self._pose_rvec, self._pose_tvec = rotation_vector, translation_vector
             
-            # Calculate eye aspect ratio
-            if horizontal_dist > 0:
-                ear = vertical_dist / horizontal_dist
-                # Normalize to roughly [0, 1] range where 0 is fully open and 1 is closed
-                # Typical open eye has EAR ~0.3, closed eye has EAR ~0.15
-                normalized_value = max(0, min(1, (0.3 - ear) / 0.15))
-                return normalized_value
-            else:
-                return 0.0
-        except Exception as e:
-            logging.warning(f"Error calculating eye blink: {e}")
-            return 0.0
-    
-    def calculate_mouth_open(self, landmarks) -> float:
-        """Calculate mouth open value based on upper-lower lip distance."""
-        try:
-            # Get upper and lower lip landmarks
-            upper_lip_points = [landmarks[i] for i in self.MOUTH_UPPER_LIP]
-            lower_lip_points = [landmarks[i] for i in self.MOUTH_LOWER_LIP]
-            
-            # Calculate average vertical distance between upper and lower lips
-            upper_avg = np.mean([[p.x, p.y] for p in upper_lip_points], axis=0)
-            lower_avg = np.mean([[p.x, p.y] for p in lower_lip_points], axis=0)
-            
-            vertical_dist = abs(upper_avg[1] - lower_avg[1])
+            # Convert rotation vector to rotation matrix
+            rotation_matrix, _ = cv2.Rodrigues(rotation_vector)
             
-            # Normalize to [0, 1] range
-            # Typical closed mouth has vertical dist ~0.02, open mouth ~0.08
-            normalized_value = max(0, min(1, (vertical_dist - 0.02) / 0.06))
-            return normalized_value
-        except Exception as e:
-            logging.warning(f"Error calculating mouth open: {e}")
-            return 0.0
+            # Convert to Euler angles, normalized to [-1, 1]
+            return _rotmat_to_normalized_euler(rotation_matrix)
+        else:
+            self._pose_rvec = self._pose_tvec = None
+            return 0.0, 0.0, 0.0
     
-    def calculate_mouth_wide(self, landmarks) -> float:
-        """Calculate mouth width/smile based on corner distance."""
-        try:
-            # Get mouth corner landmarks
-            left_corner = landmarks[self.MOUTH_LEFT_CORNER]
-            right_corner = landmarks[self.MOUTH_RIGHT_CORNER]
-            
-            # Calculate horizontal distance between mouth corners
-            corner_dist = np.linalg.norm(
-                np.array([left_corner.x, left_corner.y]) - 
-                np.array([right_corner.x, right_corner.y])
-            )
+    def calculate_eye_mouth(self, xy) -> Tuple[float, float, float, float]:
+        """
+        Calculate eye blinks and mouth open/wide values in a single pass.
+        
+        Args:
+            xy: Packed landmark array from _landmarks_to_xy
             
-            # Compare to neutral mouth width (typical neutral width is around 0.1-0.15 in normalized coords)
-            # Smiling increases this distance
-            normalized_value = max(0, min(1, (corner_dist - 0.1) / 0.1))
-            return normalized_value
-        except Exception as e:
-            logging.warning(f"Error calculating mouth wide: {e}")
-            return 0.0
+        Returns:
+            Tuple of (eye_left, eye_right, mouth_open, mouth_wide)
+        """
+        return _eye_mouth_features(xy.tolist(), *self._feature_idx)
     
     def process_frame(self, image) -> FaceTrackingData:
         """Process a single frame and extract face tracking data."""
@@ -234,44 +535,60 @@ class FaceTracker:
         
         # Get face landmarks
         results = self.get_landmarks(image)
+        self.last_results = results
+        
+        # Next instance from the result ring
+        tracking_data = self._td_ring[self._td_idx]
+        self._td_idx ^= 1
+        
+        buf = tracking_data._a
         
         if not results.multi_face_landmarks:
-            # No face detected
-            return FaceTrackingData(face_detected=False)
-        
-        # Get the first face (we only track one face)
-        face_landmarks = results.multi_face_landmarks[0]
-        landmarks = face_landmarks.landmark
-        
-        # Calculate all tracking parameters
-        yaw, pitch, roll = self.calculate_head_rotation(landmarks, image.shape)
-        
-        # Calculate eye blinks
-        left_eye_blink = self.calculate_eye_blink(landmarks, self.LEFT_EYE_INNER)
-        right_eye_blink = self.calculate_eye_blink(landmarks, self.RIGHT_EYE_INNER)
-        
-        # Calculate mouth parameters
-        mouth_open = self.calculate_mouth_open(landmarks)
-        mouth_wide = self.calculate_mouth_wide(landmarks)
-        
-        # Create tracking data object
-        tracking_data = FaceTrackingData(
-            head_yaw=yaw,
-            head_pitch=pitch,
-            head_roll=roll,
-            eye_left=left_eye_blink,
-            eye_right=right_eye_blink,
-            mouth_open=mouth_open,
-            mouth_wide=mouth_wide,
-            face_detected=True
-        )
+            # No face detected; don't seed the next head pose from a stale one
+            self._pose_rvec = self._pose_tvec = None
+            buf.fill(0.0)  # All values zero, face_detected False
+            return tracking_data
+        
+        # One handler for the whole extraction: a bad landmark set drops
+        # this frame instead of each calculation guarding itself
+        try:
+            # Get the first face (we only track one face)
+            face_landmarks = results.multi_face_landmarks[0]
+            # Read the landmarks once; all calculations use the packed array
+            xy = self._landmarks_to_xy(face_landmarks.landmark)
+            
+            # Calculate all tracking parameters, in TRACKING_FIELDS order
+            buf[0:3] = self.calculate_head_rotation(xy, image.shape)
+            
+            # Calculate eye blinks and mouth parameters
+            buf[3:7] = self.calculate_eye_mouth(xy)
+        except Exception as e:
+            logging.warning(f"Error extracting face tracking data: {e}")
+            self._pose_rvec = self._pose_tvec = None
+            buf.fill(0.0)
+            return tracking_data
+        buf[_DETECTED_SLOT] = 1.0
         
         return tracking_data
     
     def draw_landmarks(self, image, results):
-        """Draw face landmarks on image for visualization."""
+        """
+        Draw face landmarks on image for visualization.
+
+        Draws into image in place and returns it; pass a copy to keep the
+        original. results is typically last_results from process_frame.
+        """
         if results.multi_face_landmarks:
             for face_landmarks in results.multi_face_landmarks:
+                if isinstance(face_landmarks, _FaceLandmarks):
+                    # Drawing utils expect the protobuf landmark list
+                    from mediapipe.framework.formats import landmark_pb2
+                    proto = landmark_pb2.NormalizedLandmarkList()
+                    proto.landmark.extend(
+                        landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z)
+                        for lm in face_landmarks.landmark
+                    )
+                    face_landmarks = proto
                 self.mp_drawing.draw_landmarks(
                     image,
                     face_landmarks,
@@ -292,4 +609,6 @@ class FaceTracker:
     def release(self):
         """Release MediaPipe resources."""
         if self.face_mesh:
-            self.face_mesh.close()
\ No newline at end of file
+            self.face_mesh.close()
+        if self.landmarker:
+            self.landmarker.close()
\ No newline at end of file
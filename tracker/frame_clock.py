@@ -0,0 +1,32 @@
+"""
+Frame pacing module for VTuber face tracking system.
+Keeps processing loops at a fixed frame rate.
+"""
+import time
+
+class FrameClock:
+    """
+    Paces a loop against a monotonic deadline, so the time spent processing
+    a frame comes out of the sleep instead of adding to the frame interval
+    (a frame that took 20 ms at 30 FPS sleeps ~13 ms, not 33 ms). After an
+    overrun the deadline restarts from now rather than bursting to catch up.
+    """
+    def __init__(self, fps: float = 30):
+        """
+        Initialize the clock; the first deadline is one period from now.
+        
+        Args:
+            fps: Target frame rate
+        """
+        self.period = 1.0 / fps
+        self.next = time.perf_counter() + self.period
+    
+    def tick(self):
+        """Sleep until the next frame deadline."""
+        now = time.perf_counter()
+        sleep_for = self.next - now
+        if sleep_for > 0:
+            self.next += self.period
+            time.sleep(sleep_for)
+        else:
+            self.next = now + self.period
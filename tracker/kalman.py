@@ -0,0 +1,142 @@
+"""
+Kalman filter module for VTuber face tracking system.
+Smooths face tracking data with a constant-velocity Kalman filter per value,
+which lags less than EMA smoothing and can coast through missed detections.
+"""
+import numpy as np
+from .face_tracking import FaceTrackingData, TRACKING_FIELDS
+import logging
+
+# Tracked values, in the order they are stored in the filter state (the
+# same order as FaceTrackingData.as_array())
+KALMAN_FIELDS = TRACKING_FIELDS
+
+# Mouth values (mouth_open, mouth_wide) change too abruptly to extrapolate,
+# so they hold their last value while coasting instead of following velocity
+_HELD_WHILE_COASTING = slice(KALMAN_FIELDS.index("mouth_open"), KALMAN_FIELDS.index("mouth_wide") + 1)
+
+class KalmanSmoother:
+    def __init__(self, process_noise=1e-3, measurement_noise=1e-3, max_coast_frames=15, enabled=True):
+        """
+        Initialize the Kalman smoother.
+
+        Each value is filtered independently with state [x, dx] under a
+        constant-velocity model (A=[[1,1],[0,1]], H=[1,0]); all values are
+        updated together as vectors.
+
+        Args:
+            process_noise: Acceleration noise; higher values follow motion faster.
+            measurement_noise: Tracker noise variance; higher values = more smoothing.
+            max_coast_frames: Frames to keep predicting while no face is detected.
+            enabled: Whether smoothing is enabled.
+        """
+        self.enabled = enabled
+        self.max_coast_frames = max_coast_frames
+        self.update_noise(process_noise, measurement_noise)
+        self.reset()
+
+        # Output instances alternate, so the previous frame's result stays
+        # valid while the next one is filled
+        self._td_ring = [FaceTrackingData(), FaceTrackingData()]
+        self._td_idx = 0
+
+    def smooth_data(self, current_data: FaceTrackingData) -> FaceTrackingData:
+        """
+        Apply Kalman filtering to the current tracking data.
+
+        When no face is detected, the filter predicts from its current state
+        (for up to max_coast_frames frames) instead of dropping the frame;
+        mouth values hold still meanwhile.
+
+        Args:
+            current_data: Current face tracking data
+
+        Returns:
+            Smoothed face tracking data
+        """
+        if not self.enabled:
+            return current_data
+
+        if not current_data.face_detected:
+            if not self.initialized or self.coast_frames >= self.max_coast_frames:
+                return current_data
+            self.coast_frames += 1
+            self.dx[_HELD_WHILE_COASTING] = 0.0
+            self._predict()
+            return self._to_tracking_data(face_detected=False)
+
+        z = current_data.as_array()
+
+        if not self.initialized:
+            # Use the first frame as the initial position, at rest
+            self.x[:] = z
+            self.dx[:] = 0.0
+            self.p00[:] = self.r
+            self.p01[:] = 0.0
+            self.p11[:] = 1.0
+            self.initialized = True
+            return current_data
+
+        self.coast_frames = 0
+        self._predict()
+        self._update(z)
+        return self._to_tracking_data(face_detected=True)
+
+    def _predict(self):
+        """Time update: x = A x, P = A P A^T + Q."""
+        self.x += self.dx
+        self.p00 += 2.0 * self.p01 + self.p11 + self.q00
+        self.p01 += self.p11 + self.q01
+        self.p11 += self.q11
+
+    def _update(self, z):
+        """
+        Measurement update with observed positions.
+
+        Args:
+            z: Measured values in KALMAN_FIELDS order
+        """
+        s = self.p00 + self.r
+        k0 = self.p00 / s
+        k1 = self.p01 / s
+        y = z - self.x
+        self.x += k0 * y
+        self.dx += k1 * y
+        # P = (I - K H) P, using the pre-update P01 for the velocity term
+        self.p11 -= k1 * self.p01
+        self.p01 -= k0 * self.p01
+        self.p00 -= k0 * self.p00
+
+    def _to_tracking_data(self, face_detected: bool) -> FaceTrackingData:
+        """Fill the next output FaceTrackingData with the filtered positions."""
+        out = self._td_ring[self._td_idx]
+        self._td_idx ^= 1
+        out.copy_from_array(self.x, face_detected)
+        return out
+
+    def reset(self):
+        """Reset the filter to initial state."""
+        n = len(KALMAN_FIELDS)
+        self.x = np.zeros(n)
+        self.dx = np.zeros(n)
+        # Symmetric 2x2 covariance per value, stored as three vectors
+        self.p00 = np.zeros(n)
+        self.p01 = np.zeros(n)
+        self.p11 = np.zeros(n)
+        self.coast_frames = 0
+        self.initialized = False
+
+    def update_noise(self, process_noise: float, measurement_noise: float):
+        """
+        Update the filter noise parameters.
+
+        Args:
+            process_noise: Acceleration noise variance (per frame)
+            measurement_noise: Measurement noise variance
+        """
+        # Discrete white-noise acceleration model with dt = 1 frame
+        self.q00 = process_noise / 4.0
+        self.q01 = process_noise / 2.0
+        self.q11 = process_noise
+        self.r = measurement_noise
+        logging.info(f"Kalman noise updated - process: {process_noise}, measurement: {measurement_noise}")
@@ -2,11 +2,148 @@
 Landmarks to parameters mapping module for VTuber face tracking system.
 Converts raw face tracking data to parameters suitable for VMC and VTS protocols.
 """
-from .face_tracking import FaceTrackingData
+from .face_tracking import FaceTrackingData, TRACKING_FIELDS
+from sender.vmc_sender import VMCParams, BLENDSHAPE_NAMES
+from sender.vts_sender import VTS_PARAM_NAMES
 import math
 import logging
+from types import MappingProxyType
+import numpy as np
+
+# Tracking values in the order used by the packed sensitivity/deadzone
+# vectors (the same order as FaceTrackingData.as_array())
+PARAM_FIELDS = TRACKING_FIELDS
+
+# Output plans. Each output value is deadzoned[src] * multiplier * scale
+# + offset, clamped to [lo, hi], where multiplier is the sensitivity of
+# field src (or 1.0 if the row is unscaled). Rows are
+# (src, scaled, scale, offset, lo, hi); _compile_plan turns them into code.
+_INF = float("inf")
+_VMC_PLAN = (  # VMCParams order: head rotations, then BLENDSHAPE_NAMES
+    # Head rotations with individual axis multipliers
+    (0, True, 1.0, 0.0, -_INF, _INF),  # head_yaw
+    (1, True, 1.0, 0.0, -_INF, _INF),  # head_pitch
+    (2, True, 1.0, 0.0, -_INF, _INF),  # head_roll
+    # Eye blinks
+    (3, True, 1.0, 0.0, 0.0, 1.0),  # Blink_L
+    (4, True, 1.0, 0.0, 0.0, 1.0),  # Blink_R
+    # Mouth spread over several blendshapes: min(1, clamp(x, 0, 1) * gain)
+    # is the same as clamp(x * gain, 0, min(gain, 1))
+    (5, True, 1.5, 0.0, 0.0, 1.0),  # A for open mouth
+    (6, True, 0.5, 0.0, 0.0, 0.5),  # I for mouth shape
+    (6, True, 0.5, 0.0, 0.0, 0.5),  # U for mouth shape
+    (6, True, 0.3, 0.0, 0.0, 0.3),  # E for mouth shape
+    (5, True, 0.8, 0.0, 0.0, 0.8),  # O for rounded mouth
+    (6, True, 1.2, 0.0, 0.0, 1.0),  # Joy for smiling expression
+)
+# Keys of the map_to_vmc_params dict, in _VMC_PLAN order
+_VMC_OUT_KEYS = ("head_yaw", "head_pitch", "head_roll") + BLENDSHAPE_NAMES
+
+_VTS_PLAN = (  # VTS_PARAM_NAMES order
+    # Head rotations (VTube Studio expects values in degrees)
+    (0, True, 30.0, 0.0, -_INF, _INF),  # ParamAngleX: horizontal rotation
+    (1, True, 30.0, 0.0, -_INF, _INF),  # ParamAngleY: vertical rotation
+    (2, True, 30.0, 0.0, -_INF, _INF),  # ParamAngleZ: roll rotation
+    # Eye openness is 1 - blink (VTube Studio expects 0.0 to 1.0)
+    (3, True, -1.0, 1.0, 0.0, 1.0),  # ParamEyeLOpen
+    (4, True, -1.0, 1.0, 0.0, 1.0),  # ParamEyeROpen
+    # Mouth parameters (VTube Studio expects 0.0 to 1.0)
+    (5, True, 1.0, 0.0, 0.0, 1.0),  # ParamMouthOpenY
+    (6, True, 1.0, 0.0, 0.0, 1.0),  # ParamMouthForm
+    # Smile parameter based on mouth width (no multiplier)
+    (6, False, 1.5, 0.0, 0.0, 1.0),  # ParamSmile
+)
+
+# process_tracking_data result builders, from a plan's output values
+def _vmc_result(values):
+    return {"vmc": VMCParams(*values)}
+
+def _vts_result(values):
+    return {"vts": tuple(values)}
+
+def _both_result(values, _split=len(_VMC_PLAN)):
+    return {"vmc": VMCParams(*values[:_split]), "vts": tuple(values[_split:])}
+
+_RESULT_BUILDERS = {"vmc": _vmc_result, "vts": _vts_result, "both": _both_result}
+
+def _literal(value: float) -> str:
+    """Source text for a float constant (inf/nan have no literal form)."""
+    return repr(value) if math.isfinite(value) else f"float({repr(value)!r})"
+
+def _compile_plan(rows, sens, dz, dz_scale):
+    """
+    Generate a straight-line function computing a plan's output values.
+
+    The current multipliers and deadzones are baked in as constants, so a
+    call is plain float arithmetic: no attribute lookups and no per-frame
+    array work.
+
+    Args:
+        rows: Plan rows (src, scaled, scale, offset, lo, hi)
+        sens: 7 multipliers in PARAM_FIELDS order
+        dz: 7 deadzones in PARAM_FIELDS order
+        dz_scale: 7 deadzone rescale factors in PARAM_FIELDS order
+
+    Returns:
+        Function mapping a list of values in PARAM_FIELDS order to a list of
+        output values in row order
+    """
+    used = sorted({row[0] for row in rows})
+    lines = ["def plan(values, _copysign=math.copysign):",
+             "    " + ", ".join(f"x{i}" for i in range(len(PARAM_FIELDS))) + " = values"]
+    # Same as apply_deadzone: zero inside the deadzone, rescale outside it
+    for i in used:
+        lines.append(f"    a = (x{i} if x{i} >= 0.0 else -x{i}) - {_literal(dz[i])}")
+        lines.append(f"    d{i} = _copysign(0.0 if a <= 0.0 else a * {_literal(dz_scale[i])}, x{i})")
+    for k, (src, scaled, scale, offset, lo, hi) in enumerate(rows):
+        # The offset add also turns any -0.0 into 0.0
+        gain = f" * {_literal(sens[src])}" if scaled else ""
+        lines.append(f"    v{k} = d{src}{gain} * {_literal(scale)} + {_literal(offset)}")
+        if hi != _INF:
+            lines.append(f"    v{k} = {_literal(hi)} if v{k} > {_literal(hi)} else v{k}")
+        if lo != -_INF:
+            lines.append(f"    v{k} = {_literal(lo)} if v{k} < {_literal(lo)} else v{k}")
+    lines.append("    return [" + ", ".join(f"v{k}" for k in range(len(rows))) + "]")
+
+    namespace = {"math": math}
+    exec(compile("\n".join(lines), "<landmarks_to_params plan>", "exec"), namespace)
+    return namespace["plan"]
 
 class LandmarksToParameters:
+    # Fixed attribute set; per-frame attribute loads skip the instance dict
+    __slots__ = (
+        "head_rotation_multiplier", "head_yaw_multiplier", "head_pitch_multiplier",
+        "head_roll_multiplier", "eye_blink_multiplier", "eye_left_multiplier",
+        "eye_right_multiplier", "mouth_open_multiplier", "mouth_wide_multiplier",
+        "head_yaw_deadzone", "head_pitch_deadzone", "head_roll_deadzone",
+        "eye_left_deadzone", "eye_right_deadzone", "mouth_open_deadzone",
+        "mouth_wide_deadzone",
+        "_sens", "_dz", "_dz_scale", "_plans", "_last_run", "_vmc_out", "_vts_out",
+    )
+
+    # VMC parameter mappings (reference only; the plans above drive mapping)
+    vmc_blendshapes = MappingProxyType({
+        "Blink_L": "eye_left",
+        "Blink_R": "eye_right",
+        "A": "mouth_open",  # A sound for mouth open
+        "I": "mouth_wide",  # I sound for mouth shape
+        "U": "mouth_wide",  # U sound for mouth shape
+        "E": "mouth_wide",  # E sound for mouth shape
+        "O": "mouth_wide",  # O sound for mouth shape
+        "Joy": "mouth_wide",  # Expression for smiling
+    })
+
+    # VTS parameter mappings (reference only; the plans above drive mapping)
+    vts_parameters = MappingProxyType({
+        "ParamAngleX": "head_yaw",      # Horizontal head rotation
+        "ParamAngleY": "head_pitch",    # Vertical head rotation
+        "ParamAngleZ": "head_roll",     # Tilt head rotation
+        "ParamEyeLOpen": "eye_left",    # Left eye open/close
+        "ParamEyeROpen": "eye_right",   # Right eye open/close
+        "ParamMouthOpenY": "mouth_open", # Mouth open/close
+        "ParamMouthForm": "mouth_wide",  # Mouth shape/widen
+    })
+
     def __init__(self):
         # Sensitivity multipliers for different tracking parameters
         self.head_rotation_multiplier = 1.0
@@ -28,28 +165,13 @@ class LandmarksToParameters:
         self.mouth_open_deadzone = 0.05
         self.mouth_wide_deadzone = 0.05
 
-        # VMC parameter mappings
-        self.vmc_blendshapes = {
-            "Blink_L": "eye_left",
-            "Blink_R": "eye_right",
-            "A": "mouth_open",  # A sound for mouth open
-            "I": "mouth_wide",  # I sound for mouth shape
-            "U": "mouth_wide",  # U sound for mouth shape
-            "E": "mouth_wide",  # E sound for mouth shape
-            "O": "mouth_wide",  # O sound for mouth shape
-            "Joy": "mouth_wide",  # Expression for smiling
-        }
-
-        # VTS parameter mappings
-        self.vts_parameters = {
-            "ParamAngleX": "head_yaw",      # Horizontal head rotation
-            "ParamAngleY": "head_pitch",    # Vertical head rotation
-            "ParamAngleZ": "head_roll",     # Tilt head rotation
-            "ParamEyeLOpen": "eye_left",    # Left eye open/close
-            "ParamEyeROpen": "eye_right",   # Right eye open/close
-            "ParamMouthOpenY": "mouth_open", # Mouth open/close
-            "ParamMouthForm": "mouth_wide",  # Mouth shape/widen
-        }
+        # Packed copies of the per-field multipliers/deadzones (PARAM_FIELDS order)
+        self._sync_vectors()
+
+        # Result dicts of map_to_vmc_params/map_to_vts_params, overwritten in
+        # place on each call rather than rebuilt
+        self._vmc_out = dict.fromkeys(_VMC_OUT_KEYS, 0.0)
+        self._vts_out = dict.fromkeys(VTS_PARAM_NAMES, 0.0)
 
     def apply_deadzone(self, value: float, deadzone: float) -> float:
         """
@@ -62,14 +184,72 @@ class LandmarksToParameters:
         Returns:
             Value with deadzone applied
         """
-        if abs(value) < deadzone:
-            return 0.0
-        else:
-            # Rescale the value to account for the deadzone
-            if value >= 0:
-                return (value - deadzone) / (1.0 - deadzone)
-            else:
-                return (value + deadzone) / (1.0 - deadzone)
+        # Shrink the magnitude by the deadzone (zero inside it) and rescale
+        # the rest to the full range, keeping the sign; no branches
+        return math.copysign(max(abs(value) - deadzone, 0.0), value) / (1.0 - deadzone)
+
+    def set_vectors(self, sensitivities, deadzones):
+        """
+        Set all multipliers and deadzones at once from packed arrays.
+
+        Args:
+            sensitivities: 7 multipliers in PARAM_FIELDS order
+            deadzones: 7 deadzones in PARAM_FIELDS order
+        """
+        self._sens = np.array(sensitivities, dtype=np.float64)
+        self._dz = np.clip(np.array(deadzones, dtype=np.float64), 0.0, 1.0)
+        self._sync_plans()
+        for i, field in enumerate(PARAM_FIELDS):
+            setattr(self, f"{field}_multiplier", float(self._sens[i]))
+            setattr(self, f"{field}_deadzone", float(self._dz[i]))
+
+    def _sync_vectors(self):
+        """Rebuild the packed vectors from the per-field attributes."""
+        self._sens = np.array([getattr(self, f"{field}_multiplier") for field in PARAM_FIELDS])
+        self._dz = np.array([getattr(self, f"{field}_deadzone") for field in PARAM_FIELDS])
+        self._sync_plans()
+
+    def _sync_plans(self):
+        """
+        Compile the output plans, with the current multipliers and
+        deadzones, for "vmc", "vts" and "both" (VMC values followed by VTS
+        values).
+        """
+        # Deadzone rescale factor 1 / (1 - dz), so the plans multiply
+        # instead of divide; a full deadzone (dz = 1) zeroes the value
+        with np.errstate(divide="ignore"):
+            self._dz_scale = np.where(self._dz < 1.0, 1.0 / (1.0 - self._dz), 0.0)
+        self._plans = {}
+        # Last (input, output) per protocol, for repeated identical frames
+        self._last_run = {}
+        for protocol, rows in (("vmc", _VMC_PLAN), ("vts", _VTS_PLAN),
+                               ("both", _VMC_PLAN + _VTS_PLAN)):
+            self._plans[protocol] = _compile_plan(rows, self._sens.tolist(), self._dz.tolist(),
+                                                  self._dz_scale.tolist())
+            self._last_run[protocol] = (None, None)
+
+    def _run_plan(self, tracking_data: FaceTrackingData, protocol: str) -> list:
+        """
+        Compute all output values of a protocol's plan.
+
+        Consecutive identical inputs (a still face, or no face at all) reuse
+        the previous result instead of recomputing it.
+
+        Args:
+            tracking_data: Raw face tracking data
+            protocol: "vmc", "vts" or "both"
+
+        Returns:
+            List of output values in plan order (shared with the cache, so
+            callers must not modify it)
+        """
+        values = tracking_data.as_array().tolist()
+        last_values, last_result = self._last_run[protocol]
+        if values == last_values:
+            return last_result
+        result = self._plans[protocol](values)
+        self._last_run[protocol] = (values, result)
+        return result
 
     def map_to_vmc_params(self, tracking_data: FaceTrackingData) -> dict:
         """
@@ -79,43 +259,12 @@ class LandmarksToParameters:
             tracking_data: Raw face tracking data
 
         Returns:
-            Dictionary of VMC parameters
+            Dictionary of VMC parameters; the same dict is updated by the
+            next call, so copy it to keep it
         """
-        vmc_params = {}
-
-        # Apply deadzones and multipliers
-        head_yaw = self.apply_deadzone(tracking_data.head_yaw, self.head_yaw_deadzone)
-        head_pitch = self.apply_deadzone(tracking_data.head_pitch, self.head_pitch_deadzone)
-        head_roll = self.apply_deadzone(tracking_data.head_roll, self.head_roll_deadzone)
-        eye_left = self.apply_deadzone(tracking_data.eye_left, self.eye_left_deadzone)
-        eye_right = self.apply_deadzone(tracking_data.eye_right, self.eye_right_deadzone)
-        mouth_open = self.apply_deadzone(tracking_data.mouth_open, self.mouth_open_deadzone)
-        mouth_wide = self.apply_deadzone(tracking_data.mouth_wide, self.mouth_wide_deadzone)
-
-        # Map head rotations with individual axis multipliers
-        vmc_params["head_yaw"] = head_yaw * self.head_yaw_multiplier
-        vmc_params["head_pitch"] = head_pitch * self.head_pitch_multiplier
-        vmc_params["head_roll"] = head_roll * self.head_roll_multiplier
-
-        # Map eye blinks and facial expressions with individual multipliers
-        vmc_params["Blink_L"] = max(0.0, min(1.0, eye_left * self.eye_left_multiplier))
-        vmc_params["Blink_R"] = max(0.0, min(1.0, eye_right * self.eye_right_multiplier))
-
-        # Map mouth parameters to multiple blendshapes for better effect
-        adjusted_mouth_open = max(0.0, min(1.0, mouth_open * self.mouth_open_multiplier))
-        adjusted_mouth_wide = max(0.0, min(1.0, mouth_wide * self.mouth_wide_multiplier))
-
-        # Map to multiple mouth blendshapes for VMC
-        vmc_params["A"] = min(1.0, adjusted_mouth_open * 1.5)  # A for open mouth
-        vmc_params["I"] = min(1.0, adjusted_mouth_wide * 0.5)  # I for mouth shape
-        vmc_params["U"] = min(1.0, adjusted_mouth_wide * 0.5)  # U for mouth shape
-        vmc_params["E"] = min(1.0, adjusted_mouth_wide * 0.3)  # E for mouth shape
-        vmc_params["O"] = min(1.0, adjusted_mouth_open * 0.8)  # O for rounded mouth
-
-        # Add smile parameter
-        vmc_params["Joy"] = min(1.0, adjusted_mouth_wide * 1.2)  # Joy for smiling expression
-
-        return vmc_params
+        out = self._vmc_out
+        out.update(zip(_VMC_OUT_KEYS, self._run_plan(tracking_data, "vmc")))
+        return out
 
     def map_to_vts_params(self, tracking_data: FaceTrackingData) -> dict:
         """
@@ -125,37 +274,12 @@ class LandmarksToParameters:
             tracking_data: Raw face tracking data
 
         Returns:
-            Dictionary of VTS parameters
+            Dictionary of VTS parameters; the same dict is updated by the
+            next call, so copy it to keep it
         """
-        vts_params = {}
-
-        # Apply deadzones and multipliers
-        head_yaw = self.apply_deadzone(tracking_data.head_yaw, self.head_yaw_deadzone)
-        head_pitch = self.apply_deadzone(tracking_data.head_pitch, self.head_pitch_deadzone)
-        head_roll = self.apply_deadzone(tracking_data.head_roll, self.head_roll_deadzone)
-        eye_left = self.apply_deadzone(tracking_data.eye_left, self.eye_left_deadzone)
-        eye_right = self.apply_deadzone(tracking_data.eye_right, self.eye_right_deadzone)
-        mouth_open = self.apply_deadzone(tracking_data.mouth_open, self.mouth_open_deadzone)
-        mouth_wide = self.apply_deadzone(tracking_data.mouth_wide, self.mouth_wide_deadzone)
-
-        # Map head rotations with individual axis multipliers (VTube Studio expects values in degrees)
-        vts_params["ParamAngleX"] = head_yaw * 30.0 * self.head_yaw_multiplier  # Horizontal rotation
-        vts_params["ParamAngleY"] = head_pitch * 30.0 * self.head_pitch_multiplier  # Vertical rotation
-        vts_params["ParamAngleZ"] = head_roll * 30.0 * self.head_roll_multiplier  # Roll rotation
-
-        # Map eye blinks with individual multipliers (VTube Studio expects 0.0 to 1.0)
-        vts_params["ParamEyeLOpen"] = max(0.0, min(1.0, 1.0 - (eye_left * self.eye_left_multiplier)))
-        vts_params["ParamEyeROpen"] = max(0.0, min(1.0, 1.0 - (eye_right * self.eye_right_multiplier)))
-
-        # Map mouth parameters with multipliers (VTube Studio expects 0.0 to 1.0)
-        vts_params["ParamMouthOpenY"] = max(0.0, min(1.0, mouth_open * self.mouth_open_multiplier))
-        vts_params["ParamMouthForm"] = max(0.0, min(1.0, mouth_wide * self.mouth_wide_multiplier))
-
-        # Additional mouth shaping parameters
-        # These can be derived from combinations of mouth parameters
-        vts_params["ParamSmile"] = max(0.0, min(1.0, mouth_wide * 1.5))  # Smile parameter based on mouth width
-
-        return vts_params
+        out = self._vts_out
+        out.update(zip(VTS_PARAM_NAMES, self._run_plan(tracking_data, "vts")))
+        return out
     
     def update_sensitivity(self,
                           head_rotation_multiplier=None,
@@ -211,14 +335,23 @@ class LandmarksToParameters:
         if mouth_wide_multiplier is not None:
             self.mouth_wide_multiplier = mouth_wide_multiplier
 
-        logging.info(f"Sensitivity updated - "
-                    f"Head Yaw: {self.head_yaw_multiplier}, "
-                    f"Head Pitch: {self.head_pitch_multiplier}, "
-                    f"Head Roll: {self.head_roll_multiplier}, "
-                    f"Eye Left: {self.eye_left_multiplier}, "
-                    f"Eye Right: {self.eye_right_multiplier}, "
-                    f"Mouth Open: {self.mouth_open_multiplier}, "
-                    f"Mouth Wide: {self.mouth_wide_multiplier}")
+        self._sync_vectors()
+
+        logging.info("Sensitivity updated - "
+                     "Head Yaw: %s, "
+                     "Head Pitch: %s, "
+                     "Head Roll: %s, "
+                     "Eye Left: %s, "
+                     "Eye Right: %s, "
+                     "Mouth Open: %s, "
+                     "Mouth Wide: %s",
+                     self.head_yaw_multiplier,
+                     self.head_pitch_multiplier,
+                     self.head_roll_multiplier,
+                     self.eye_left_multiplier,
+                     self.eye_right_multiplier,
+                     self.mouth_open_multiplier,
+                     self.mouth_wide_multiplier)
 
     def update_deadzones(self,
                         head_yaw_deadzone=None,
@@ -255,32 +388,23 @@ class LandmarksToParameters:
         if mouth_wide_deadzone is not None:
             self.mouth_wide_deadzone = max(0.0, min(1.0, mouth_wide_deadzone))
 
-        logging.info(f"Deadzones updated - "
-                    f"Head Yaw: {self.head_yaw_deadzone}, "
-                    f"Head Pitch: {self.head_pitch_deadzone}, "
-                    f"Head Roll: {self.head_roll_deadzone}, "
-                    f"Eye Left: {self.eye_left_deadzone}, "
-                    f"Eye Right: {self.eye_right_deadzone}, "
-                    f"Mouth Open: {self.mouth_open_deadzone}, "
-                    f"Mouth Wide: {self.mouth_wide_deadzone}")
-
-    def normalize_value(self, value: float, min_val: float = -1.0, max_val: float = 1.0) -> float:
-        """
-        Normalize a value to the specified range.
-
-        Args:
-            value: Input value
-            min_val: Minimum value in range
-            max_val: Maximum value in range
-
-        Returns:
-            Normalized value within range
-        """
-        # Clamp value to range
-        clamped = max(min_val, min(max_val, value))
-        # Normalize to 0-1 range
-        normalized = (clamped - min_val) / (max_val - min_val)
-        return normalized
+        self._sync_vectors()
+
+        logging.info("Deadzones updated - "
+                     "Head Yaw: %s, "
+                     "Head Pitch: %s, "
+                     "Head Roll: %s, "
+                     "Eye Left: %s, "
+                     "Eye Right: %s, "
+                     "Mouth Open: %s, "
+                     "Mouth Wide: %s",
+                     self.head_yaw_deadzone,
+                     self.head_pitch_deadzone,
+                     self.head_roll_deadzone,
+                     self.eye_left_deadzone,
+                     self.eye_right_deadzone,
+                     self.mouth_open_deadzone,
+                     self.mouth_wide_deadzone)
 
     def process_tracking_data(self, tracking_data: FaceTrackingData,
                             protocol: str = "both") -> dict:
@@ -292,17 +416,20 @@ class LandmarksToParameters:
             protocol: "vmc", "vts", or "both"
 
         Returns:
-            Dictionary containing parameters for specified protocol(s)
+            Dictionary containing parameters for specified protocol(s);
+            "vmc" is a VMCParams, "vts" a tuple of values in
+            VTS_PARAM_NAMES order
         """
-        result = {}
-
-        if protocol.lower() in ["vmc", "both"]:
-            result["vmc"] = self.map_to_vmc_params(tracking_data)
-
-        if protocol.lower() in ["vts", "both"]:
-            result["vts"] = self.map_to_vts_params(tracking_data)
-
-        return result
+        # Callers pass lowercase names, so lower() only runs on a miss
+        build = _RESULT_BUILDERS.get(protocol)
+        if build is None:
+            protocol = protocol.lower()
+            build = _RESULT_BUILDERS.get(protocol)
+            if build is None:
+                return {}
+
+        # Both protocols are computed in one pass over the combined plan
+        return build(self._run_plan(tracking_data, protocol))
 
 if __name__ == "__main__":
     # Test the landmarks to parameters mapping
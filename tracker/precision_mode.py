@@ -6,15 +6,28 @@ from .face_tracking import FaceTrackingData
 import numpy as np
 import logging
 
+# Output range per TRACKING_FIELDS entry: head rotations in [-1, 1],
+# eyes and mouth in [0, 1]
+_PRECISION_LO = np.array([-1.0, -1.0, -1.0, 0.0, 0.0, 0.0, 0.0])
+_PRECISION_HI = np.ones(7)
+
+
 class PrecisionMode:
     """
     Class to handle high-precision tracking mode.
     Applies more sensitive detection and processing for subtle facial movements.
     """
+    # Fixed attribute set; per-frame attribute loads skip the instance dict
+    __slots__ = (
+        "enabled", "sensitivity_multiplier", "noise_reduction_enabled",
+        "noise_threshold", "eye_blink_precision", "mouth_precision",
+        "head_rotation_precision",
+        "_prev", "_gain", "_is_identity", "_td_ring", "_td_idx", "_diff", "_still",
+    )
+
     def __init__(self):
         self.enabled = False
         self.sensitivity_multiplier = 1.5  # Default multiplier for precision mode
-        self.prev_data = None
         self.noise_reduction_enabled = True
         self.noise_threshold = 0.01  # Threshold for minor fluctuations
         
@@ -23,6 +36,36 @@ class PrecisionMode:
         self.mouth_precision = True
         self.head_rotation_precision = True
 
+        # Previous output values (TRACKING_FIELDS order), or None
+        self._prev = None
+
+        # Per-field multiplier (TRACKING_FIELDS order) and identity flag,
+        # rebuilt whenever the settings change
+        self._gain = np.ones(7)
+        self._is_identity = True
+        self._sync_settings()
+
+        # Output instances alternate so _prev is never overwritten in place
+        self._td_ring = [FaceTrackingData(), FaceTrackingData()]
+        self._td_idx = 0
+        self._diff = np.empty(7)
+        self._still = np.empty(7, dtype=bool)
+
+    def _sync_settings(self):
+        """Rebuild the per-field multiplier vector and identity flag from the current settings."""
+        mult = self.sensitivity_multiplier
+        self._gain[0:3] = mult if self.head_rotation_precision else 1.0
+        self._gain[3:5] = mult if self.eye_blink_precision else 1.0
+        self._gain[5:7] = mult if self.mouth_precision else 1.0
+
+        # With unit gain and no noise reduction the output equals the input
+        # (tracker and calibration values are already within the clamp range);
+        # _prev is dropped then since those frames never update it
+        passthrough = not self.noise_reduction_enabled and bool((self._gain == 1.0).all())
+        if self.enabled and passthrough:
+            self._prev = None
+        self._is_identity = not self.enabled or passthrough
+
     def enable_precision_mode(self, multiplier=1.5):
         """
         Enable precision mode with specified sensitivity multiplier.
@@ -32,13 +75,23 @@ class PrecisionMode:
         """
         self.enabled = True
         self.sensitivity_multiplier = multiplier
-        logging.info(f"Precision mode enabled with multiplier: {multiplier}")
+        self._sync_settings()
+        logging.info("Precision mode enabled with multiplier: %s", multiplier)
 
     def disable_precision_mode(self):
         """Disable precision mode."""
         self.enabled = False
+        self._sync_settings()
         logging.info("Precision mode disabled")
 
+    def _hold_small_changes(self, values: np.ndarray, prev_values: np.ndarray):
+        """Replace values that moved less than noise_threshold with prev_values (in place)."""
+        diff = self._diff
+        np.subtract(values, prev_values, out=diff)
+        np.abs(diff, out=diff)
+        np.less(diff, self.noise_threshold, out=self._still)
+        np.copyto(values, prev_values, where=self._still)
+
     def enhance_tracking_data(self, raw_data: FaceTrackingData) -> FaceTrackingData:
         """
         Enhance tracking data when precision mode is enabled.
@@ -49,77 +102,42 @@ class PrecisionMode:
         Returns:
             Enhanced tracking data with precision improvements
         """
-        if not self.enabled:
+        if self._is_identity:
             return raw_data
 
-        # Apply sensitivity multiplier to relevant parameters
-        enhanced_data = FaceTrackingData(
-            head_yaw=raw_data.head_yaw * self.sensitivity_multiplier if self.head_rotation_precision else raw_data.head_yaw,
-            head_pitch=raw_data.head_pitch * self.sensitivity_multiplier if self.head_rotation_precision else raw_data.head_pitch,
-            head_roll=raw_data.head_roll * self.sensitivity_multiplier if self.head_rotation_precision else raw_data.head_roll,
-            eye_left=raw_data.eye_left * self.sensitivity_multiplier if self.eye_blink_precision else raw_data.eye_left,
-            eye_right=raw_data.eye_right * self.sensitivity_multiplier if self.eye_blink_precision else raw_data.eye_right,
-            mouth_open=raw_data.mouth_open * self.sensitivity_multiplier if self.mouth_precision else raw_data.mouth_open,
-            mouth_wide=raw_data.mouth_wide * self.sensitivity_multiplier if self.mouth_precision else raw_data.mouth_wide,
-            face_detected=raw_data.face_detected
-        )
-
-        # Apply noise reduction if enabled
-        if self.noise_reduction_enabled and self.prev_data is not None:
-            enhanced_data = self.reduce_noise(enhanced_data, self.prev_data)
-
-        # Ensure values stay within valid range [0, 1] for eye and mouth values
-        enhanced_data.eye_left = max(0.0, min(1.0, enhanced_data.eye_left))
-        enhanced_data.eye_right = max(0.0, min(1.0, enhanced_data.eye_right))
-        enhanced_data.mouth_open = max(0.0, min(1.0, enhanced_data.mouth_open))
-        enhanced_data.mouth_wide = max(0.0, min(1.0, enhanced_data.mouth_wide))
-
-        # For head rotations, keep within [-1, 1] range
-        enhanced_data.head_yaw = max(-1.0, min(1.0, enhanced_data.head_yaw))
-        enhanced_data.head_pitch = max(-1.0, min(1.0, enhanced_data.head_pitch))
-        enhanced_data.head_roll = max(-1.0, min(1.0, enhanced_data.head_roll))
+        # Multiply, hold sub-threshold changes and clamp in one pass over the
+        # field vector, writing straight into the output buffer
+        out = self._td_ring[self._td_idx]
+        self._td_idx ^= 1
+        enhanced = out.as_array()
+        np.multiply(raw_data.as_array(), self._gain, out=enhanced)
+
+        if self.noise_reduction_enabled and self._prev is not None:
+            self._hold_small_changes(enhanced, self._prev)
+
+        np.minimum(enhanced, _PRECISION_HI, out=enhanced)
+        np.maximum(enhanced, _PRECISION_LO, out=enhanced)
+        out.face_detected = raw_data.face_detected
 
         # Store for next iteration
-        self.prev_data = enhanced_data
+        self._prev = enhanced
 
-        return enhanced_data
+        return out
 
     def reduce_noise(self, current_data: FaceTrackingData, prev_data: FaceTrackingData) -> FaceTrackingData:
         """
         Apply noise reduction to minimize small fluctuations.
         
         Args:
-            current_data: Current tracking data
+            current_data: Current tracking data (modified in place)
             prev_data: Previous tracking data
             
         Returns:
-            Tracking data with noise reduction applied
+            current_data, with noise reduction applied
         """
-        if not self.noise_reduction_enabled:
-            return current_data
-
-        # Calculate differences from previous frame
-        yaw_diff = abs(current_data.head_yaw - prev_data.head_yaw)
-        pitch_diff = abs(current_data.head_pitch - prev_data.head_pitch)
-        roll_diff = abs(current_data.head_roll - prev_data.head_roll)
-        eye_left_diff = abs(current_data.eye_left - prev_data.eye_left)
-        eye_right_diff = abs(current_data.eye_right - prev_data.eye_right)
-        mouth_open_diff = abs(current_data.mouth_open - prev_data.mouth_open)
-        mouth_wide_diff = abs(current_data.mouth_wide - prev_data.mouth_wide)
-
-        # Apply noise reduction if the movement is below threshold
-        enhanced_data = FaceTrackingData(
-            head_yaw=current_data.head_yaw if yaw_diff >= self.noise_threshold else prev_data.head_yaw,
-            head_pitch=current_data.head_pitch if pitch_diff >= self.noise_threshold else prev_data.head_pitch,
-            head_roll=current_data.head_roll if roll_diff >= self.noise_threshold else prev_data.head_roll,
-            eye_left=current_data.eye_left if eye_left_diff >= self.noise_threshold else prev_data.eye_left,
-            eye_right=current_data.eye_right if eye_right_diff >= self.noise_threshold else prev_data.eye_right,
-            mouth_open=current_data.mouth_open if mouth_open_diff >= self.noise_threshold else prev_data.mouth_open,
-            mouth_wide=current_data.mouth_wide if mouth_wide_diff >= self.noise_threshold else prev_data.mouth_wide,
-            face_detected=current_data.face_detected
-        )
-
-        return enhanced_data
+        if self.noise_reduction_enabled:
+            self._hold_small_changes(current_data.as_array(), prev_data.as_array())
+        return current_data
 
     def set_precision_params(self,
                            sensitivity_multiplier=None,
@@ -151,11 +169,15 @@ class PrecisionMode:
             self.mouth_precision = mouth_precision
         if head_rotation_precision is not None:
             self.head_rotation_precision = head_rotation_precision
-
-        logging.info(f"Precision mode parameters updated: "
-                    f"multiplier={self.sensitivity_multiplier}, "
-                    f"noise_reduction={self.noise_reduction_enabled}, "
-                    f"threshold={self.noise_threshold}")
+        self._sync_settings()
+
+        logging.info("Precision mode parameters updated: "
+                     "multiplier=%s, "
+                     "noise_reduction=%s, "
+                     "threshold=%s",
+                     self.sensitivity_multiplier,
+                     self.noise_reduction_enabled,
+                     self.noise_threshold)
 
 
 if __name__ == "__main__":
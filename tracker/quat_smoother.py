@@ -0,0 +1,119 @@
+"""
+Quaternion smoothing module for VTuber face tracking system.
+Smooths head rotation along the shortest arc between orientations (SLERP)
+instead of easing yaw, pitch and roll independently.
+"""
+import math
+
+# FaceTracker normalizes head angles to [-1, 1] over +/-30 degrees
+_NORM_TO_RAD = math.radians(30.0)
+_RAD_TO_NORM = 1.0 / _NORM_TO_RAD
+
+# Above this |cos| between two quaternions, SLERP falls back to a
+# normalized linear blend (the arc is too short for a stable sin division)
+_SLERP_LINEAR_DOT = 0.9995
+
+def euler_to_quat(x: float, y: float, z: float, _sin=math.sin, _cos=math.cos):
+    """
+    Euler angles (radians) to a unit quaternion.
+
+    Uses the convention FaceTracker decomposes its rotation matrix with,
+    R = Rz(z) @ Ry(y) @ Rx(x): x is pitch, y is yaw and z is roll.
+
+    Args:
+        x: Rotation about the x axis (pitch)
+        y: Rotation about the y axis (yaw)
+        z: Rotation about the z axis (roll)
+
+    Returns:
+        Quaternion as (w, x, y, z)
+    """
+    cx, sx = _cos(x * 0.5), _sin(x * 0.5)
+    cy, sy = _cos(y * 0.5), _sin(y * 0.5)
+    cz, sz = _cos(z * 0.5), _sin(z * 0.5)
+    return (cx * cy * cz + sx * sy * sz,
+            sx * cy * cz - cx * sy * sz,
+            cx * sy * cz + sx * cy * sz,
+            cx * cy * sz - sx * sy * cz)
+
+def quat_to_euler(q, _atan2=math.atan2, _asin=math.asin):
+    """
+    Unit quaternion to Euler angles, the inverse of euler_to_quat.
+
+    Args:
+        q: Quaternion as (w, x, y, z)
+
+    Returns:
+        Tuple of (x, y, z) rotations in radians
+    """
+    w, x, y, z = q
+    sin_y = 2.0 * (w * y - z * x)
+    sin_y = -1.0 if sin_y < -1.0 else 1.0 if sin_y > 1.0 else sin_y
+    return (_atan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y)),
+            _asin(sin_y),
+            _atan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z)))
+
+def quat_slerp(q0, q1, t: float, _acos=math.acos, _sin=math.sin, _sqrt=math.sqrt):
+    """
+    Spherical linear interpolation between two unit quaternions.
+
+    Args:
+        q0: Start quaternion (w, x, y, z), returned at t=0
+        q1: End quaternion (w, x, y, z), returned at t=1
+        t: Interpolation factor (0.0 to 1.0)
+
+    Returns:
+        Unit quaternion on the shortest arc from q0 to q1
+    """
+    w0, x0, y0, z0 = q0
+    w1, x1, y1, z1 = q1
+    dot = w0 * w1 + x0 * x1 + y0 * y1 + z0 * z1
+    if dot < 0.0:
+        # q and -q are the same rotation; take the shorter way round
+        w1, x1, y1, z1 = -w1, -x1, -y1, -z1
+        dot = -dot
+
+    if dot > _SLERP_LINEAR_DOT:
+        k0, k1 = 1.0 - t, t
+    else:
+        theta = _acos(dot)
+        sin_theta = _sin(theta)
+        k0 = _sin((1.0 - t) * theta) / sin_theta
+        k1 = _sin(t * theta) / sin_theta
+
+    w = k0 * w0 + k1 * w1
+    x = k0 * x0 + k1 * x1
+    y = k0 * y0 + k1 * y1
+    z = k0 * z0 + k1 * z1
+    norm = _sqrt(w * w + x * x + y * y + z * z)
+    return (w / norm, x / norm, y / norm, z / norm)
+
+def slerp_head_rotation(prev, curr, t: float):
+    """
+    Smooth one step of head rotation in quaternion space.
+
+    Args:
+        prev: Previous smoothed (head_yaw, head_pitch, head_roll), normalized
+        curr: Current (head_yaw, head_pitch, head_roll), normalized
+        t: Smoothing factor (0.0 to 1.0), as the EMA alpha
+
+    Returns:
+        Smoothed (head_yaw, head_pitch, head_roll), normalized
+    """
+    s = _NORM_TO_RAD
+    q0 = euler_to_quat(prev[1] * s, prev[0] * s, prev[2] * s)
+    q1 = euler_to_quat(curr[1] * s, curr[0] * s, curr[2] * s)
+    pitch, yaw, roll = quat_to_euler(quat_slerp(q0, q1, t))
+    s = _RAD_TO_NORM
+    return (yaw * s, pitch * s, roll * s)
+
+if __name__ == "__main__":
+    # Test the quaternion helpers
+    q = euler_to_quat(0.1, -0.3, 0.2)
+    print(f"Quaternion: {q}")
+    print(f"Back to Euler: {quat_to_euler(q)}")
+
+    prev = (0.0, 0.0, 0.0)
+    for frame in range(5):
+        prev = slerp_head_rotation(prev, (0.8, -0.4, 0.2), 0.3)
+        print(f"Frame {frame}: yaw={prev[0]:.3f}, pitch={prev[1]:.3f}, roll={prev[2]:.3f}")
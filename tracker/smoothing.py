@@ -3,22 +3,77 @@ Smoothing module for VTuber face tracking system.
 Applies smoothing to face tracking data to reduce jitter and noise.
 """
 import numpy as np
-from .face_tracking import FaceTrackingData
+from .face_tracking import FaceTrackingData, TRACKING_FIELDS
+from .quat_smoother import slerp_head_rotation
 import logging
 
+def _ema_rows(values, alpha) -> np.ndarray:
+    """
+    EMA over the rows of recorded values, as smooth_data applies it frame by
+    frame (the first row is the initial value).
+
+    Args:
+        values: (N, 7) array of values in TRACKING_FIELDS order, one row per frame
+        alpha: Smoothing factor, a scalar or a 7-vector in TRACKING_FIELDS order
+
+    Returns:
+        (N, 7) float64 array of smoothed values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    if len(values) == 0:
+        return out
+    # The alpha * current term is independent of the recurrence, so scale
+    # every row at once and keep only the (1 - alpha) * prev step per row
+    scaled = values * alpha
+    keep = 1 - np.asarray(alpha, dtype=np.float64)
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        row = out[i]
+        np.multiply(out[i - 1], keep, out=row)
+        row += scaled[i]
+    return out
+
+def _slerp_rotation_rows(smoothed, values, alpha):
+    """
+    Redo the head rotation columns of _ema_rows output with SLERP smoothing,
+    as smooth_data applies it with rotation_smoother="quat".
+    
+    Args:
+        smoothed: (N, 7) output of _ema_rows, updated in place
+        values: (N, 7) array of the recorded values
+        alpha: Smoothing factor (scalar)
+    """
+    rotation = smoothed[:, 0:3]
+    for i in range(1, len(smoothed)):
+        rotation[i] = slerp_head_rotation(rotation[i - 1].tolist(), values[i, 0:3].tolist(), alpha)
+
 class DataSmoother:
-    def __init__(self, alpha=0.2, enabled=True):
+    def __init__(self, alpha=0.2, enabled=True, rotation_smoother="ema"):
         """
         Initialize the data smoother.
         
         Args:
             alpha: Smoothing factor (0.0 to 1.0). Lower values = more smoothing.
             enabled: Whether smoothing is enabled.
+            rotation_smoother: "ema" to smooth head yaw, pitch and roll
+                independently, or "quat" to smooth the head orientation along
+                the shortest arc (SLERP); eyes and mouth always use EMA.
         """
+        if rotation_smoother not in ("ema", "quat"):
+            raise ValueError(f"Unknown rotation_smoother: {rotation_smoother!r}")
         self.alpha = alpha
         self.enabled = enabled
-        self.prev_data = None
+        self.rotation_smoother = rotation_smoother
         self.initialized = False
+
+        # Previous smoothed values (TRACKING_FIELDS order) and EMA scratch
+        self._prev = np.zeros(len(TRACKING_FIELDS))
+        self._scratch = np.empty(len(TRACKING_FIELDS))
+        # Output instances alternate, so the previous frame's result stays
+        # valid while the next one is filled
+        self._td_ring = [FaceTrackingData(), FaceTrackingData()]
+        self._td_idx = 0
         
     def smooth_data(self, current_data: FaceTrackingData) -> FaceTrackingData:
         """
@@ -35,43 +90,49 @@ class DataSmoother:
         
         if not self.initialized:
             # Use the first frame as the initial value
-            self.prev_data = current_data
+            self._prev[:] = current_data.as_array()
             self.initialized = True
             return current_data
         
-        # Apply exponential moving average (EMA) smoothing
-        smoothed_data = FaceTrackingData(
-            head_yaw=self._ema(self.prev_data.head_yaw, current_data.head_yaw),
-            head_pitch=self._ema(self.prev_data.head_pitch, current_data.head_pitch),
-            head_roll=self._ema(self.prev_data.head_roll, current_data.head_roll),
-            eye_left=self._ema(self.prev_data.eye_left, current_data.eye_left),
-            eye_right=self._ema(self.prev_data.eye_right, current_data.eye_right),
-            mouth_open=self._ema(self.prev_data.mouth_open, current_data.mouth_open),
-            mouth_wide=self._ema(self.prev_data.mouth_wide, current_data.mouth_wide),
-            face_detected=current_data.face_detected
-        )
-        
-        # Update previous data
-        self.prev_data = smoothed_data
+        # Exponential moving average (EMA) of all values at once:
+        # alpha * current + (1 - alpha) * prev
+        alpha = self.alpha
+        prev = self._prev
+        current = current_data.as_array()
+        if self.rotation_smoother == "quat":
+            prev_rotation = prev[0:3].tolist()
+        prev *= 1 - alpha
+        np.multiply(current, alpha, out=self._scratch)
+        prev += self._scratch
+        if self.rotation_smoother == "quat":
+            # Replace the per-angle EMA of the head rotation with SLERP
+            prev[0:3] = slerp_head_rotation(prev_rotation, current[0:3].tolist(), alpha)
         
-        return smoothed_data
+        out = self._td_ring[self._td_idx]
+        self._td_idx ^= 1
+        out.copy_from_array(prev, current_data.face_detected)
+        return out
     
-    def _ema(self, prev_value: float, current_value: float) -> float:
+    def smooth_batch(self, values) -> np.ndarray:
         """
-        Calculate Exponential Moving Average.
+        Smooth a recorded sequence of frames with the current alpha, e.g. to
+        re-smooth a session after update_alpha. The live smoothing state is
+        not used or changed.
         
         Args:
-            prev_value: Previous smoothed value
-            current_value: Current raw value
+            values: (N, 7) array of values in TRACKING_FIELDS order, one row per frame
             
         Returns:
-            Smoothed value
+            (N, 7) array of smoothed values
         """
-        return self.alpha * current_value + (1 - self.alpha) * prev_value
+        values = np.asarray(values, dtype=np.float64)
+        smoothed = _ema_rows(values, self.alpha)
+        if self.rotation_smoother == "quat":
+            _slerp_rotation_rows(smoothed, values, self.alpha)
+        return smoothed
     
     def reset(self):
         """Reset the smoother to initial state."""
-        self.prev_data = None
         self.initialized = False
     
     def update_alpha(self, new_alpha: float):
@@ -107,8 +168,27 @@ class AdvancedSmoother:
         self.eye_blink_alpha = eye_blink_alpha
         self.mouth_alpha = mouth_alpha
         self.enabled = enabled
-        self.prev_data = None
         self.initialized = False
+
+        # Previous smoothed values (TRACKING_FIELDS order) and EMA scratch
+        self._prev = np.zeros(len(TRACKING_FIELDS))
+        self._scratch = np.empty(len(TRACKING_FIELDS))
+        # Output instances alternate, so the previous frame's result stays
+        # valid while the next one is filled
+        self._td_ring = [FaceTrackingData(), FaceTrackingData()]
+        self._td_idx = 0
+        # Per-field smoothing factor and its complement (1 - alpha), rebuilt
+        # when the alphas change
+        self._alpha = np.empty(len(TRACKING_FIELDS))
+        self._keep = np.empty(len(TRACKING_FIELDS))
+        self._sync_alpha()
+    
+    def _sync_alpha(self):
+        """Rebuild the per-field alpha vectors from the per-group alphas."""
+        self._alpha[0:3] = self.head_rotation_alpha
+        self._alpha[3:5] = self.eye_blink_alpha
+        self._alpha[5:7] = self.mouth_alpha
+        np.subtract(1.0, self._alpha, out=self._keep)
     
     def smooth_data(self, current_data: FaceTrackingData) -> FaceTrackingData:
         """
@@ -125,44 +205,37 @@ class AdvancedSmoother:
         
         if not self.initialized:
             # Use the first frame as the initial value
-            self.prev_data = current_data
+            self._prev[:] = current_data.as_array()
             self.initialized = True
             return current_data
         
-        # Apply different smoothing factors to different data types
-        smoothed_data = FaceTrackingData(
-            head_yaw=self._ema(self.prev_data.head_yaw, current_data.head_yaw, self.head_rotation_alpha),
-            head_pitch=self._ema(self.prev_data.head_pitch, current_data.head_pitch, self.head_rotation_alpha),
-            head_roll=self._ema(self.prev_data.head_roll, current_data.head_roll, self.head_rotation_alpha),
-            eye_left=self._ema(self.prev_data.eye_left, current_data.eye_left, self.eye_blink_alpha),
-            eye_right=self._ema(self.prev_data.eye_right, current_data.eye_right, self.eye_blink_alpha),
-            mouth_open=self._ema(self.prev_data.mouth_open, current_data.mouth_open, self.mouth_alpha),
-            mouth_wide=self._ema(self.prev_data.mouth_wide, current_data.mouth_wide, self.mouth_alpha),
-            face_detected=current_data.face_detected
-        )
-        
-        # Update previous data
-        self.prev_data = smoothed_data
+        # Apply different smoothing factors to different data types, as one
+        # EMA over the value vector with a per-field alpha
+        prev = self._prev
+        prev *= self._keep
+        np.multiply(current_data.as_array(), self._alpha, out=self._scratch)
+        prev += self._scratch
         
-        return smoothed_data
+        out = self._td_ring[self._td_idx]
+        self._td_idx ^= 1
+        out.copy_from_array(prev, current_data.face_detected)
+        return out
     
-    def _ema(self, prev_value: float, current_value: float, alpha: float) -> float:
+    def smooth_batch(self, values) -> np.ndarray:
         """
-        Calculate Exponential Moving Average with custom alpha.
+        Smooth a recorded sequence of frames with the current per-group
+        alphas. The live smoothing state is not used or changed.
         
         Args:
-            prev_value: Previous smoothed value
-            current_value: Current raw value
-            alpha: Smoothing factor for this specific data type
+            values: (N, 7) array of values in TRACKING_FIELDS order, one row per frame
             
         Returns:
-            Smoothed value
+            (N, 7) array of smoothed values
         """
-        return alpha * current_value + (1 - alpha) * prev_value
+        return _ema_rows(values, self._alpha)
     
     def reset(self):
         """Reset the smoother to initial state."""
-        self.prev_data = None
         self.initialized = False
     
     def update_params(self, head_rotation_alpha=None, eye_blink_alpha=None, mouth_alpha=None):
@@ -173,6 +246,7 @@ class AdvancedSmoother:
             self.eye_blink_alpha = max(0.0, min(1.0, eye_blink_alpha))
         if mouth_alpha is not None:
             self.mouth_alpha = max(0.0, min(1.0, mouth_alpha))
+        self._sync_alpha()
         
         logging.info(f"Advanced smoother params updated - "
                     f"head: {self.head_rotation_alpha}, "
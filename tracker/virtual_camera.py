@@ -1,11 +1,17 @@
 """
 Virtual camera output module for VTuber face tracking system.
 Provides virtual camera output for applications like OBS, Zoom, etc.
+
+send_frame takes BGR frames (OpenCV's default) unless called with
+is_bgr=False; it no longer guesses the channel order from the pixels.
 """
 import cv2
 import numpy as np
+import glob
+import os
+import re
+import struct
 import threading
-import time
 from typing import Optional
 import logging
 
@@ -16,40 +22,85 @@ except ImportError:
     FAKWEBCAM_AVAILABLE = False
     logging.warning("pyfakewebcam not available. Virtual camera output will be limited.")
 
+# VIDIOC_QUERYCAP ioctl: _IOR('V', 0, struct v4l2_capability), 104 bytes
+_VIDIOC_QUERYCAP = (2 << 30) | (104 << 16) | (ord('V') << 8) | 0
+_V4L2_CAP_VIDEO_OUTPUT = 0x00000002
+_V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+def _video_devices():
+    """/dev/videoN paths, in numeric order."""
+    def number(path):
+        match = re.search(r"(\d+)$", path)
+        return int(match.group(1)) if match else -1
+    return sorted(glob.glob("/dev/video*"), key=number)
+
+def _is_video_output(path: str) -> bool:
+    """Whether a V4L2 device accepts frames (a v4l2loopback sink, not a webcam)."""
+    import fcntl
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+    except OSError:
+        return False
+    try:
+        caps = fcntl.ioctl(fd, _VIDIOC_QUERYCAP, bytes(104))
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    capabilities, device_caps = struct.unpack_from("=II", caps, 84)
+    if capabilities & _V4L2_CAP_DEVICE_CAPS:
+        capabilities = device_caps
+    return bool(capabilities & _V4L2_CAP_VIDEO_OUTPUT)
+
+def _find_loopback_device() -> str:
+    """
+    Find the device to write virtual camera frames to.
+    
+    Returns:
+        The first output-capable /dev/videoN, or the number after the
+        highest existing device if none reports output support
+    """
+    devices = _video_devices()
+    for device in devices:
+        if _is_video_output(device):
+            return device
+    last = re.search(r"(\d+)$", devices[-1]) if devices else None
+    return f"/dev/video{int(last.group(1)) + 1 if last else 0}"
+
 class VirtualCameraOutput:
+    # Loopback device found by the first instance, reused by later ones
+    _device_path = None
+
     def __init__(self, width: int = 640, height: int = 480, fps: int = 30):
         self.width = width
         self.height = height
         self.fps = fps
         self.is_active = False
         self.output_thread = None
-        self.current_frame = np.zeros((height, width, 3), dtype=np.uint8)
+        # Output frames (RGB): send_frame fills one buffer while the output
+        # thread sends another; with three, one is always free to fill.
+        # frame_lock only guards the two indices, never the pixel copies.
+        self._buffers = [np.zeros((height, width, 3), dtype=np.uint8) for _ in range(3)]
+        self._front_idx = 0    # Newest complete frame
+        self._reading_idx = 0  # Frame the output thread is sending
+        # Resize target for BGR frames of another size, before conversion
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
         self.frame_lock = threading.Lock()
+        # Signalled by send_frame; the output thread sends each new frame
+        # once, at the caller's frame rate, instead of running its own clock
+        self._frame_ready = threading.Condition(self.frame_lock)
+        self._has_new_frame = False
         self.enabled = False
         
         # Initialize virtual camera if available
         self.virtual_cam = None
         if FAKWEBCAM_AVAILABLE:
             try:
-                # Find an available video device (usually /dev/videoX)
-                # This requires v4l2loopback to be set up
-                import subprocess
-                result = subprocess.run(['ls', '/dev/video*'], capture_output=True, text=True)
-                video_devices = result.stdout.strip().split('\n') if result.returncode == 0 else []
-                
-                # Find the highest numbered device and use the next one
-                max_num = 0
-                for device in video_devices:
-                    try:
-                        num = int(device.split('video')[1])
-                        if num > max_num:
-                            max_num = num
-                    except ValueError:
-                        continue
-                
-                next_device = f"/dev/video{max_num + 1}"
-                self.virtual_cam = pyfakewebcam.FakeWebcam(next_device, width, height)
-                logging.info(f"Virtual camera initialized at {next_device}")
+                # Find the video device created by v4l2loopback (/dev/videoX)
+                device = VirtualCameraOutput._device_path or _find_loopback_device()
+                self.virtual_cam = pyfakewebcam.FakeWebcam(device, width, height)
+                VirtualCameraOutput._device_path = device
+                logging.info(f"Virtual camera initialized at {device}")
             except Exception as e:
                 logging.error(f"Failed to initialize virtual camera: {e}")
                 self.virtual_cam = None
@@ -79,45 +130,77 @@ class VirtualCameraOutput:
         if not self.is_active:
             return
         
-        self.is_active = False
+        with self._frame_ready:
+            self.is_active = False
+            self._frame_ready.notify()
         if self.output_thread and self.output_thread.is_alive():
             self.output_thread.join(timeout=1.0)
         logging.info("Virtual camera output stopped")
 
     def _output_loop(self):
-        """Main output loop to send frames to virtual camera."""
-        while self.is_active and self.enabled:
+        """Main output loop: send each frame from send_frame to the virtual camera."""
+        while True:
+            with self._frame_ready:
+                while self.is_active and not self._has_new_frame:
+                    self._frame_ready.wait()
+                if not (self.is_active and self.enabled):
+                    return
+                self._has_new_frame = False
+                self._reading_idx = self._front_idx
+            
             if self.virtual_cam:
-                with self.frame_lock:
-                    frame_copy = self.current_frame.copy()
-                
                 try:
-                    self.virtual_cam.schedule_frame(frame_copy)
+                    self.virtual_cam.schedule_frame(self._buffers[self._reading_idx])
                 except Exception as e:
                     logging.error(f"Error sending frame to virtual camera: {e}")
-            
-            # Control frame rate
-            time.sleep(1.0 / self.fps)
 
-    def send_frame(self, frame: np.ndarray):
-        """Send a frame to the virtual camera."""
+    def send_frame(self, frame: np.ndarray, is_bgr: bool = True):
+        """
+        Send a frame to the virtual camera.
+        
+        Args:
+            frame: Frame to output; resized to the virtual camera size if needed
+            is_bgr: Whether a 3-channel frame is BGR (False if already RGB)
+        """
         if not self.enabled or not self.is_active:
             return
-            
+        
+        # Fill the buffer that is neither the newest frame nor being sent
         with self.frame_lock:
+            front, reading = self._front_idx, self._reading_idx
+        back_idx = 3 - front - reading if front != reading else (front + 1) % 3
+        back = self._buffers[back_idx]
+        
+        needs_resize = frame.shape[0] != self.height or frame.shape[1] != self.width
+        
+        # Ensure frame is in RGB format (pyfakewebcam expects RGB)
+        if frame.ndim == 3 and frame.shape[2] == 3:
+            if needs_resize:
+                # RGB frames resize straight into the buffer; BGR ones into
+                # a preallocated scratch frame that is then converted
+                # (cvtColor in place is slower than into another buffer)
+                if is_bgr:
+                    cv2.resize(frame, (self.width, self.height), dst=self._resized)
+                    cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=back)
+                else:
+                    cv2.resize(frame, (self.width, self.height), dst=back)
+            elif is_bgr:
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=back)
+            else:
+                np.copyto(back, frame)
+        else:
             # Resize frame to match virtual camera dimensions if needed
-            if frame.shape[0] != self.height or frame.shape[1] != self.width:
+            if needs_resize:
                 frame = cv2.resize(frame, (self.width, self.height))
-            
-            # Ensure frame is in RGB format (pyfakewebcam expects RGB)
-            if len(frame.shape) == 3 and frame.shape[2] == 3:
-                # If it's BGR, convert to RGB
-                if np.array_equal(frame[:,:,0], frame[:,:,2]):  # Check if it's RGB
-                    self.current_frame = frame
-                else:  # It's BGR, convert to RGB
-                    self.current_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if frame.ndim == 2:
+                cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB, dst=back)
             else:
-                self.current_frame = frame
+                cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB, dst=back)
+        
+        with self._frame_ready:
+            self._front_idx = back_idx
+            self._has_new_frame = True
+            self._frame_ready.notify()
 
     def release(self):
         """Release virtual camera resources."""
@@ -150,7 +233,7 @@ class WindowsVirtualCamera:
     def enable_output(self, enabled: bool = True):
         self.enabled = enabled
     
-    def send_frame(self, frame: np.ndarray):
+    def send_frame(self, frame: np.ndarray, is_bgr: bool = True):
         if not self.enabled:
             return
         # Implementation would depend on specific Windows virtual camera solution
@@ -177,7 +260,7 @@ class MacVirtualCamera:
     def enable_output(self, enabled: bool = True):
         self.enabled = enabled
     
-    def send_frame(self, frame: np.ndarray):
+    def send_frame(self, frame: np.ndarray, is_bgr: bool = True):
         if not self.enabled:
             return
         # Implementation would depend on specific macOS virtual camera solution
@@ -205,7 +288,7 @@ def create_virtual_camera(width: int = 640, height: int = 480, fps: int = 30):
 
 if __name__ == "__main__":
     # Test the virtual camera
-    import time
+    from .frame_clock import FrameClock
     
     print("Testing Virtual Camera Output...")
     
@@ -215,6 +298,7 @@ if __name__ == "__main__":
         vcam.enable_output(True)
         
         # Create test frames
+        clock = FrameClock(30)  # 30 FPS
         for i in range(100):
             # Create a test frame with moving elements
             frame = np.zeros((480, 640, 3), dtype=np.uint8)
@@ -225,7 +309,7 @@ if __name__ == "__main__":
             cv2.putText(frame, f"Frame {i}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
             
             vcam.send_frame(frame)
-            time.sleep(1/30)  # 30 FPS
+            clock.tick()
         
         vcam.release()
         print("Virtual camera test completed")
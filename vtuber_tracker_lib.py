@@ -29,6 +29,7 @@ import threading
 # Import modules we created
 from tracker.face_tracking import FaceTracker, FaceTrackingData
 from tracker.smoothing import DataSmoother
+from tracker.kalman import KalmanSmoother
 from tracker.landmarks_to_params import LandmarksToParameters
 from tracker.calibration import FaceCalibrator, CalibrationData
 from tracker.precision_mode import PrecisionMode
@@ -42,7 +43,12 @@ class VTuberConfig:
     camera_index: int = 0
     frame_width: int = 640
     frame_height: int = 480
-    smoothing_alpha: float = 0.2
+    smoother: str = "kalman"  # "kalman" (lag lebih kecil) atau "ema"
+    smoothing_alpha: float = 0.2  # Hanya untuk smoother="ema"
+    rotation_smoother: str = "ema"  # Hanya untuk smoother="ema": "ema" atau "quat" (SLERP rotasi kepala)
+    kalman_process_noise: float = 1e-3
+    kalman_measurement_noise: float = 1e-3
+    kalman_max_coast_frames: int = 15  # Frame prediksi saat wajah hilang
     enable_smoothing: bool = True
     enable_virtual_camera: bool = False
     virtual_camera_width: int = 640
@@ -79,20 +85,9 @@ class VTuberTracker:
 
     def _get_available_cameras(self, max_cameras=10):
         """Deteksi kamera yang tersedia."""
-        import cv2
-        available_cameras = []
-
-        for i in range(max_cameras):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                ret, frame = cap.read()
-                if ret:  # Pastikan bisa membaca frame, bukan hanya membuka perangkat
-                    available_cameras.append(i)
-                cap.release()
-            else:
-                break  # Jika tidak bisa buka, berhenti di sini
-
-        return available_cameras
+        from tracker.camera import find_available_cameras
+        # Pastikan bisa membaca frame, bukan hanya membuka perangkat
+        return find_available_cameras(max_cameras, read_frame=True)
 
     def setup_logging(self):
         """Setup logging configuration."""
@@ -143,10 +138,19 @@ class VTuberTracker:
             self.face_tracker = FaceTracker()
             
             # Initialize smoother
-            self.smoother = DataSmoother(
-                alpha=self.config.smoothing_alpha,
-                enabled=self.config.enable_smoothing
-            )
+            if self.config.smoother == "ema":
+                self.smoother = DataSmoother(
+                    alpha=self.config.smoothing_alpha,
+                    enabled=self.config.enable_smoothing,
+                    rotation_smoother=self.config.rotation_smoother
+                )
+            else:
+                self.smoother = KalmanSmoother(
+                    process_noise=self.config.kalman_process_noise,
+                    measurement_noise=self.config.kalman_measurement_noise,
+                    max_coast_frames=self.config.kalman_max_coast_frames,
+                    enabled=self.config.enable_smoothing
+                )
             
             # Initialize parameter mapper
             self.mapper = LandmarksToParameters()
@@ -204,13 +208,17 @@ class VTuberTracker:
     def _tracking_loop(self):
         """Main tracking loop running in separate thread."""
         self.logger.info("Tracking loop started")
+        # Read frames on the camera's own thread while this one tracks
+        self.camera.start_async()
         
         while self.is_running:
             try:
-                # Get frame from camera
-                frame = self.camera.get_frame()
+                # Get frame from camera; the async reader hands over each new
+                # frame once, so waiting here paces the loop to the camera.
+                # With no frame the thread stays parked in get_frame for the
+                # whole timeout, so no extra sleep is needed
+                frame = self.camera.get_frame(timeout=0.1)
                 if frame is None:
-                    time.sleep(0.01)  # Small delay if no frame available
                     continue
                 
                 # Process face tracking
@@ -240,17 +248,16 @@ class VTuberTracker:
                 
                 # Send frame to virtual camera if enabled
                 if self.virtual_camera:
-                    frame_with_landmarks = self.face_tracker.draw_landmarks(frame.copy(), 
-                                                                           self.face_tracker.get_landmarks(frame))
+                    # Reuse the landmarks from process_frame and draw straight
+                    # onto the frame, which tracking no longer needs
+                    frame_with_landmarks = self.face_tracker.draw_landmarks(frame, self.face_tracker.last_results)
                     self.virtual_camera.send_frame(frame_with_landmarks)
                 
-                # Small delay to control frame rate (~30 FPS)
-                time.sleep(1/30)
-                
             except Exception as e:
                 self.logger.error(f"Error in tracking loop: {e}")
                 time.sleep(0.1)  # Brief pause before continuing
         
+        self.camera.stop_async()
         self.logger.info("Tracking loop ended")
     
     def start_calibration(self):